@@ -1,15 +1,19 @@
 """Pydantic schemas for equity data from Yahoo Finance."""
 
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional
-import pandas as pd
+from pydantic import BaseModel, Field, PrivateAttr, StringConstraints, ConfigDict
+from typing import TYPE_CHECKING, Annotated, Optional
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class EquityData(BaseModel):
     """Validated equity data for a single ticker."""
     
-    ticker: str = Field(
+    # Uppercased inside pydantic-core rather than by a Python validator
+    ticker: Annotated[str, StringConstraints(to_upper=True)] = Field(
         min_length=1,
         max_length=10,
         description="Stock ticker symbol"
@@ -62,12 +66,6 @@ class EquityData(BaseModel):
         description="1-year return percentage"
     )
     
-    @field_validator('ticker')
-    @classmethod
-    def uppercase_ticker(cls, v):
-        """Ensure ticker is uppercase."""
-        return v.upper()
-    
     @property
     def pct_from_52w_high(self) -> float:
         """Percentage distance from 52-week high (negative = below high)."""
@@ -123,24 +121,58 @@ class EquityDataset(BaseModel):
         description="Timestamp when data was fetched"
     )
     
-    def to_dataframe(self) -> pd.DataFrame:
+    # Memoized columnar view built by to_arrays()
+    _arrays_cache: Optional[dict[str, np.ndarray]] = PrivateAttr(default=None)
+    
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Columnar (one array per field) view for vectorized screening.
+        
+        Carries the same columns as to_dataframe() without building a
+        DataFrame: ticker/sector as object arrays, market_cap as int64,
+        other numeric fields as float64 with NaN for missing values.
+        The result is memoized and its arrays are read-only; the list of
+        equities is treated as immutable once the dataset is built.
+        
+        Returns:
+            Dictionary mapping column name to NumPy array
+        """
+        if self._arrays_cache is not None:
+            return self._arrays_cache
+        
+        arrays: dict[str, np.ndarray] = {}
+        for name in EquityData.model_fields:
+            values = [getattr(e, name) for e in self.equities]
+            if name in ('ticker', 'sector'):
+                arrays[name] = np.array(values, dtype=object)
+            elif name == 'market_cap':
+                arrays[name] = np.array(values, dtype=np.int64)
+            else:
+                arrays[name] = np.array(values, dtype=np.float64)  # None -> NaN
+        
+        # Computed columns; a missing MA counts as "above"
+        price = arrays['current_price']
+        arrays['pct_from_52w_high'] = (price - arrays['high_52w']) / arrays['high_52w']
+        with np.errstate(invalid='ignore'):
+            arrays['above_200d_ma'] = np.isnan(arrays['ma_200d']) | (price > arrays['ma_200d'])
+            arrays['above_50d_ma'] = np.isnan(arrays['ma_50d']) | (price > arrays['ma_50d'])
+        
+        for column in arrays.values():
+            column.flags.writeable = False
+        self._arrays_cache = arrays
+        return arrays
+    
+    def to_dataframe(self) -> "pd.DataFrame":
         """Convert to pandas DataFrame for analysis."""
+        # Imported here so loading the schemas does not pull in pandas
+        import pandas as pd
+        
         data = [e.model_dump() for e in self.equities]
         df = pd.DataFrame(data)
         
-        # Add computed columns
-        df['pct_from_52w_high'] = df.apply(
-            lambda row: (row['current_price'] - row['high_52w']) / row['high_52w'],
-            axis=1
-        )
-        df['above_200d_ma'] = df.apply(
-            lambda row: row['current_price'] > row['ma_200d'] if pd.notna(row['ma_200d']) else True,
-            axis=1
-        )
-        df['above_50d_ma'] = df.apply(
-            lambda row: row['current_price'] > row['ma_50d'] if pd.notna(row['ma_50d']) else True,
-            axis=1
-        )
+        # Computed columns share the vectorized definitions in to_arrays()
+        arrays = self.to_arrays()
+        for column in ('pct_from_52w_high', 'above_200d_ma', 'above_50d_ma'):
+            df[column] = arrays[column].copy()
         
         return df
     
@@ -1,5 +1,6 @@
 """Pydantic schema for LLM output validation."""
 
+from operator import attrgetter
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from typing import List
 
@@ -83,8 +84,11 @@ class AnalysisOutput(BaseModel):
     @field_validator('opportunities')
     @classmethod
     def sort_by_conviction(cls, v):
-        """Ensure opportunities are sorted by conviction score descending."""
-        return sorted(v, key=lambda x: x.conviction_score, reverse=True)
+        """Ensure opportunities are sorted by conviction score descending.
+        
+        The sort is stable, so equal scores keep the model's order.
+        """
+        return sorted(v, key=attrgetter('conviction_score'), reverse=True)
     
     model_config = ConfigDict(
         json_schema_extra={
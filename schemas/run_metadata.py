@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 
 
 class RunMetadata(BaseModel):
@@ -65,6 +65,12 @@ class RunMetadata(BaseModel):
         description="List of non-fatal errors encountered"
     )
     
+    # Performance tracking
+    stage_timings: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Wall-clock duration of each pipeline stage in milliseconds"
+    )
+    
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -80,7 +86,8 @@ class RunMetadata(BaseModel):
                 "llm_tokens_used": 12543,
                 "email_delivered": True,
                 "report_generated": True,
-                "errors": []
+                "errors": [],
+                "stage_timings": {"ingestion": 8421.7, "llm_wait": 31250.4}
             }
         }
     )
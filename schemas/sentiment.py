@@ -1,7 +1,7 @@
 """Pydantic schema for market sentiment data (Fear & Greed Index)."""
 
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Literal
 
 
@@ -52,20 +52,6 @@ class SentimentData(BaseModel):
         description="Timestamp when data was fetched"
     )
     
-    @field_validator('label')
-    @classmethod
-    def validate_label_matches_score(cls, v, info):
-        """Ensure label matches score range."""
-        score = info.data.get('score')
-        if score is None:
-            return v
-        
-        expected_label = cls._score_to_label(score)
-        if v != expected_label:
-            # Allow it but could warn in production
-            pass
-        return v
-    
     @staticmethod
     def _score_to_label(score: int) -> SentimentLabel:
         """Convert score to expected label."""
@@ -3,7 +3,7 @@
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from pathlib import Path
-import json
+import orjson
 import yfinance as yf
 import pandas as pd
 import structlog
@@ -58,13 +58,7 @@ class PerformanceTracker:
         
         # Save to file
         file_path = self.recommendations_dir / f"{date}.json"
-        with open(file_path, 'w') as f:
-            json.dump(
-                [r.model_dump() for r in records],
-                f,
-                indent=2,
-                default=str
-            )
+        self._write_records(file_path, records)
         
         self.logger.info(
             "recommendations_recorded",
@@ -100,10 +94,7 @@ class PerformanceTracker:
         if not file_path.exists():
             raise FileNotFoundError(f"No recommendations found for {recommendation_date}")
         
-        with open(file_path, 'r') as f:
-            records_data = json.load(f)
-        
-        records = [RecommendationRecord(**r) for r in records_data]
+        records = self._read_records(file_path)
         
         # Calculate time periods
         rec_date = datetime.strptime(recommendation_date, "%Y-%m-%d")
@@ -154,13 +145,7 @@ class PerformanceTracker:
                             record.alpha_3m = record.return_3m - record.benchmark_return_3m
         
         # Save updated records
-        with open(file_path, 'w') as f:
-            json.dump(
-                [r.model_dump() for r in records],
-                f,
-                indent=2,
-                default=str
-            )
+        self._write_records(file_path, records)
         
         self.logger.info(
             "backfill_complete",
@@ -170,6 +155,34 @@ class PerformanceTracker:
         
         return records
     
+    @staticmethod
+    def _write_records(file_path: Path, records: List[RecommendationRecord]) -> None:
+        """Write recommendation records as indented JSON with orjson.
+        
+        mode="json" leaves only JSON-native values, so no per-object
+        default= callback runs during serialization.
+        
+        Args:
+            file_path: Destination file
+            records: Records to write
+        """
+        file_path.write_bytes(orjson.dumps(
+            [r.model_dump(mode="json") for r in records],
+            option=orjson.OPT_INDENT_2
+        ))
+    
+    @staticmethod
+    def _read_records(file_path: Path) -> List[RecommendationRecord]:
+        """Load recommendation records written by _write_records.
+        
+        Args:
+            file_path: File to read
+            
+        Returns:
+            List of RecommendationRecord objects
+        """
+        return [RecommendationRecord(**r) for r in orjson.loads(file_path.read_bytes())]
+    
     def generate_summary(
         self,
         start_date: str,
@@ -192,9 +205,7 @@ class PerformanceTracker:
         for file in sorted(self.recommendations_dir.glob("*.json")):
             date_str = file.stem
             if start_date <= date_str <= end_date:
-                with open(file, 'r') as f:
-                    records_data = json.load(f)
-                all_records.extend([RecommendationRecord(**r) for r in records_data])
+                all_records.extend(self._read_records(file))
         
         if not all_records:
             raise ValueError(f"No recommendations found between {start_date} and {end_date}")
@@ -1,12 +1,15 @@
 """FRED API client for fetching macroeconomic data."""
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+from urllib.error import HTTPError, URLError
 import structlog
 from fredapi import Fred
 
 from schemas.macro import MacroData
+from .single_flight import SingleFlight
 
 logger = structlog.get_logger()
 
@@ -33,6 +36,25 @@ class FREDClient:
         'unemployment': 'UNRATE',
     }
     
+    # Bulkhead: FRED calls run on their own bounded pool so a stalled
+    # provider elsewhere cannot exhaust the workers FRED depends on
+    _pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fred")
+    
+    # Concurrent requests for the same series/window share one HTTP call
+    _inflight = SingleFlight(_pool)
+    
+    # HTTP statuses worth retrying (rate limiting / transient server errors)
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+    
+    # Lower-cased starts of FRED error messages for the same statuses
+    RETRYABLE_MESSAGE_PREFIXES = (
+        "too many requests",
+        "internal server error",
+        "bad gateway",
+        "service unavailable",
+        "gateway timeout",
+    )
+    
     def __init__(self, api_key: str):
         """Initialize FRED client.
         
@@ -63,15 +85,38 @@ class FREDClient:
         
         for attempt in range(max_retries):
             try:
-                # Fetch latest values for each series
-                fed_funds = self._get_latest_value('fed_funds', lookback_days)
-                treasury_10y = self._get_latest_value('treasury_10y', lookback_days)
-                treasury_2y = self._get_latest_value('treasury_2y', lookback_days)
-                cpi_current = self._get_latest_value('cpi', lookback_days)
-                unemployment = self._get_latest_value('unemployment', lookback_days)
+                # Observation windows, computed once for all series
+                end_date = datetime.now()
+                end_iso = end_date.strftime('%Y-%m-%d')
+                start_iso = (end_date - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+                
+                # CPI a year ago: closest value within 30 days before the target
+                year_ago = end_date - timedelta(days=365)
+                year_ago_iso = year_ago.strftime('%Y-%m-%d')
+                year_ago_start_iso = (year_ago - timedelta(days=30)).strftime('%Y-%m-%d')
+                
+                # Fetch latest values for each series on the FRED pool
+                futures = {
+                    name: self._inflight.submit(
+                        (series_id, start_iso, end_iso),
+                        self._get_latest_value, series_id, start_iso, end_iso
+                    )
+                    for name, series_id in self.SERIES_IDS.items()
+                }
+                cpi_id = self.SERIES_IDS['cpi']
+                cpi_year_ago_future = self._inflight.submit(
+                    (cpi_id, year_ago_start_iso, year_ago_iso),
+                    self._get_latest_value, cpi_id, year_ago_start_iso, year_ago_iso
+                )
+                
+                fed_funds = futures['fed_funds'].result()
+                treasury_10y = futures['treasury_10y'].result()
+                treasury_2y = futures['treasury_2y'].result()
+                cpi_current = futures['cpi'].result()
+                unemployment = futures['unemployment'].result()
                 
                 # Calculate CPI year-over-year change
-                cpi_year_ago = self._get_value_at_offset('cpi', days=365)
+                cpi_year_ago = cpi_year_ago_future.result()
                 cpi_yoy = ((cpi_current - cpi_year_ago) / cpi_year_ago) * 100
                 
                 # Calculate yield curve spread
@@ -97,14 +142,16 @@ class FREDClient:
                 return data
                 
             except Exception as e:
+                recoverable = self._is_recoverable(e, attempt)
                 self.logger.warning(
                     "fetch_failed",
                     attempt=attempt + 1,
                     max_retries=max_retries,
+                    recoverable=recoverable,
                     error=str(e)
                 )
                 
-                if attempt < max_retries - 1:
+                if recoverable and attempt < max_retries - 1:
                     # Exponential backoff
                     sleep_time = 2 ** attempt
                     self.logger.info("retrying", sleep_seconds=sleep_time)
@@ -113,64 +160,83 @@ class FREDClient:
                     self.logger.error("fetch_failed_permanently")
                     raise
     
-    def _get_latest_value(
-        self, 
-        series_name: str, 
-        lookback_days: int
-    ) -> float:
-        """Get the most recent value for a series.
+    def _is_recoverable(self, error: Exception, attempt: int) -> bool:
+        """Decide whether a failed fetch is worth retrying.
+        
+        Network failures and transient HTTP statuses are retried. Bad API
+        keys, unknown series, schema validation errors, etc. fail fast. An
+        empty series is retried once only, since it may just be a
+        publication delay.
+        
+        fredapi re-raises HTTP errors as ValueError(<FRED message>) from
+        inside its handler, so the status is read from the chained
+        HTTPError, falling back to the message text.
         
         Args:
-            series_name: Key in SERIES_IDS dict
-            lookback_days: How many days back to search
+            error: Exception raised by the fetch
+            attempt: Zero-based attempt number
             
         Returns:
-            Latest value as float
+            True if the fetch should be retried
         """
-        series_id = self.SERIES_IDS[series_name]
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=lookback_days)
+        http_error = self._find_http_error(error)
+        if http_error is not None:
+            return http_error.code in self.RETRYABLE_STATUS_CODES
         
-        data = self.client.get_series(
-            series_id,
-            observation_start=start_date.strftime('%Y-%m-%d'),
-            observation_end=end_date.strftime('%Y-%m-%d')
-        )
+        if isinstance(error, (URLError, TimeoutError, ConnectionError)):
+            return True
         
-        if data.empty:
-            raise ValueError(f"No data found for {series_id}")
+        if isinstance(error, ValueError):
+            message = str(error)
+            if message.startswith("No data found"):
+                return attempt == 0
+            return message.lower().startswith(self.RETRYABLE_MESSAGE_PREFIXES)
         
-        # Get most recent non-null value
-        latest = data.dropna().iloc[-1]
-        return float(latest)
+        return False
     
-    def _get_value_at_offset(
-        self,
-        series_name: str,
-        days: int
-    ) -> float:
-        """Get value at a specific number of days in the past.
+    @staticmethod
+    def _find_http_error(error: Exception) -> Optional[HTTPError]:
+        """Find the HTTPError an exception was raised from, if any.
         
         Args:
-            series_name: Key in SERIES_IDS dict
-            days: Days in the past to retrieve
+            error: Exception raised by the fetch
             
         Returns:
-            Value at that point in time
+            The HTTPError in the exception's cause/context chain, or None
         """
-        series_id = self.SERIES_IDS[series_name]
-        target_date = datetime.now() - timedelta(days=days)
-        # Look within 30 days before target to find closest value
-        start_date = target_date - timedelta(days=30)
+        seen = set()
+        while error is not None and id(error) not in seen:
+            if isinstance(error, HTTPError):
+                return error
+            seen.add(id(error))
+            error = error.__cause__ or error.__context__
+        return None
+    
+    def _get_latest_value(
+        self, 
+        series_id: str, 
+        start_iso: str,
+        end_iso: str
+    ) -> float:
+        """Get the most recent value for a series within a window.
         
+        Args:
+            series_id: FRED series ID (e.g. 'DFF')
+            start_iso: Observation window start (YYYY-MM-DD)
+            end_iso: Observation window end (YYYY-MM-DD)
+            
+        Returns:
+            Latest value as float
+        """
         data = self.client.get_series(
             series_id,
-            observation_start=start_date.strftime('%Y-%m-%d'),
-            observation_end=target_date.strftime('%Y-%m-%d')
+            observation_start=start_iso,
+            observation_end=end_iso
         )
         
         if data.empty:
-            raise ValueError(f"No data found for {series_id} at offset {days} days")
+            raise ValueError(f"No data found for {series_id} between {start_iso} and {end_iso}")
         
+        # Get most recent non-null value
         latest = data.dropna().iloc[-1]
         return float(latest)
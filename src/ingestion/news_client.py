@@ -1,5 +1,6 @@
 """Tavily API client for fetching market news narrative."""
 
+from concurrent.futures import ThreadPoolExecutor
 import structlog
 from tavily import TavilyClient
 
@@ -15,6 +16,10 @@ class NewsClient:
     for the weekly strategist report.
     """
     
+    # Bulkhead: Tavily searches run on their own bounded pool so a slow
+    # search backend cannot starve the other ingestion clients
+    _pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="tavily")
+    
     def __init__(self, api_key: str):
         """Initialize Tavily client.
         
@@ -45,27 +50,30 @@ class NewsClient:
         
         try:
             # Query 1: What's moving markets this week
-            daily_drivers = self._query_and_synthesize(
+            daily_drivers = self._pool.submit(
+                self._query_and_synthesize,
                 query="stock market daily drivers catalysts this week",
                 max_results=3
             )
             
             # Query 2: Sector rotation trends
-            sector_context = self._query_and_synthesize(
+            sector_context = self._pool.submit(
+                self._query_and_synthesize,
                 query="stock market sector rotation performance trends",
                 max_results=3
             )
             
             # Query 3: Macro sentiment
-            macro_sentiment = self._query_and_synthesize(
+            macro_sentiment = self._pool.submit(
+                self._query_and_synthesize,
                 query="macroeconomic sentiment Federal Reserve interest rates outlook",
                 max_results=3
             )
             
             news = MarketNews(
-                daily_drivers=daily_drivers,
-                sector_context=sector_context,
-                macro_sentiment=macro_sentiment
+                daily_drivers=daily_drivers.result(),
+                sector_context=sector_context.result(),
+                macro_sentiment=macro_sentiment.result()
             )
             
             self.logger.info(
@@ -1,6 +1,9 @@
 """CNN Fear & Greed Index scraper."""
 
+import time
+import orjson
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import structlog
 
@@ -18,6 +21,13 @@ class SentimentClient:
     
     API_URL = "https://production.dataviz.cnn.io/index/fearandgreed/graphdata"
     
+    # Bulkhead: CNN requests get their own bounded pool, isolated from
+    # the other upstream providers
+    _pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cnn")
+    
+    # HTTP statuses worth retrying (rate limiting / transient server errors)
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+    
     def __init__(self):
         """Initialize sentiment client."""
         self.logger = logger.bind(service="sentiment_client")
@@ -43,9 +53,11 @@ class SentimentClient:
         
         for attempt in range(max_retries):
             try:
-                response = requests.get(self.API_URL, headers=headers, timeout=timeout)
+                response = self._pool.submit(
+                    requests.get, self.API_URL, headers=headers, timeout=timeout
+                ).result()
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 # Parse response structure
                 fear_greed_data = data.get('fear_and_greed', {})
@@ -80,8 +92,11 @@ class SentimentClient:
                 return sentiment
                 
             except requests.RequestException as e:
+                if not self._is_recoverable(e):
+                    self.logger.error("fetch_failed_unrecoverable", error=str(e))
+                    return self._get_fallback_sentiment()
+                
                 if attempt < max_retries - 1:
-                    import time
                     wait_time = 2 ** attempt  # Exponential backoff
                     self.logger.warning(
                         "fetch_retry",
@@ -99,6 +114,26 @@ class SentimentClient:
                 self.logger.error("parse_failed", error=str(e))
                 return self._get_fallback_sentiment()
     
+    def _is_recoverable(self, error: requests.RequestException) -> bool:
+        """Decide whether a failed request is worth retrying.
+        
+        Timeouts, connection failures and transient HTTP statuses are
+        retried; anything else (e.g. 401/403/404) fails fast.
+        
+        Args:
+            error: Exception raised by the request
+            
+        Returns:
+            True if the request should be retried
+        """
+        if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+            return True
+        
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in self.RETRYABLE_STATUS_CODES
+        
+        return False
+    
     def _get_fallback_sentiment(self) -> SentimentData:
         """Return neutral sentiment as fallback when API fails.
         
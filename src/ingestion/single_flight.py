@@ -0,0 +1,68 @@
+"""In-flight request coalescing for upstream API calls."""
+
+import threading
+from concurrent.futures import Executor, Future
+from functools import partial
+from typing import Any, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into a single shared Future.
+    
+    While a call for a key is in flight, further submissions with the
+    same key return the existing Future instead of issuing a duplicate
+    upstream request. The key is forgotten once the call completes, so
+    later submissions fetch fresh data.
+    """
+    
+    def __init__(self, executor: Executor):
+        """Initialize coalescing layer.
+        
+        Args:
+            executor: Executor that runs the underlying calls
+        """
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, Future] = {}
+    
+    def submit(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any
+    ) -> Future:
+        """Submit a call, sharing the Future of any in-flight call with the same key.
+        
+        Args:
+            key: Identifies the request (e.g. source + params)
+            fn: Callable performing the request
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+        
+        Returns:
+            Future resolving to fn's result
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._inflight[key] = future
+        
+        # Registered outside the lock: if the call already finished, the
+        # callback runs immediately in this thread and takes the lock itself
+        future.add_done_callback(partial(self._forget, key))
+        return future
+    
+    def _forget(self, key: Hashable, future: Future) -> None:
+        """Drop a completed call from the in-flight table.
+        
+        Args:
+            key: Request key
+            future: Completed Future for that key
+        """
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
@@ -1,13 +1,18 @@
 """Yahoo Finance client for fetching equity data."""
 
+import json
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional
 import pandas as pd
 import yfinance as yf
 import structlog
 
 from schemas.equities import EquityData, EquityDataset
+from .single_flight import SingleFlight
 
 logger = structlog.get_logger()
 
@@ -17,15 +22,40 @@ class YFinanceClient:
     
     Uses the yfinance library (no API key required).
     Includes rate limiting to avoid throttling.
+    
+    Fields are split into two tiers:
+    - Slow (sector, valuation ratios, 200-day MA): cached on disk per
+      ticker and refreshed from the heavy `.info` call once per TTL
+    - Fast (price, 52-week range, market cap, 50-day MA): read from the
+      lightweight `fast_info` endpoint on every fetch
     """
     
-    def __init__(self, rate_limit_delay: float = 0.5):
+    # `.info` keys that rarely change intra-day
+    SLOW_FIELDS = ['sector', 'trailingPE', 'forwardPE', 'pegRatio', 'twoHundredDayAverage']
+    
+    # Bulkhead: Yahoo calls run on their own bounded pool so a stalled
+    # Yahoo endpoint cannot starve FRED/Tavily/CNN ingestion
+    _pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="yfinance")
+    
+    # Concurrent requests for the same ticker share one fetch
+    _inflight = SingleFlight(_pool)
+    
+    def __init__(
+        self,
+        rate_limit_delay: float = 0.5,
+        cache_dir: str = ".cache/yf_slow",
+        slow_ttl_hours: float = 24
+    ):
         """Initialize yFinance client.
         
         Args:
             rate_limit_delay: Seconds to wait between ticker requests
+            cache_dir: Directory for cached slow-tier ticker fields
+            slow_ttl_hours: Hours before cached slow fields are refetched
         """
         self.rate_limit_delay = rate_limit_delay
+        self.cache_dir = Path(cache_dir)
+        self.slow_ttl = timedelta(hours=slow_ttl_hours)
         self.logger = logger.bind(service="yfinance_client")
     
     def fetch_equity_data(
@@ -47,9 +77,18 @@ class YFinanceClient:
         equities = []
         failed_tickers = []
         
+        futures = {}
         for ticker in tickers:
+            futures[ticker] = self._inflight.submit(
+                ticker.upper(), self._fetch_single_ticker, ticker, max_retries
+            )
+            
+            # Rate limiting (staggers request starts across the pool)
+            time.sleep(self.rate_limit_delay)
+        
+        for ticker, future in futures.items():
             try:
-                equity_data = self._fetch_single_ticker(ticker, max_retries)
+                equity_data = future.result()
                 if equity_data:
                     equities.append(equity_data)
                 else:
@@ -61,9 +100,6 @@ class YFinanceClient:
                     error=str(e)
                 )
                 failed_tickers.append(ticker)
-            
-            # Rate limiting
-            time.sleep(self.rate_limit_delay)
         
         if not equities:
             raise ValueError("Failed to fetch data for any tickers")
@@ -117,14 +153,15 @@ class YFinanceClient:
         # Use batch download for efficiency (reduces API calls)
         try:
             # Fetch 1 year of data, Close price only
-            data = yf.download(
+            data = self._pool.submit(
+                yf.download,
                 tickers=all_universe_tickers,
                 period="1y",
                 interval="1d",
                 group_by="ticker",
                 auto_adjust=True,
                 progress=False
-            )
+            ).result()
             
             market_context = {}
             
@@ -183,7 +220,7 @@ class YFinanceClient:
         for attempt in range(max_retries):
             try:
                 stock = yf.Ticker(ticker)
-                info = stock.info
+                info, slow_cached = self._get_ticker_info(ticker, stock)
                 
                 # Fetch 1-year history for returns calculation
                 history = stock.history(period="1y")
@@ -215,6 +252,14 @@ class YFinanceClient:
                 if equity.current_price == 0 or equity.market_cap == 0:
                     raise ValueError(f"Missing critical data for {ticker}")
                 
+                # Only a response that passed the checks above is cached,
+                # so an empty or partial `.info` is refetched next time
+                if not slow_cached:
+                    self._save_slow_fields(
+                        ticker,
+                        {field: info.get(field) for field in self.SLOW_FIELDS}
+                    )
+                
                 self.logger.debug(
                     "ticker_fetched",
                     ticker=ticker,
@@ -243,6 +288,82 @@ class YFinanceClient:
         
         return None
     
+    def _get_ticker_info(self, ticker: str, stock: yf.Ticker) -> tuple[dict, bool]:
+        """Get `.info`-style fields, skipping `.info` when slow fields are cached.
+        
+        Args:
+            ticker: Stock ticker symbol
+            stock: yfinance Ticker object
+            
+        Returns:
+            Tuple of (dict keyed like `yf.Ticker.info`, whether the slow
+            fields came from the cache)
+        """
+        slow = self._load_slow_fields(ticker)
+        
+        if slow is None:
+            # Cache miss: one full `.info` call serves both tiers; the
+            # caller caches the slow fields once the data checks out
+            return stock.info, False
+        
+        fast = stock.fast_info
+        # fast_info derives market cap as shares * last price, so it is
+        # usually fractional; EquityData.market_cap is a whole-dollar int
+        market_cap = fast.market_cap
+        info = dict(slow)
+        info.update({
+            'currentPrice': fast.last_price,
+            'fiftyTwoWeekHigh': fast.year_high,
+            'fiftyTwoWeekLow': fast.year_low,
+            'marketCap': int(round(market_cap)) if market_cap is not None else None,
+            'fiftyDayAverage': fast.fifty_day_average,
+        })
+        
+        self.logger.debug("slow_fields_cache_hit", ticker=ticker)
+        return info, True
+    
+    def _load_slow_fields(self, ticker: str) -> Optional[dict]:
+        """Load cached slow-tier fields if still within TTL.
+        
+        Args:
+            ticker: Stock ticker symbol
+            
+        Returns:
+            Cached fields or None if missing/expired/unreadable
+        """
+        cache_path = self.cache_dir / f"{ticker.upper()}.json"
+        
+        try:
+            age = time.time() - cache_path.stat().st_mtime
+            if age > self.slow_ttl.total_seconds():
+                return None
+            
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_slow_fields(self, ticker: str, fields: dict) -> None:
+        """Persist slow-tier fields for a ticker.
+        
+        Args:
+            ticker: Stock ticker symbol
+            fields: Slow-tier `.info` fields
+        """
+        cache_path = self.cache_dir / f"{ticker.upper()}.json"
+        tmp_path = cache_path.with_suffix('.json.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Written aside and renamed, so a concurrent reader or a crash
+            # never sees a truncated file
+            with open(tmp_path, 'w') as f:
+                json.dump(fields, f, default=str)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            # Cache is an optimization only; never fail the fetch over it
+            self.logger.warning("slow_fields_cache_write_failed", ticker=ticker, error=str(e))
+    
     @staticmethod
     def _safe_get(data: dict, key: str, default: any = None) -> any:
         """Safely get value from dict with default.
@@ -1,12 +1,21 @@
 """Main pipeline orchestrator for tinyvc."""
 
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import date, datetime
+from functools import lru_cache
 from dotenv import load_dotenv
 import structlog
 import yaml
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -22,27 +31,59 @@ logger = structlog.get_logger()
 from src.ingestion import FREDClient, YFinanceClient, SentimentClient, NewsClient
 from src.quant_engine import (
     DataValidator,
+    Thresholds,
     OpportunityFilter,
     CorrelationAnalyzer,
     PayloadBuilder
 )
-from src.research_engine import GeminiClient, PromptManager
+from src.research_engine import (
+    GeminiClient,
+    PromptManager,
+    SemanticCache,
+    sentence_transformer_embedder,
+)
 from src.delivery import ReportBuilder, VisualizationGenerator, EmailSender
 from src.storage import DataLake
 from src.evaluation import GroundednessEvaluator, PerformanceTracker
 from schemas import RunMetadata
+from schemas.payload import MarketNews
 
 
+@lru_cache(maxsize=4)
 def load_config(config_file: str = "config/watchlist.yaml") -> dict:
-    """Load configuration from YAML file."""
+    """Load configuration from YAML file (parsed once per path)."""
     with open(config_file, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
 
+@lru_cache(maxsize=4)
 def load_thresholds(config_file: str = "config/thresholds.yaml") -> dict:
-    """Load thresholds configuration."""
+    """Load thresholds configuration (parsed once per path)."""
     with open(config_file, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+@lru_cache(maxsize=1)
+def get_prompt_manager() -> PromptManager:
+    """Load the active prompt once per process and reuse it across runs."""
+    return PromptManager()
+
+
+@contextmanager
+def timed(stage: str, timings: dict):
+    """Time a pipeline stage, logging and recording its duration.
+    
+    Args:
+        stage: Stage name used in logs and run metadata
+        timings: Dict the duration in milliseconds is stored into
+    """
+    stage_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = round((time.perf_counter() - stage_start) * 1000, 1)
+        timings[stage] = duration_ms
+        logger.bind(stage=stage).info("stage_complete", duration_ms=duration_ms)
 
 
 def run_pipeline():
@@ -50,15 +91,20 @@ def run_pipeline():
     start_time = datetime.now()
     today = date.today().isoformat()
     errors = []
+    stage_timings = {}
     
     logger.info("=== TINYVC PIPELINE STARTED ===", date=today)
     
     # Load environment variables
     load_dotenv()
     
+    # Read numeric settings once
+    weekly_budget = int(os.getenv('WEEKLY_BUDGET', 50))
+    investment_horizon = int(os.getenv('INVESTMENT_HORIZON', 20))
+    
     # Load configurations
     watchlist_config = load_config()
-    thresholds_config = load_thresholds()
+    thresholds = Thresholds.from_config(load_thresholds())
     tickers = watchlist_config.get('candidate_pool', [])  # NEW: Use candidate_pool
     
     logger.info("config_loaded", ticker_count=len(tickers))
@@ -68,182 +114,223 @@ def run_pipeline():
     # ==========================================
     logger.info("=== STAGE 1: DATA INGESTION ===")
     
-    # Fetch macro data
-    fred_client = FREDClient(api_key=os.getenv('FRED_API_KEY'))
-    macro_data = fred_client.fetch_macro_data()
-    
-    # Fetch equity data
-    yfinance_client = YFinanceClient()
-    equity_dataset = yfinance_client.fetch_equity_data(tickers)
-    
-    # Fetch sentiment
-    sentiment_client = SentimentClient()
-    sentiment = sentiment_client.fetch_fear_greed()
-    
-    # Fetch market news (NEW)
-    try:
-        news_client = NewsClient(api_key=os.getenv('TAVILY_API_KEY'))
-        news_data = news_client.fetch_market_narrative()
-    except Exception as e:
-        logger.warning(
-            "news_fetch_failed_using_empty",
-            error=str(e)
+    with timed("ingestion", stage_timings):
+        fred_client = FREDClient(api_key=os.getenv('FRED_API_KEY'))
+        yfinance_client = YFinanceClient()
+        sentiment_client = SentimentClient()
+        market_universe = watchlist_config.get('market_universe', {})
+        
+        def fetch_news() -> MarketNews:
+            """Fetch news narrative (client init raises if the key is missing)."""
+            news_client = NewsClient(api_key=os.getenv('TAVILY_API_KEY'))
+            return news_client.fetch_market_narrative()
+        
+        # Sources are independent, so fetch them concurrently (each client
+        # still throttles itself on its own bulkhead pool)
+        with ThreadPoolExecutor(max_workers=5, thread_name_prefix="ingestion") as ingestion_pool:
+            macro_future = ingestion_pool.submit(fred_client.fetch_macro_data)
+            equity_future = ingestion_pool.submit(yfinance_client.fetch_equity_data, tickers)
+            sentiment_future = ingestion_pool.submit(sentiment_client.fetch_fear_greed)
+            news_future = ingestion_pool.submit(fetch_news)
+            market_context_future = ingestion_pool.submit(
+                yfinance_client.fetch_market_context,
+                market_universe
+            )
+            
+            macro_data = macro_future.result()
+            equity_dataset = equity_future.result()
+            sentiment = sentiment_future.result()
+            market_context_data = market_context_future.result()
+            
+            try:
+                news_data = news_future.result()
+            except Exception as e:
+                logger.warning(
+                    "news_fetch_failed_using_empty",
+                    error=str(e)
+                )
+                # Fallback to empty news rather than crash
+                news_data = MarketNews()
+        
+        logger.info(
+            "ingestion_complete",
+            equities_fetched=len(equity_dataset.equities),
+            fear_greed=sentiment.score,
+            news_queries=3 if news_data.daily_drivers else 0,
+            market_universe_tickers=len(market_context_data)
         )
-        # Fallback to empty news rather than crash
-        from schemas.payload import MarketNews
-        news_data = MarketNews()
-    
-    # Fetch market context (NEW)
-    market_universe = watchlist_config.get('market_universe', {})
-    market_context_data = yfinance_client.fetch_market_context(market_universe)
-    
-    logger.info(
-        "ingestion_complete",
-        equities_fetched=len(equity_dataset.equities),
-        fear_greed=sentiment.score,
-        news_queries=3 if news_data.daily_drivers else 0,
-        market_universe_tickers=len(market_context_data)
-    )
     
     # ==========================================
     # 2. QUANTITATIVE ANALYSIS
     # ==========================================
     logger.info("=== STAGE 2: QUANTITATIVE ANALYSIS ===")
     
-    # Validate data
-    validator = DataValidator()
-    validated_dataset, dropped_tickers = validator.validate_equity_data(equity_dataset)
-    
-    if dropped_tickers:
-        logger.warning("tickers_dropped", count=len(dropped_tickers), reasons=dropped_tickers)
-    
-    # Apply filters
-    opportunity_filter = OpportunityFilter(thresholds_config)
-    filtered_df = opportunity_filter.apply_filters(validated_dataset, sentiment.score)
-    
-    # Calculate correlations
-    correlation_analyzer = CorrelationAnalyzer(
-        max_correlation=thresholds_config.get('correlation', {}).get('max_allowed', 0.85)
-    )
-    
-    top_tickers = filtered_df.head(15)['ticker'].tolist()  # Top 15 for correlation
-    corr_matrix = correlation_analyzer.calculate_correlation_matrix(top_tickers)
-    
-    # Enforce diversification
-    diversified_df = correlation_analyzer.enforce_diversification(
-        filtered_df.head(15),  # Only top opportunities
-        corr_matrix
-    )
-    
-    logger.info(
-        "quantitative_analysis_complete",
-        opportunities_found=len(diversified_df)
-    )
+    with timed("quantitative_analysis", stage_timings):
+        # Validate data
+        validator = DataValidator()
+        validated_dataset, dropped_tickers = validator.validate_equity_data(equity_dataset)
+        
+        if dropped_tickers:
+            logger.warning("tickers_dropped", count=len(dropped_tickers), reasons=dropped_tickers)
+        
+        # Apply filters
+        opportunity_filter = OpportunityFilter(thresholds)
+        filtered_df = opportunity_filter.apply_filters(
+            validated_dataset,
+            sentiment.score,
+            top_k=thresholds.max_candidates  # Only top opportunities
+        )
+        
+        # Calculate correlations
+        correlation_analyzer = CorrelationAnalyzer(
+            max_correlation=thresholds.max_correlation
+        )
+        
+        top_tickers = filtered_df['ticker'].tolist()
+        corr_matrix = correlation_analyzer.calculate_correlation_matrix(top_tickers)
+        
+        # Enforce diversification
+        diversified_df = correlation_analyzer.enforce_diversification(
+            filtered_df,
+            corr_matrix
+        )
+        
+        logger.info(
+            "quantitative_analysis_complete",
+            opportunities_found=len(diversified_df)
+        )
     
     # ==========================================
     # 3. BUILD LLM PAYLOAD
     # ==========================================
     logger.info("=== STAGE 3: PAYLOAD CONSTRUCTION ===")
     
-    payload_builder = PayloadBuilder()
-    payload = payload_builder.build_payload(
-        macro_data=macro_data,
-        filtered_df=diversified_df,
-        sentiment=sentiment,
-        market_context_data=market_context_data,  # NEW
-        news_data=news_data,  # NEW
-        weekly_budget=int(os.getenv('WEEKLY_BUDGET', 50)),
-        investment_horizon=int(os.getenv('INVESTMENT_HORIZON', 20))
-    )
-    
-    logger.info("payload_built", opportunity_count=len(payload.opportunities))
+    with timed("payload_construction", stage_timings):
+        payload_builder = PayloadBuilder()
+        payload = payload_builder.build_payload(
+            macro_data=macro_data,
+            filtered_df=diversified_df,
+            sentiment=sentiment,
+            market_context_data=market_context_data,  # NEW
+            news_data=news_data,  # NEW
+            weekly_budget=weekly_budget,
+            investment_horizon=investment_horizon
+        )
+        
+        logger.info("payload_built", opportunity_count=len(payload.opportunities))
+        
+        # Serialized once: embedded in the LLM prompt and persisted as-is
+        payload_json = payload.model_dump_json(indent=2)
     
     # ==========================================
     # 4. LLM ANALYSIS
     # ==========================================
     logger.info("=== STAGE 4: LLM RESEARCH GENERATION ===")
     
-    prompt_manager = PromptManager()
-    gemini_client = GeminiClient(
-        api_key=os.getenv('GEMINI_API_KEY'),
-        prompt_manager=prompt_manager
-    )
-    
-    analysis = gemini_client.generate_analysis(payload)
-    
-    logger.info(
-        "llm_analysis_complete",
-        opportunities=len(analysis.opportunities),
-        scenarios=len(analysis.scenarios)
-    )
+    with timed("llm_submit", stage_timings):
+        prompt_manager = get_prompt_manager()
+        cache_ttl_seconds = float(os.getenv('LLM_CACHE_TTL_SECONDS', 3600))
+        semantic_cache_dir = os.getenv('LLM_SEMANTIC_CACHE_DIR')
+        gemini_client = GeminiClient(
+            api_key=os.getenv('GEMINI_API_KEY'),
+            prompt_manager=prompt_manager,
+            cache_dir=os.getenv('LLM_CACHE_DIR'),
+            cache_ttl_seconds=cache_ttl_seconds,
+            semantic_cache=SemanticCache(
+                sentence_transformer_embedder(),
+                cache_dir=semantic_cache_dir,
+                ttl_seconds=cache_ttl_seconds
+            ) if semantic_cache_dir else None
+        )
+        
+        # Runs in the background while Stage 5 renders charts; the inputs
+        # visualizations need are all available already
+        llm_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm")
+        llm_future = llm_pool.submit(
+            gemini_client.generate_analysis, payload, payload_json=payload_json
+        )
+        llm_pool.shutdown(wait=False)
     
     # ==========================================
     # 5. GENERATE VISUALIZATIONS
     # ==========================================
     logger.info("=== STAGE 5: VISUALIZATION GENERATION ===")
     
-    viz_gen = VisualizationGenerator()
-    
-    # Correlation heatmap
-    heatmap_path = viz_gen.generate_correlation_heatmap(corr_matrix)
-    
-    # Opportunity chart
-    chart_path = viz_gen.generate_opportunity_chart(diversified_df)
-    
-    # Sector heatmap (NEW - for strategist reports)
-    sector_heatmap_path = viz_gen.generate_sector_heatmap(
-        payload.market_context.sector_leaders
-    )
+    with timed("visualization", stage_timings):
+        viz_gen = VisualizationGenerator()
+        
+        # Correlation heatmap
+        heatmap_path = viz_gen.generate_correlation_heatmap(corr_matrix)
+        
+        # Opportunity chart
+        chart_path = viz_gen.generate_opportunity_chart(diversified_df)
+        
+        # Sector heatmap (NEW - for strategist reports)
+        sector_heatmap_path = viz_gen.generate_sector_heatmap(
+            payload.market_context.sector_leaders
+        )
+        
+        logger.info("visualizations_generated")
     
-    logger.info("visualizations_generated")
+    with timed("llm_wait", stage_timings):
+        # Join the LLM call started in Stage 4 (re-raises any failure)
+        analysis = llm_future.result()
+        
+        logger.info(
+            "llm_analysis_complete",
+            opportunities=len(analysis.opportunities),
+            scenarios=len(analysis.scenarios)
+        )
     
     # ==========================================
     # 6. BUILD REPORT
     # ==========================================
     logger.info("=== STAGE 6: REPORT COMPILATION ===")
     
-    report_builder = ReportBuilder()
-    report = report_builder.build_report(
-        macro_data=macro_data,
-        sentiment=sentiment,
-        analysis=analysis,
-        payload=payload,  # NEW - includes market_context and market_news
-        weekly_budget=int(os.getenv('WEEKLY_BUDGET', 50)),
-        investment_horizon=int(os.getenv('INVESTMENT_HORIZON', 20))
-    )
-    
-    # Save report
-    report_path = report_builder.save_report(report)
-    
-    logger.info("report_saved", path=str(report_path))
+    with timed("report_compilation", stage_timings):
+        report_builder = ReportBuilder()
+        report = report_builder.build_report(
+            macro_data=macro_data,
+            sentiment=sentiment,
+            analysis=analysis,
+            payload=payload,  # NEW - includes market_context and market_news
+            weekly_budget=weekly_budget,
+            investment_horizon=investment_horizon
+        )
+        
+        # Save report
+        report_path = report_builder.save_report(report)
+        
+        logger.info("report_saved", path=str(report_path))
     
     # ==========================================
     # 7. EMAIL DELIVERY
     # ==========================================
     logger.info("=== STAGE 7: EMAIL DELIVERY ===")
     
-    email_sender = EmailSender(
-        smtp_server=os.getenv('SMTP_SERVER'),
-        smtp_port=int(os.getenv('SMTP_PORT', 587)),
-        smtp_user=os.getenv('SMTP_USER'),
-        smtp_password=os.getenv('SMTP_PASSWORD')
-    )
-    
-    success = email_sender.send_report(
-        recipient=os.getenv('RECIPIENT_EMAIL'),
-        subject=f"tinyvc Report: {date.today().strftime('%Y-%m-%d')}",
-        markdown_body=report,
-        attachments=[
-            str(report_path),
-            str(heatmap_path),
-            str(chart_path)
-        ]
-    )
-    
-    if success:
-        logger.info("email_sent_successfully")
-    else:
-        logger.error("email_send_failed")
+    with timed("email_delivery", stage_timings):
+        email_sender = EmailSender(
+            smtp_server=os.getenv('SMTP_SERVER'),
+            smtp_port=int(os.getenv('SMTP_PORT', 587)),
+            smtp_user=os.getenv('SMTP_USER'),
+            smtp_password=os.getenv('SMTP_PASSWORD')
+        )
+        
+        success = email_sender.send_report(
+            recipient=os.getenv('RECIPIENT_EMAIL'),
+            subject=f"tinyvc Report: {today}",
+            markdown_body=report,
+            attachments=[
+                str(report_path),
+                str(heatmap_path),
+                str(chart_path)
+            ]
+        )
+        
+        if success:
+            logger.info("email_sent_successfully")
+        else:
+            logger.error("email_send_failed")
     
     # ==========================================
     # PIPELINE COMPLETE
@@ -254,67 +341,95 @@ def run_pipeline():
     # ==========================================
     logger.info("=== STAGE 8: DATA PERSISTENCE ===")
     
-    data_lake = DataLake(base_path="data")
-    
-    try:
-        data_lake.save_macro_data(today, macro_data)
-        data_lake.save_sentiment_data(today, sentiment)
-        data_lake.save_equity_dataset(today, equity_dataset)
+    with timed("data_persistence", stage_timings):
+        data_lake = DataLake(base_path="data")
+        
+        # Writes run in the background while evaluation/tracking proceed;
+        # they only need the in-memory objects, not the files on disk
+        io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="persistence")
         
         # Save opportunities as list of dicts
         opportunities_dict = diversified_df.to_dict('records')
-        data_lake.save_opportunities(today, opportunities_dict)
         
-        data_lake.save_llm_payload(today, payload)
-        data_lake.save_llm_response(today, analysis)
-        
-        logger.info("data_persisted_successfully")
-    except Exception as e:
-        logger.error("data_persistence_failed", error=str(e))
-        errors.append(f"Data persistence: {str(e)}")
+        # One all-or-nothing batch: a failed write leaves no half-saved run
+        persistence_futures = [
+            io_pool.submit(data_lake.save_batch, today, {
+                'macro': macro_data,
+                'sentiment': sentiment,
+                'equities': equity_dataset,
+                'opportunities': opportunities_dict,
+                'payload': payload_json.encode(),
+                'analysis': analysis,
+            }),
+        ]
     
     # ==========================================
     # 9. EVALUATE LLM RESPONSE
     # ==========================================
     logger.info("=== STAGE 9: LLM EVALUATION ===")
     
-    evaluator = GroundednessEvaluator()
-    
-    try:
-        grounding_report = evaluator.evaluate_response(payload, analysis)
-        data_lake.save_evaluation(today, grounding_report)
+    with timed("llm_evaluation", stage_timings):
+        evaluator = GroundednessEvaluator()
         
-        logger.info(
-            "evaluation_complete",
-            overall_score=grounding_report.overall_grounding_score,
-            quality_grade=grounding_report.quality_grade,
-            issues=len(grounding_report.issues_found)
-        )
-        
-        if grounding_report.quality_grade in ['D', 'F']:
-            logger.warning(
-                "low_quality_llm_output",
-                grade=grounding_report.quality_grade,
-                issues=grounding_report.issues_found
+        try:
+            grounding_report = evaluator.evaluate_response(payload, analysis)
+            data_lake.save_evaluation(today, grounding_report)
+            
+            logger.info(
+                "evaluation_complete",
+                overall_score=grounding_report.overall_grounding_score,
+                quality_grade=grounding_report.quality_grade,
+                issues=len(grounding_report.issues_found)
             )
-    except Exception as e:
-        logger.error("evaluation_failed", error=str(e))
-        errors.append(f"Evaluation: {str(e)}")
+            
+            if grounding_report.quality_grade in ['D', 'F']:
+                logger.warning(
+                    "low_quality_llm_output",
+                    grade=grounding_report.quality_grade,
+                    issues=grounding_report.issues_found
+                )
+        except Exception as e:
+            logger.error("evaluation_failed", error=str(e))
+            errors.append(f"Evaluation: {str(e)}")
     
     # ==========================================
     # 10. TRACK RECOMMENDATIONS
     # ==========================================
     logger.info("=== STAGE 10: PERFORMANCE TRACKING ===")
     
-    performance_tracker = PerformanceTracker(data_lake)
+    with timed("performance_tracking", stage_timings):
+        performance_tracker = PerformanceTracker(data_lake)
+        
+        # Nothing downstream reads the tracking file, so it joins the Stage 8
+        # writes in the background
+        tracking_future = io_pool.submit(
+            performance_tracker.record_recommendations, today, analysis.opportunities
+        )
+    
+    with timed("persistence_wait", stage_timings):
+        # Wait for Stage 8 writes and tracking before recording the run outcome
+        wait(persistence_futures + [tracking_future])
+        io_pool.shutdown()
     
     try:
-        performance_tracker.record_recommendations(today, analysis.opportunities)
+        tracking_future.result()
         logger.info("recommendations_tracked", count=len(analysis.opportunities))
     except Exception as e:
         logger.error("performance_tracking_failed", error=str(e))
         errors.append(f"Performance tracking: {str(e)}")
     
+    persistence_errors = [
+        future.exception() for future in persistence_futures
+        if future.exception() is not None
+    ]
+    
+    if persistence_errors:
+        for e in persistence_errors:
+            logger.error("data_persistence_failed", error=str(e))
+            errors.append(f"Data persistence: {str(e)}")
+    else:
+        logger.info("data_persisted_successfully")
+    
     # ==========================================
     # 11. SAVE RUN METADATA
     # ==========================================
@@ -332,7 +447,8 @@ def run_pipeline():
         model_name="gemma-3-27b-it",
         email_delivered=success,
         report_generated=True,
-        errors=errors
+        errors=errors,
+        stage_timings=stage_timings
     )
     
     try:
@@ -1,12 +1,14 @@
 """Quantitative engine exports."""
 
 from .data_validator import DataValidator
+from .thresholds import Thresholds
 from .filters import OpportunityFilter
 from .correlation import CorrelationAnalyzer
 from .payload_builder import PayloadBuilder
 
 __all__ = [
     'DataValidator',
+    'Thresholds',
     'OpportunityFilter',
     'CorrelationAnalyzer',
     'PayloadBuilder',
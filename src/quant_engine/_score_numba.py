@@ -0,0 +1,92 @@
+"""Numba-compiled opportunity scoring for very large candidate pools.
+
+Optional: requires numba. OpportunityFilter imports this module lazily
+and falls back to its NumPy implementation when numba is unavailable.
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def score_rows(
+    pe_ratio: np.ndarray,
+    peg_ratio: np.ndarray,
+    pct_from_high: np.ndarray,
+    above_200d_ma: np.ndarray,
+    above_50d_ma: np.ndarray,
+    year_return: np.ndarray,
+    value_mask: np.ndarray,
+    fear_greed_score: int
+) -> np.ndarray:
+    """Score every row in parallel; mirrors OpportunityFilter._evaluate.
+    
+    Args:
+        pe_ratio: Trailing P/E (NaN if missing)
+        peg_ratio: PEG ratio (NaN if missing)
+        pct_from_high: Fractional distance from the 52-week high
+        above_200d_ma: Price above 200-day MA
+        above_50d_ma: Price above 50-day MA
+        year_return: 1-year return percentage (NaN if missing)
+        value_mask: Rows passing the value filters
+        fear_greed_score: Current sentiment score
+        
+    Returns:
+        Opportunity scores clamped to 0-100
+    """
+    n = pe_ratio.shape[0]
+    scores = np.empty(n, dtype=np.float64)
+    
+    for i in prange(n):
+        score = 50.0
+        
+        pe = pe_ratio[i]
+        if not math.isnan(pe):
+            if pe < 20:
+                score += 15
+            elif pe < 30:
+                score += 5
+            elif pe > 40:
+                score -= 10
+        
+        peg = peg_ratio[i]
+        if not math.isnan(peg):
+            if peg < 1.0:
+                score += 10
+            elif peg < 1.5:
+                score += 5
+            elif peg > 2.5:
+                score -= 10
+        
+        pct = pct_from_high[i]
+        if pct > -0.05:
+            score += 15
+        elif pct > -0.15:
+            score += 5
+        elif pct < -0.30:
+            score -= 5
+        
+        if above_200d_ma[i]:
+            score += 10
+        if above_50d_ma[i]:
+            score += 5
+        
+        ret = year_return[i]
+        if not math.isnan(ret):
+            if ret > 30:
+                score += 10
+            elif ret > 10:
+                score += 5
+            elif ret < -10:
+                score -= 5
+        
+        if fear_greed_score < 25 and pct < -0.20 and value_mask[i]:
+            score += 10
+        if fear_greed_score > 75:
+            score -= 10
+        
+        scores[i] = min(100.0, max(0.0, score))
+    
+    return scores
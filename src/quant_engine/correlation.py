@@ -1,9 +1,12 @@
 """Correlation analysis for portfolio diversification."""
 
+import os
+import re
 import pandas as pd
 import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta
+from pathlib import Path
 import structlog
 from typing import Optional
 
@@ -15,16 +18,27 @@ class CorrelationAnalyzer:
     
     Uses 1-year daily returns to calculate Pearson correlation matrix.
     Helps avoid overconcentration in highly correlated securities.
+    
+    Daily closes are cached on disk per period, so warm runs only
+    download the bars added since the last cached trading day.
     """
     
-    def __init__(self, max_correlation: float = 0.85):
+    # yfinance period units -> DateOffset keyword
+    PERIOD_UNITS = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+    
+    def __init__(self, max_correlation: float = 0.85, cache_dir: str = "data/cache"):
         """Initialize correlation analyzer.
         
         Args:
             max_correlation: Maximum allowed correlation between holdings
+            cache_dir: Directory for the cached daily close prices
         """
         self.max_correlation = max_correlation
+        self.cache_dir = Path(cache_dir)
         self.logger = logger.bind(service="correlation_analyzer")
+        # Upper-triangle pairs of the last matrix seen, reused across
+        # threshold changes: (corr_matrix, rows, cols, correlations, columns)
+        self._pair_cache: Optional[tuple] = None
     
     def calculate_correlation_matrix(
         self,
@@ -40,6 +54,11 @@ class CorrelationAnalyzer:
         Returns:
             NxN correlation matrix DataFrame
         """
+        if len(tickers) < 2:
+            # Nothing to correlate; skip the price download entirely
+            self.logger.info("correlation_skipped_too_few_tickers", ticker_count=len(tickers))
+            return pd.DataFrame()
+        
         self.logger.info("correlation_calculation_started", ticker_count=len(tickers))
         
         # Fetch historical data
@@ -49,8 +68,11 @@ class CorrelationAnalyzer:
             self.logger.warning("no_returns_data")
             return pd.DataFrame()
         
-        # Calculate Pearson correlation
-        corr_matrix = returns.corr()
+        # Calculate Pearson correlation in one float32 pass; returns are
+        # already date-aligned with no NaNs, so no pairwise dropna is needed
+        values = returns.to_numpy(dtype=np.float32)
+        corr = np.atleast_2d(np.corrcoef(values, rowvar=False, dtype=np.float32))
+        corr_matrix = pd.DataFrame(corr, index=returns.columns, columns=returns.columns)
         
         self.logger.info("correlation_calculation_complete")
         
@@ -63,8 +85,10 @@ class CorrelationAnalyzer:
     ) -> pd.DataFrame:
         """Remove redundant tickers based on correlation.
         
-        If two tickers are highly correlated (>max_correlation),
-        keep the one with the higher opportunity score.
+        Tickers are accepted greedily in descending opportunity score; a
+        ticker is dropped if its correlation with any already-kept ticker
+        exceeds max_correlation, so the best-scored ticker of every
+        correlated cluster survives.
         
         Args:
             df: DataFrame with opportunity scores
@@ -75,6 +99,10 @@ class CorrelationAnalyzer:
         """
         self.logger.info("diversification_enforcement_started")
         
+        if len(df) <= 1:
+            self.logger.info("diversification_skipped_too_few_tickers", ticker_count=len(df))
+            return df
+        
         if corr_matrix.empty:
             self.logger.warning("empty_correlation_matrix_skipping_diversification")
             return df
@@ -86,44 +114,46 @@ class CorrelationAnalyzer:
             self.logger.info("no_high_correlation_found", threshold=self.max_correlation)
             return df
         
-        # Track tickers to drop
-        tickers_to_drop = set()
+        values = corr_matrix.to_numpy()
+        abs_corr = np.nan_to_num(np.abs(values))
+        columns = corr_matrix.columns
+        position = {ticker: i for i, ticker in enumerate(columns)}
         
-        for ticker1, ticker2, correlation in high_corr_pairs:
-            # Skip if already marked for removal
-            if ticker1 in tickers_to_drop or ticker2 in tickers_to_drop:
-                continue
+        # Greedy pass in score order: a ticker survives only if it is not
+        # highly correlated with any higher-scored ticker already kept
+        kept_positions = []
+        dropped_labels = []
+        
+        ranked = df.sort_values('opportunity_score', ascending=False)['ticker']
+        for label, ticker in ranked.items():
+            i = position.get(ticker)
+            if i is None:
+                continue  # No price history, nothing to compare against
             
-            # Get opportunity scores
-            score1 = df[df['ticker'] == ticker1]['opportunity_score'].iloc[0]
-            score2 = df[df['ticker'] == ticker2]['opportunity_score'].iloc[0]
+            if kept_positions:
+                row = abs_corr[i, kept_positions]
+                j = int(row.argmax())
+                
+                if row[j] > self.max_correlation:
+                    dropped_labels.append(label)
+                    self.logger.info(
+                        "ticker_dropped_for_correlation",
+                        dropped=ticker,
+                        kept=columns[kept_positions[j]],
+                        correlation=f"{values[i, kept_positions[j]]:.3f}",
+                        reason="lower_opportunity_score"
+                    )
+                    continue
             
-            # Drop the one with lower score
-            if score1 < score2:
-                tickers_to_drop.add(ticker1)
-                self.logger.info(
-                    "ticker_dropped_for_correlation",
-                    dropped=ticker1,
-                    kept=ticker2,
-                    correlation=f"{correlation:.3f}",
-                    reason="lower_opportunity_score"
-                )
-            else:
-                tickers_to_drop.add(ticker2)
-                self.logger.info(
-                    "ticker_dropped_for_correlation",
-                    dropped=ticker2,
-                    kept=ticker1,
-                    correlation=f"{correlation:.3f}",
-                    reason="lower_opportunity_score"
-                )
-        
-        # Filter dataframe
-        diversified_df = df[~df['ticker'].isin(tickers_to_drop)].copy()
+            kept_positions.append(i)
+        
+        # Drop by row label (hashed lookup, returns a new frame) instead of
+        # an isin mask over every ticker plus a copy
+        diversified_df = df.drop(index=dropped_labels)
         
         self.logger.info(
             "diversification_enforcement_complete",
-            dropped_count=len(tickers_to_drop),
+            dropped_count=len(dropped_labels),
             remaining_count=len(diversified_df)
         )
         
@@ -134,43 +164,230 @@ class CorrelationAnalyzer:
         tickers: list[str],
         period: str
     ) -> pd.DataFrame:
-        """Fetch historical returns for tickers.
+        """Fetch historical daily log returns for tickers.
         
         Args:
             tickers: List of ticker symbols
             period: Historical period ("1y", "6mo", etc.)
             
         Returns:
-            DataFrame of daily returns (columns = tickers)
+            DataFrame of daily log returns (columns = tickers)
         """
-        returns_dict = {}
+        if not tickers:
+            return pd.DataFrame()
         
-        for ticker in tickers:
-            try:
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period=period)
-                
-                if not hist.empty:
-                    # Calculate daily returns
-                    daily_returns = hist['Close'].pct_change().dropna()
-                    returns_dict[ticker] = daily_returns
-                else:
-                    self.logger.warning("no_history_data", ticker=ticker)
-                    
-            except Exception as e:
-                self.logger.warning("fetch_returns_failed", ticker=ticker, error=str(e))
-        
-        if not returns_dict:
+        close = self._fetch_close_prices(tickers, period)
+        
+        if close.empty:
+            self.logger.warning("no_history_data", tickers=tickers)
             return pd.DataFrame()
         
-        # Combine into single DataFrame, align by date
-        returns_df = pd.DataFrame(returns_dict)
+        # Daily log returns for the whole (T x N) matrix in one pass; a gap
+        # on either day leaves NaN, as pct_change(fill_method=None) did
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_returns = np.diff(np.log(close.to_numpy(dtype=np.float64)), axis=0)
+        returns_df = pd.DataFrame(
+            log_returns, index=close.index[1:], columns=close.columns
+        ).dropna(how='all')
+        
+        # Drop tickers with sparse history
+        returns_df = returns_df.dropna(axis=1, thresh=int(0.8 * len(returns_df)))
+        
+        missing = set(tickers) - set(returns_df.columns)
+        if missing:
+            self.logger.warning("no_history_data", tickers=sorted(missing))
         
         # Drop rows with any NaN values (different trading days)
         returns_df = returns_df.dropna()
         
         return returns_df
     
+    def _fetch_close_prices(
+        self,
+        tickers: list[str],
+        period: str
+    ) -> pd.DataFrame:
+        """Get daily closes, topping up the on-disk cache with new bars only.
+        
+        Tickers already cached are refreshed from the last cached trading
+        day (re-fetching it in case it was a partial intraday bar); new
+        tickers get the full period. Periods that don't map to a fixed
+        window (e.g. "max") bypass the cache.
+        
+        Closes are split/dividend adjusted, and Yahoo rewrites the whole
+        adjusted history when a split or dividend occurs. The refresh
+        therefore also re-fetches the complete bar before the last cached
+        day; a ticker whose value there changed is re-downloaded for the
+        full period rather than mixing two price bases.
+        
+        Args:
+            tickers: List of ticker symbols
+            period: Historical period ("1y", "6mo", etc.)
+            
+        Returns:
+            DataFrame of daily closes (columns = tickers)
+        """
+        offset = self._period_to_offset(period)
+        if offset is None:
+            return self._download_close(tickers, period=period)
+        
+        cache_path = self.cache_dir / f"close_{period}.parquet"
+        close = self._load_price_cache(cache_path)
+        
+        cached_tickers = [t for t in tickers if t in close.columns]
+        new_tickers = [t for t in tickers if t not in close.columns]
+        
+        if cached_tickers:
+            last_cached_day = min(
+                close[t].last_valid_index() or close.index.min()
+                for t in cached_tickers
+            )
+            # One complete bar before it, to detect adjusted-history rewrites
+            earlier = close.index[close.index < last_cached_day]
+            check_day = earlier.max() if len(earlier) else last_cached_day
+            delta = self._download_close(
+                cached_tickers,
+                start=check_day.strftime('%Y-%m-%d')
+            )
+            
+            rebased = self._rebased_tickers(close, delta, before=last_cached_day)
+            if rebased:
+                self.logger.info("price_cache_rebased", tickers=rebased)
+                close = close.drop(columns=rebased)
+                delta = delta.drop(columns=rebased)
+                new_tickers += rebased
+            
+            close = delta.combine_first(close)
+            self.logger.info(
+                "price_cache_hit",
+                tickers=len(cached_tickers) - len(rebased),
+                new_rows=len(delta)
+            )
+        
+        if new_tickers:
+            close = self._download_close(new_tickers, period=period).combine_first(close)
+        
+        if close.empty:
+            return close
+        
+        # Keep only the rolling period window
+        close = close[close.index > close.index.max() - offset]
+        self._save_price_cache(cache_path, close)
+        
+        return close[[t for t in tickers if t in close.columns]]
+    
+    @staticmethod
+    def _rebased_tickers(
+        cached: pd.DataFrame,
+        fresh: pd.DataFrame,
+        before: pd.Timestamp
+    ) -> list[str]:
+        """Find tickers whose adjusted closes were rewritten since caching.
+        
+        Only bars strictly before `before` are compared, since the last
+        cached bar may have been a partial intraday one.
+        
+        Args:
+            cached: Cached daily closes
+            fresh: Newly downloaded daily closes overlapping the cache
+            before: Compare only bars earlier than this day
+            
+        Returns:
+            Tickers whose overlapping closes differ from the cache
+        """
+        overlap = cached.index.intersection(fresh.index)
+        overlap = overlap[overlap < before]
+        tickers = [t for t in fresh.columns if t in cached.columns]
+        if overlap.empty or not tickers:
+            return []
+        
+        old = cached.loc[overlap, tickers].to_numpy(dtype=np.float64)
+        new = fresh.loc[overlap, tickers].to_numpy(dtype=np.float64)
+        # A missing value on either side is no evidence of a rewrite
+        changed = ~np.isclose(new, old, rtol=1e-4) & ~np.isnan(old) & ~np.isnan(new)
+        return [t for t, rewritten in zip(tickers, changed.any(axis=0)) if rewritten]
+    
+    def _download_close(self, tickers: list[str], **kwargs) -> pd.DataFrame:
+        """Download daily closes with one multi-symbol request.
+        
+        Args:
+            tickers: List of ticker symbols
+            **kwargs: Date range arguments for yf.download (period or start)
+            
+        Returns:
+            DataFrame of daily closes (columns = tickers), empty on failure
+        """
+        try:
+            data = yf.download(
+                tickers=tickers,
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+                **kwargs
+            )
+        except Exception as e:
+            self.logger.warning("fetch_returns_failed", tickers=tickers, error=str(e))
+            return pd.DataFrame()
+        
+        if data.empty:
+            return pd.DataFrame()
+        
+        close = data['Close']
+        if isinstance(close, pd.Series):
+            close = close.to_frame(name=tickers[0])
+        
+        return close
+    
+    def _load_price_cache(self, cache_path: Path) -> pd.DataFrame:
+        """Load cached closes, or an empty frame if missing/unreadable.
+        
+        Args:
+            cache_path: Parquet cache file
+            
+        Returns:
+            DataFrame of cached daily closes
+        """
+        if not cache_path.exists():
+            return pd.DataFrame()
+        
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception as e:
+            self.logger.warning("price_cache_load_failed", path=str(cache_path), error=str(e))
+            return pd.DataFrame()
+    
+    def _save_price_cache(self, cache_path: Path, close: pd.DataFrame) -> None:
+        """Atomically write closes to the cache.
+        
+        Args:
+            cache_path: Parquet cache file
+            close: DataFrame of daily closes
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.parquet.tmp')
+            close.to_parquet(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            # Cache is an optimization only; never fail the analysis over it
+            self.logger.warning("price_cache_save_failed", path=str(cache_path), error=str(e))
+    
+    def _period_to_offset(self, period: str) -> Optional[pd.DateOffset]:
+        """Convert a yfinance period string (e.g. "1y", "6mo") to a DateOffset.
+        
+        Args:
+            period: Historical period string
+            
+        Returns:
+            Matching DateOffset, or None for open-ended periods ("max", "ytd")
+        """
+        match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period)
+        if not match:
+            return None
+        
+        amount, unit = match.groups()
+        return pd.DateOffset(**{self.PERIOD_UNITS[unit]: int(amount)})
+    
     def _find_high_correlation_pairs(
         self,
         corr_matrix: pd.DataFrame
@@ -183,16 +400,41 @@ class CorrelationAnalyzer:
         Returns:
             List of (ticker1, ticker2, correlation) tuples
         """
-        high_corr_pairs = []
-        
-        # Iterate through upper triangle only (avoid duplicates)
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i + 1, len(corr_matrix.columns)):
-                ticker1 = corr_matrix.columns[i]
-                ticker2 = corr_matrix.columns[j]
-                correlation = corr_matrix.iloc[i, j]
-                
-                if abs(correlation) > self.max_correlation:
-                    high_corr_pairs.append((ticker1, ticker2, correlation))
+        rows, cols, correlations, columns = self._upper_triangle(corr_matrix)
+        mask = np.abs(correlations) > self.max_correlation
+        
+        return list(zip(
+            columns[rows[mask]].tolist(),
+            columns[cols[mask]].tolist(),
+            correlations[mask].tolist()
+        ))
+    
+    def _upper_triangle(
+        self,
+        corr_matrix: pd.DataFrame
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Extract upper-triangle pair indices and correlations, cached per matrix.
+        
+        The cache holds a reference to the matrix itself (not just its id),
+        so a recycled id can never return stale pairs. Matrices are treated
+        as immutable once computed.
+        
+        Args:
+            corr_matrix: Correlation matrix
+            
+        Returns:
+            Tuple of (row indices, column indices, correlations, column labels)
+        """
+        cached = self._pair_cache
+        if cached is not None and cached[0] is corr_matrix:
+            return cached[1:]
+        
+        values = corr_matrix.to_numpy()
+        columns = corr_matrix.columns.to_numpy()
+        
+        # Upper triangle only (avoid duplicates and the diagonal)
+        rows, cols = np.triu_indices(len(columns), k=1)
+        correlations = values[rows, cols]
         
-        return high_corr_pairs
+        self._pair_cache = (corr_matrix, rows, cols, correlations, columns)
+        return rows, cols, correlations, columns
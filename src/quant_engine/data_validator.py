@@ -1,8 +1,8 @@
 """Data validation for equity datasets."""
 
-import pandas as pd
+import numpy as np
 import structlog
-from typing import Tuple
+from typing import Mapping, Tuple
 
 from schemas.equities import EquityDataset
 
@@ -21,6 +21,9 @@ class DataValidator:
     # Fields that are critical and cannot be missing
     CRITICAL_FIELDS = ['current_price', 'market_cap', 'ticker']
     
+    # Optional fields counted towards data completeness
+    OPTIONAL_FIELDS = ['pe_ratio', 'forward_pe', 'peg_ratio', 'ma_50d', 'ma_200d', 'year_return']
+    
     # Maximum allowed missing data percentage per ticker
     MAX_MISSING_PCT = 0.20  # 20%
     
@@ -42,59 +45,24 @@ class DataValidator:
         """
         self.logger.info("validation_started", ticker_count=len(dataset.equities))
         
-        df = dataset.to_dataframe()
-        dropped_tickers = []
-        valid_rows = []
-        
-        for idx, row in df.iterrows():
-            ticker = row['ticker']
-            
-            # Check critical fields
-            if not self._has_critical_fields(row):
-                reason = f"{ticker}: Missing critical fields"
-                dropped_tickers.append(reason)
-                self.logger.warning("ticker_dropped", ticker=ticker, reason="missing_critical_fields")
-                continue
-            
-            # Check for invalid values
-            if not self._has_valid_values(row):
-                reason = f"{ticker}: Invalid values (negative price or zero market cap)"
-                dropped_tickers.append(reason)
-                self.logger.warning("ticker_dropped", ticker=ticker, reason="invalid_values")
-                continue
-            
-            # Check data completeness
-            if not self._is_complete_enough(row):
-                reason = f"{ticker}: Too much missing data (>{self.MAX_MISSING_PCT*100}%)"
-                dropped_tickers.append(reason)
-                self.logger.warning("ticker_dropped", ticker=ticker, reason="incomplete_data")
-                continue
-            
-            valid_rows.append(idx)
+        # Check every ticker at once on the columnar view; passing models
+        # are kept as-is
+        has_critical, has_valid, is_complete = self._row_checks(dataset.to_arrays())
+        keep = has_critical & has_valid & is_complete
         
-        # Filter to valid tickers only
-        valid_df = df.loc[valid_rows]
-        
-        # Reconstruct validated dataset
-        from schemas.equities import EquityData
-        valid_equities = []
-        
-        for _, row in valid_df.iterrows():
-            equity = EquityData(
-                ticker=row['ticker'],
-                current_price=row['current_price'],
-                high_52w=row['high_52w'],
-                low_52w=row['low_52w'],
-                pe_ratio=row['pe_ratio'] if pd.notna(row['pe_ratio']) else None,
-                forward_pe=row['forward_pe'] if pd.notna(row['forward_pe']) else None,
-                peg_ratio=row['peg_ratio'] if pd.notna(row['peg_ratio']) else None,
-                market_cap=int(row['market_cap']),
-                sector=row['sector'],
-                ma_50d=row['ma_50d'] if pd.notna(row['ma_50d']) else None,
-                ma_200d=row['ma_200d'] if pd.notna(row['ma_200d']) else None,
-                year_return=row['year_return'] if pd.notna(row['year_return']) else None
-            )
-            valid_equities.append(equity)
+        dropped_tickers = []
+        for index in np.flatnonzero(~keep):
+            ticker = dataset.equities[index].ticker
+            if not has_critical[index]:
+                reason, event_reason = "Missing critical fields", "missing_critical_fields"
+            elif not has_valid[index]:
+                reason, event_reason = "Invalid values (negative price or zero market cap)", "invalid_values"
+            else:
+                reason, event_reason = f"Too much missing data (>{self.MAX_MISSING_PCT*100}%)", "incomplete_data"
+            dropped_tickers.append(f"{ticker}: {reason}")
+            self.logger.warning("ticker_dropped", ticker=ticker, reason=event_reason)
+        
+        valid_equities = [dataset.equities[index] for index in np.flatnonzero(keep)]
         
         # Check if any valid equities remain
         if not valid_equities:
@@ -105,10 +73,10 @@ class DataValidator:
             )
             raise ValueError("All tickers failed validation - no valid data to analyze")
         
-        validated_dataset = EquityDataset(
-            equities=valid_equities,
-            fetched_at=dataset.fetched_at
-        )
+        # Survivors are already-validated models and the list is non-empty,
+        # so copy the dataset with the filtered list rather than re-validating
+        validated_dataset = dataset.model_copy(update={"equities": valid_equities})
+        validated_dataset._arrays_cache = None  # Built for the unfiltered rows
         
         self.logger.info(
             "validation_complete",
@@ -118,65 +86,34 @@ class DataValidator:
         
         return validated_dataset, dropped_tickers
     
-    def _has_critical_fields(self, row: pd.Series) -> bool:
-        """Check if row has all critical fields populated.
+    def _row_checks(
+        self,
+        arrays: Mapping[str, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Evaluate the validation checks for every ticker.
         
-        Args:
-            row: DataFrame row
-            
-        Returns:
-            True if all critical fields present and non-null
-        """
-        for field in self.CRITICAL_FIELDS:
-            if pd.isna(row.get(field)):
-                return False
-            if field in ['current_price', 'market_cap'] and row[field] <= 0:
-                return False
-        return True
-    
-    def _has_valid_values(self, row: pd.Series) -> bool:
-        """Check if numeric values are in valid ranges.
+        Missing values are NaN in the columnar view, and NaN comparisons
+        are False, so a missing price fails the critical check while a
+        missing PE passes the range check.
         
         Args:
-            row: DataFrame row
+            arrays: Columnar equity data from EquityDataset.to_arrays()
             
         Returns:
-            True if values are valid
+            Tuple of boolean masks (critical fields present, values in
+            valid ranges, missing data below threshold)
         """
-        # Price must be positive
-        if row.get('current_price', 0) <= 0:
-            return False
-        
-        # Market cap must be positive
-        if row.get('market_cap', 0) <= 0:
-            return False
-        
-        # 52-week high/low must be sensible
-        high_52w = row.get('high_52w')
-        low_52w = row.get('low_52w')
-        if pd.notna(high_52w) and pd.notna(low_52w):
-            if high_52w <= low_52w:
-                return False
+        price = arrays['current_price']
+        market_cap = arrays['market_cap']
         
-        # PE ratios shouldn't be negative (None is okay)
-        if pd.notna(row.get('pe_ratio')) and row['pe_ratio'] < 0:
-            return False
+        # Critical fields populated; price and market cap must be positive
+        has_critical = arrays['ticker'].astype(bool) & (price > 0) & (market_cap > 0)
         
-        return True
-    
-    def _is_complete_enough(self, row: pd.Series) -> bool:
-        """Check if ticker has sufficient data completeness.
-        
-        Args:
-            row: DataFrame row
-            
-        Returns:
-            True if missing data is below threshold
-        """
-        # Count how many optional fields are missing
-        optional_fields = ['pe_ratio', 'forward_pe', 'peg_ratio', 'ma_50d', 'ma_200d', 'year_return']
+        # 52-week high/low must be sensible; PE shouldn't be negative
+        has_valid = (arrays['high_52w'] > arrays['low_52w']) & ~(arrays['pe_ratio'] < 0)
         
-        missing_count = sum(1 for field in optional_fields if pd.isna(row.get(field)))
-        missing_pct = missing_count / len(optional_fields)
+        # Share of optional fields missing per ticker
+        missing = np.isnan(np.column_stack([arrays[field] for field in self.OPTIONAL_FIELDS]))
+        is_complete = missing.sum(axis=1) / len(self.OPTIONAL_FIELDS) <= self.MAX_MISSING_PCT
         
-        return missing_pct <= self.MAX_MISSING_PCT
+        return has_critical, has_valid, is_complete
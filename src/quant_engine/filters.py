@@ -1,14 +1,40 @@
 """Quantitative filters for screening investment opportunities."""
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+import numpy as np
 import pandas as pd
 import structlog
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Mapping, Optional, Tuple, Union
 
 from schemas.equities import EquityDataset
+from .thresholds import Thresholds
 
 logger = structlog.get_logger()
 
 
+@lru_cache(maxsize=1)
+def _numba_score_kernel() -> Optional[Callable[..., np.ndarray]]:
+    """Import the compiled scoring kernel on first use, if numba is installed."""
+    try:
+        from ._score_numba import score_rows
+    except ImportError:
+        return None
+    return score_rows
+
+
+def _evaluate_chunk(
+    thresholds: Thresholds,
+    arrays: Mapping[str, np.ndarray],
+    fear_greed_score: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate one row chunk in a worker process (module-level so it pickles)."""
+    return OpportunityFilter(thresholds, n_workers=1)._evaluate(arrays, fear_greed_score)
+
+
 class OpportunityFilter:
     """Apply quantitative thresholds as a quality gate for the candidate pool.
     
@@ -20,20 +46,42 @@ class OpportunityFilter:
     Implements value and momentum filters based on configurable thresholds.
     """
     
-    def __init__(self, thresholds: Dict[str, Any]):
+    # Below this many rows the NumPy path beats numba's parallel dispatch
+    NUMBA_MIN_ROWS = 10_000
+    
+    # Below this many rows process start-up and pickling outweigh the gain
+    PARALLEL_MIN_ROWS = 50_000
+    
+    # Columns read by _evaluate; only these are shipped to worker processes
+    EVALUATED_COLUMNS = (
+        'market_cap', 'pe_ratio', 'peg_ratio', 'pct_from_52w_high',
+        'year_return', 'above_200d_ma', 'above_50d_ma'
+    )
+    
+    def __init__(
+        self,
+        thresholds: Union[Thresholds, Dict[str, Any]],
+        n_workers: Optional[int] = None
+    ):
         """Initialize filter with thresholds.
         
         Args:
-            thresholds: Dictionary containing filter configuration
+            thresholds: Parsed Thresholds, or the raw thresholds.yaml
+                dictionary (flattened once here)
+            n_workers: Processes used to evaluate very large pools when
+                numba is unavailable (defaults to the CPU count; 1 disables)
         """
-        self.value_filters = thresholds.get('value_filters', {})
-        self.momentum_filters = thresholds.get('momentum_filters', {})
+        if not isinstance(thresholds, Thresholds):
+            thresholds = Thresholds.from_config(thresholds)
+        self.thresholds = thresholds
+        self.n_workers = n_workers or os.cpu_count() or 1
         self.logger = logger.bind(service="opportunity_filter")
     
     def apply_filters(
         self,
         dataset: EquityDataset,
-        fear_greed_score: int
+        fear_greed_score: int,
+        top_k: Optional[int] = None
     ) -> pd.DataFrame:
         """Apply all filters and calculate opportunity scores.
         
@@ -44,167 +92,216 @@ class OpportunityFilter:
         Args:
             dataset: Validated equity dataset
             fear_greed_score: Current Fear & Greed Index score
+            top_k: If set, return only the top_k highest-scored rows
             
         Returns:
-            DataFrame with filter results and opportunity scores
+            DataFrame with filter results and opportunity scores, sorted
+            by score descending
         """
         self.logger.info("filtering_started", ticker_count=len(dataset.equities))
         
-        df = dataset.to_dataframe()
-        
-        # Apply value filters
-        df['passes_value_filter'] = df.apply(
-            lambda row: self._check_value_filters(row),
-            axis=1
-        )
-        
-        # Apply momentum filters
-        df['passes_momentum_filter'] = df.apply(
-            lambda row: self._check_momentum_filters(row),
-            axis=1
-        )
-        
-        # Calculate composite opportunity score (0-100)
-        df['opportunity_score'] = df.apply(
-            lambda row: self._calculate_opportunity_score(row, fear_greed_score),
-            axis=1
-        )
+        # Masks and scores are computed on the columnar view; the
+        # DataFrame is only materialized for the returned result
+        arrays = dataset.to_arrays()
+        if self._use_process_pool(len(dataset.equities)):
+            value_mask, momentum_mask, scores = self._evaluate_parallel(arrays, fear_greed_score)
+        else:
+            value_mask, momentum_mask, scores = self._evaluate(arrays, fear_greed_score)
         
-        # Sort by opportunity score descending
-        df = df.sort_values('opportunity_score', ascending=False)
+        # copy=False keeps each column its own contiguous 1D block instead
+        # of copying into a consolidated 2D block; the sort below takes a
+        # fresh (writable) copy of every column anyway
+        df = pd.DataFrame({
+            **arrays,
+            # Integer-coded strings for cheaper comparisons/grouping downstream
+            'ticker': pd.Categorical(arrays['ticker']),
+            'sector': pd.Categorical(arrays['sector']),
+            'passes_value_filter': value_mask,
+            'passes_momentum_filter': momentum_mask,
+            'opportunity_score': scores,
+        }, copy=False)
         
-        passed_both = (df['passes_value_filter'] & df['passes_momentum_filter']).sum()
+        # Sort by opportunity score descending (stable for equal scores);
+        # a top-k selection avoids a full sort when only the head is used
+        if top_k is not None and top_k < len(df):
+            df = df.nlargest(top_k, 'opportunity_score', keep='first')
+        else:
+            df = df.iloc[np.argsort(-scores, kind='stable')]
         
         self.logger.info(
             "filtering_complete",
-            passed_value=df['passes_value_filter'].sum(),
-            passed_momentum=df['passes_momentum_filter'].sum(),
-            passed_both=passed_both
+            passed_value=int(value_mask.sum()),
+            passed_momentum=int(momentum_mask.sum()),
+            passed_both=int((value_mask & momentum_mask).sum())
         )
         
         return df
     
-    def _check_value_filters(self, row: pd.Series) -> bool:
-        """Check if ticker passes value filters.
+    def _use_process_pool(self, row_count: int) -> bool:
+        """Whether to split evaluation across worker processes.
+        
+        The numba kernel is already row-parallel within this process, so
+        the pool is only a fallback for very large pools without numba.
         
         Args:
-            row: DataFrame row
+            row_count: Number of candidate rows
             
         Returns:
-            True if passes all value filters
+            True if rows should be evaluated in a process pool
         """
-        # Market cap floor
-        min_market_cap = self.value_filters.get('min_market_cap', 0)
-        if row['market_cap'] < min_market_cap:
-            return False
-        
-        # PE ratio ceiling (if available)
-        max_pe = self.value_filters.get('max_pe_ratio', float('inf'))
-        if pd.notna(row['pe_ratio']) and row['pe_ratio'] > max_pe:
-            return False
-        
-        # PEG ratio ceiling (if available)
-        max_peg = self.value_filters.get('max_peg_ratio', float('inf'))
-        if pd.notna(row['peg_ratio']) and row['peg_ratio'] > max_peg:
-            return False
-        
-        return True
+        return (
+            self.n_workers > 1
+            and row_count >= self.PARALLEL_MIN_ROWS
+            and _numba_score_kernel() is None
+        )
     
-    def _check_momentum_filters(self, row: pd.Series) -> bool:
-        """Check if ticker passes momentum filters.
+    def _evaluate_parallel(
+        self,
+        arrays: Mapping[str, np.ndarray],
+        fear_greed_score: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Evaluate contiguous row chunks in a process pool and stitch the results.
+        
+        Rows are scored independently, so chunk results concatenated in
+        order are identical to a single _evaluate call.
         
         Args:
-            row: DataFrame row
+            arrays: Columnar equity data from EquityDataset.to_arrays()
+            fear_greed_score: Current sentiment score
             
         Returns:
-            True if passes all momentum filters
+            Tuple of (value filter mask, momentum filter mask, scores)
         """
-        # Distance from 52-week high
-        max_pct_from_high = self.momentum_filters.get('max_pct_from_52w_high', 1.0)
-        if row['pct_from_52w_high'] < -max_pct_from_high:
-            return False
+        row_count = len(arrays['market_cap'])
+        edges = np.linspace(0, row_count, self.n_workers + 1, dtype=np.int64)
+        chunks = [
+            {name: arrays[name][start:stop] for name in self.EVALUATED_COLUMNS}
+            for start, stop in zip(edges[:-1], edges[1:])
+        ]
         
-        # Above 200-day MA (if required)
-        require_above_200d = self.momentum_filters.get('require_above_200d_ma', False)
-        if require_above_200d and not row['above_200d_ma']:
-            return False
+        self.logger.info("parallel_evaluation", workers=self.n_workers, rows=row_count)
+        # Spawned, not forked: forking a process that already runs thread
+        # pools (ingestion, numba) can deadlock the children
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.n_workers, mp_context=context) as pool:
+            results = list(pool.map(
+                _evaluate_chunk, repeat(self.thresholds), chunks, repeat(fear_greed_score)
+            ))
         
-        return True
+        value_mask, momentum_mask, scores = (np.concatenate(parts) for parts in zip(*results))
+        return value_mask, momentum_mask, scores
     
-    def _calculate_opportunity_score(
+    def _evaluate(
         self,
-        row: pd.Series,
+        arrays: Mapping[str, np.ndarray],
         fear_greed_score: int
-    ) -> float:
-        """Calculate composite opportunity score (0-100).
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Evaluate value/momentum filters and opportunity scores in one pass.
         
-        Higher score = more attractive opportunity.
+        Each hot column is read once from the columnar view and shared
+        by the filters and the score. A missing PE or PEG never excludes a
+        ticker: NaN comparisons are False, so the negated "exceeds
+        ceiling" tests pass them, and they match no score band.
         
-        Factors considered:
+        Score factors (higher = more attractive, clamped to 0-100):
         - Valuation (PE, PEG)
         - Momentum (distance from high, MA position)
         - Market sentiment (Fear & Greed adjustment)
         
         Args:
-            row: DataFrame row
+            arrays: Columnar equity data from EquityDataset.to_arrays()
             fear_greed_score: Current sentiment score
             
         Returns:
-            Opportunity score (0-100)
+            Tuple of (value filter mask, momentum filter mask, scores)
         """
-        score = 50.0  # Start at neutral
-        
-        # Value component (+/- 20 points)
-        if pd.notna(row['pe_ratio']):
-            # Lower PE is better
-            if row['pe_ratio'] < 20:
-                score += 15
-            elif row['pe_ratio'] < 30:
-                score += 5
-            elif row['pe_ratio'] > 40:
-                score -= 10
-        
-        if pd.notna(row['peg_ratio']):
-            # Lower PEG is better
-            if row['peg_ratio'] < 1.0:
-                score += 10
-            elif row['peg_ratio'] < 1.5:
-                score += 5
-            elif row['peg_ratio'] > 2.5:
-                score -= 10
-        
-        # Momentum component (+/- 20 points)
-        pct_from_high = row['pct_from_52w_high']
-        if pct_from_high > -0.05:  # Within 5% of high
-            score += 15
-        elif pct_from_high > -0.15:  # Within 15% of high
-            score += 5
-        elif pct_from_high < -0.30:  # More than 30% off high
-            score -= 5  # Could be value opportunity or trouble
-        
-        if row['above_200d_ma']:
-            score += 10
-        if row['above_50d_ma']:
-            score += 5
+        market_cap = arrays['market_cap']
+        pe_ratio = arrays['pe_ratio']
+        peg_ratio = arrays['peg_ratio']
+        pct_from_high = arrays['pct_from_52w_high']
+        year_return = arrays['year_return']
+        above_200d_ma = arrays['above_200d_ma']
+        above_50d_ma = arrays['above_50d_ma']
+        
+        # Value filters: market cap floor, PE and PEG ceilings
+        value_mask = (
+            ~(market_cap < self.thresholds.min_market_cap)
+            & ~(pe_ratio > self.thresholds.max_pe_ratio)
+            & ~(peg_ratio > self.thresholds.max_peg_ratio)
+        )
+        
+        # Momentum filters: distance from 52-week high, 200d MA if required
+        momentum_mask = ~(pct_from_high < -self.thresholds.max_pct_from_52w_high)
+        if self.thresholds.require_above_200d_ma:
+            momentum_mask &= above_200d_ma
+        
+        # Very large pools score row-parallel in compiled code when numba
+        # is available; otherwise use NumPy bands
+        kernel = _numba_score_kernel() if len(pe_ratio) >= self.NUMBA_MIN_ROWS else None
+        score_rows = kernel or self._score_rows
+        scores = score_rows(
+            pe_ratio, peg_ratio, pct_from_high, above_200d_ma,
+            above_50d_ma, year_return, value_mask, fear_greed_score
+        )
+        
+        return value_mask, momentum_mask, scores
+    
+    @staticmethod
+    def _score_rows(
+        pe_ratio: np.ndarray,
+        peg_ratio: np.ndarray,
+        pct_from_high: np.ndarray,
+        above_200d_ma: np.ndarray,
+        above_50d_ma: np.ndarray,
+        year_return: np.ndarray,
+        value_mask: np.ndarray,
+        fear_greed_score: int
+    ) -> np.ndarray:
+        """Score every row with banded NumPy selects.
+        
+        Each factor is an np.select over its column; missing values
+        (NaN) match no band and contribute nothing.
+        
+        Args:
+            pe_ratio: Trailing P/E (NaN if missing)
+            peg_ratio: PEG ratio (NaN if missing)
+            pct_from_high: Fractional distance from the 52-week high
+            above_200d_ma: Price above 200-day MA
+            above_50d_ma: Price above 50-day MA
+            year_return: 1-year return percentage (NaN if missing)
+            value_mask: Rows passing the value filters
+            fear_greed_score: Current sentiment score
+            
+        Returns:
+            Opportunity scores clamped to 0-100
+        """
+        score = np.full(len(pe_ratio), 50.0)  # Start at neutral
+        
+        # Value component (+/- 20 points): lower PE and PEG are better
+        score += np.select([pe_ratio < 20, pe_ratio < 30, pe_ratio > 40], [15, 5, -10], default=0)
+        score += np.select([peg_ratio < 1.0, peg_ratio < 1.5, peg_ratio > 2.5], [10, 5, -10], default=0)
+        
+        # Momentum component (+/- 20 points); more than 30% off the high
+        # could be a value opportunity or trouble
+        score += np.select(
+            [pct_from_high > -0.05, pct_from_high > -0.15, pct_from_high < -0.30],
+            [15, 5, -5],
+            default=0
+        )
+        score += 10 * above_200d_ma
+        score += 5 * above_50d_ma
         
         # 1-year return component (+/- 10 points)
-        if pd.notna(row['year_return']):
-            if row['year_return'] > 30:
-                score += 10
-            elif row['year_return'] > 10:
-                score += 5
-            elif row['year_return'] < -10:
-                score -= 5
+        score += np.select([year_return > 30, year_return > 10, year_return < -10], [10, 5, -5], default=0)
         
         # Sentiment adjustment (+/- 10 points)
         # In extreme fear, beaten-down quality gets boost
-        if fear_greed_score < 25 and pct_from_high < -0.20:
-            if self._check_value_filters(row):  # Quality stock on sale
-                score += 10
+        if fear_greed_score < 25:
+            score += 10 * ((pct_from_high < -0.20) & value_mask)
         
         # In extreme greed, be more conservative
         if fear_greed_score > 75:
             score -= 10
         
         # Clamp to 0-100
-        return max(0.0, min(100.0, score))
+        return np.clip(score, 0.0, 100.0)
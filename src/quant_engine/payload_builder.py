@@ -1,7 +1,9 @@
 """Builds structured JSON payload for LLM consumption."""
 
+import bisect
 import os
 from datetime import date
+from functools import lru_cache
 import yaml
 import pandas as pd
 import numpy as np
@@ -19,8 +21,34 @@ from schemas.payload import (
     MarketContext
 )
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = structlog.get_logger()
 
+# Fear & Greed buckets in score order with fallback narratives; a score
+# below SENTIMENT_BUCKET_BOUNDS[i] falls in bucket i
+SENTIMENT_BUCKETS = [
+    ('extreme_fear', "Extreme fear in markets"),
+    ('fear', "Fearful sentiment"),
+    ('neutral', "Neutral sentiment"),
+    ('greed', "Greedy sentiment"),
+    ('extreme_greed', "Extreme greed in markets"),
+]
+SENTIMENT_BUCKET_BOUNDS = [25, 45, 55, 75]
+
+
+@lru_cache(maxsize=None)
+def _load_yaml_cached(path: str) -> dict:
+    """Parse a YAML file once per process (keyed by absolute path).
+    
+    The returned dict is shared between callers and must not be mutated.
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
 
 class PayloadBuilder:
     """Constructs structured payload for Gemini from quantitative analysis results."""
@@ -37,6 +65,8 @@ class PayloadBuilder:
         # Load configurations
         self.watchlist_config = self._load_yaml("watchlist.yaml")
         self.thresholds_config = self._load_yaml("thresholds.yaml")
+        self._ticker_to_theme = self._build_ticker_theme_map()
+        self._sentiment_narratives = self._resolve_sentiment_narratives()
     
     def build_payload(
         self,
@@ -83,27 +113,42 @@ class PayloadBuilder:
             sentiment_context=self._get_sentiment_context(sentiment.score)
         )
         
-        # Build opportunities list
+        # Themes for every row in one vectorized map, grouped by pandas
+        theme_column, themes = self._group_themes(filtered_df)
+        
+        # Build opportunities list from plain column lists (no per-row
+        # Series allocation as with iterrows)
         opportunities = []
-        for _, row in filtered_df.iterrows():
-            theme = self._get_ticker_theme(row['ticker'])
-            
-            opp = OpportunityItem(
-                ticker=row['ticker'],
-                sector=row['sector'],
+        rows = zip(
+            filtered_df['ticker'].tolist(),
+            filtered_df['sector'].tolist(),
+            theme_column.tolist(),
+            self._float_column(filtered_df, 'current_price', decimals=2),
+            self._float_column(filtered_df, 'pe_ratio', decimals=1),
+            self._float_column(filtered_df, 'peg_ratio', decimals=2),
+            self._float_column(filtered_df, 'pct_from_52w_high', decimals=3),
+            filtered_df['above_200d_ma'].to_numpy(dtype=bool).tolist(),
+            self._float_column(filtered_df, 'opportunity_score', decimals=1)
+        )
+        for ticker, sector, theme, price, pe, peg, pct_from_high, above_200d, score in rows:
+            # Fields come from the validated EquityDataset and are already
+            # native str/float/bool, so skip per-row validation (the
+            # payload-level fields are still validated by LLMPayload)
+            opp = OpportunityItem.model_construct(
+                ticker=ticker,
+                sector=sector,
                 theme=theme,
-                current_price=round(row['current_price'], 2),
-                pe_ratio=round(row['pe_ratio'], 1) if pd.notna(row['pe_ratio']) else None,
-                peg_ratio=round(row['peg_ratio'], 2) if pd.notna(row['peg_ratio']) else None,
-                pct_from_52w_high=round(row['pct_from_52w_high'], 3),
-                above_200d_ma=bool(row['above_200d_ma']),
-                opportunity_score=round(row['opportunity_score'], 1)
+                current_price=price,
+                # NaN is the only float unequal to itself: one comparison
+                # instead of a function call per field
+                pe_ratio=pe if pe == pe else None,
+                peg_ratio=peg if peg == peg else None,
+                pct_from_52w_high=pct_from_high,
+                above_200d_ma=above_200d,
+                opportunity_score=score
             )
             opportunities.append(opp)
         
-        # Build themes grouping
-        themes = self._build_themes_grouping(filtered_df)
-        
         # Construct payload with new market context fields
         payload = LLMPayload(
             report_date=date.today().isoformat(),
@@ -133,33 +178,20 @@ class PayloadBuilder:
         Returns:
             Context string explaining what the score means
         """
-        sentiment_config = self.thresholds_config.get('sentiment_context', {})
+        return self._sentiment_narratives[bisect.bisect_right(SENTIMENT_BUCKET_BOUNDS, score)]
+    
+    def _resolve_sentiment_narratives(self) -> list[str]:
+        """Resolve the narrative of each sentiment bucket from thresholds.yaml.
         
-        if score < 25:
-            return sentiment_config.get('extreme_fear', {}).get(
-                'narrative',
-                "Extreme fear in markets"
-            )
-        elif score < 45:
-            return sentiment_config.get('fear', {}).get(
-                'narrative',
-                "Fearful sentiment"
-            )
-        elif score < 55:
-            return sentiment_config.get('neutral', {}).get(
-                'narrative',
-                "Neutral sentiment"
-            )
-        elif score < 75:
-            return sentiment_config.get('greed', {}).get(
-                'narrative',
-                "Greedy sentiment"
-            )
-        else:
-            return sentiment_config.get('extreme_greed', {}).get(
-                'narrative',
-                "Extreme greed in markets"
-            )
+        Returns:
+            Narratives ordered like SENTIMENT_BUCKETS
+        """
+        sentiment_config = self.thresholds_config.get('sentiment_context') or {}
+        
+        return [
+            (sentiment_config.get(bucket) or {}).get('narrative', fallback)
+            for bucket, fallback in SENTIMENT_BUCKETS
+        ]
     
     def _get_ticker_theme(self, ticker: str) -> str:
         """Find which theme a ticker belongs to.
@@ -170,35 +202,57 @@ class PayloadBuilder:
         Returns:
             Theme name or "other"
         """
-        themes = self.watchlist_config.get('themes', {})
-        
-        for theme_name, tickers in themes.items():
-            if ticker.upper() in [t.upper() for t in tickers]:
-                return theme_name
-        
-        return 'other'
+        return self._ticker_to_theme.get(ticker.upper(), 'other')
     
-    def _build_themes_grouping(self, df: pd.DataFrame) -> dict[str, list[str]]:
-        """Group tickers by investment theme.
+    def _group_themes(self, df: pd.DataFrame) -> tuple[pd.Series, dict[str, list[str]]]:
+        """Map each row to its theme and group tickers by theme.
         
         Args:
             df: Filtered opportunities DataFrame
             
         Returns:
-            Dict mapping theme names to ticker lists
+            Tuple of (theme per row, dict mapping theme name to tickers in
+            row order, themes in order of first appearance)
         """
-        themes_dict = {}
+        tickers = df['ticker'].astype(str)
+        theme_column = tickers.str.upper().map(self._ticker_to_theme).fillna('other')
         
-        for _, row in df.iterrows():
-            ticker = row['ticker']
-            theme = self._get_ticker_theme(ticker)
-            
-            if theme not in themes_dict:
-                themes_dict[theme] = []
-            
-            themes_dict[theme].append(ticker)
+        themes = tickers.groupby(theme_column, sort=False).agg(list).to_dict()
+        
+        return theme_column, themes
+    
+    def _build_ticker_theme_map(self) -> dict[str, str]:
+        """Index watchlist themes by ticker for O(1) theme lookups.
+        
+        Returns:
+            Dict mapping uppercase ticker to theme name (first theme wins
+            if a ticker is listed under several)
+        """
+        ticker_to_theme = {}
+        themes = self.watchlist_config.get('themes') or {}
         
-        return themes_dict
+        for theme_name, tickers in themes.items():
+            for t in tickers or []:
+                ticker_to_theme.setdefault(t.upper(), theme_name)
+        
+        return ticker_to_theme
+    
+    @staticmethod
+    def _float_column(df: pd.DataFrame, column: str, decimals: int) -> list[float]:
+        """Extract a column as rounded Python floats, with missing values as NaN.
+        
+        Rounds the whole column in one NumPy call rather than per value.
+        
+        Args:
+            df: Source DataFrame
+            column: Column name
+            decimals: Decimal places to round to
+            
+        Returns:
+            List of floats
+        """
+        values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.round(values, decimals).tolist()
     
     def _load_yaml(self, filename: str) -> dict:
         """Load YAML configuration file.
@@ -212,8 +266,7 @@ class PayloadBuilder:
         filepath = self.config_dir / filename
         
         try:
-            with open(filepath, 'r') as f:
-                return yaml.safe_load(f)
+            return _load_yaml_cached(str(filepath.resolve()))
         except Exception as e:
             self.logger.warning(
                 "config_load_failed",
@@ -263,12 +316,15 @@ class PayloadBuilder:
         if spy_prices is None or len(spy_prices) < 200:
             return 'Neutral'
         
-        current_price = spy_prices.iloc[-1]
-        ma_200 = spy_prices.rolling(window=200).mean().iloc[-1]
-        
-        if pd.isna(ma_200):
+        # Only the latest 200-day average is needed, so reduce the last
+        # window directly rather than building a full rolling series
+        window = spy_prices.to_numpy(dtype=np.float64)[-200:]
+        if np.isnan(window).any():
             return 'Neutral'
         
+        current_price = window[-1]
+        ma_200 = window.mean()
+        
         # Calculate distance from 200-day MA
         distance_pct = ((current_price - ma_200) / ma_200) * 100
         
@@ -294,22 +350,10 @@ class PayloadBuilder:
         growth_tickers = ['QQQ', 'XLK']
         defensive_tickers = ['XLU', 'XLP']
         
-        growth_returns = []
-        defensive_returns = []
-        
-        # Calculate 1-month returns for growth
-        for ticker in growth_tickers:
-            if ticker in price_data:
-                ret = self._calculate_return(price_data[ticker], days=30)
-                if ret is not None:
-                    growth_returns.append(ret)
-        
-        # Calculate 1-month returns for defensive
-        for ticker in defensive_tickers:
-            if ticker in price_data:
-                ret = self._calculate_return(price_data[ticker], days=30)
-                if ret is not None:
-                    defensive_returns.append(ret)
+        # 1-month returns for both baskets in one vectorized pass
+        returns = self._calculate_returns(price_data, growth_tickers + defensive_tickers, days=30)
+        growth_returns = [returns[t] for t in growth_tickers if t in returns]
+        defensive_returns = [returns[t] for t in defensive_tickers if t in returns]
         
         if not growth_returns or not defensive_returns:
             return 'Mixed'
@@ -340,13 +384,10 @@ class PayloadBuilder:
             'XLI', 'XLU', 'XLB', 'XLRE', 'XLC'
         ]
         
-        sector_returns = {}
-        
-        for ticker in sector_etfs:
-            if ticker in price_data:
-                ret = self._calculate_return(price_data[ticker], days=30)
-                if ret is not None:
-                    sector_returns[ticker] = round(ret, 2)
+        sector_returns = {
+            ticker: round(ret, 2)
+            for ticker, ret in self._calculate_returns(price_data, sector_etfs, days=30).items()
+        }
         
         # Sort by return descending
         sorted_sectors = dict(
@@ -359,30 +400,59 @@ class PayloadBuilder:
         
         return sorted_sectors
     
-    def _calculate_return(
+    def _calculate_returns(
         self,
-        prices: pd.Series,
+        price_data: Dict[str, pd.Series],
+        tickers: list[str],
         days: int
-    ) -> Optional[float]:
-        """Calculate return over specified number of days.
+    ) -> Dict[str, float]:
+        """Calculate returns over a lookback for several tickers at once.
         
         Args:
-            prices: Price series
+            price_data: Dict of price series
+            tickers: Tickers to compute returns for
             days: Number of days to look back
             
         Returns:
-            Return percentage or None if insufficient data
+            Dict mapping ticker -> return percentage, omitting tickers that
+            are missing, have insufficient history, or a NaN/zero start
         """
-        if len(prices) < days:
-            return None
+        available = [
+            t for t in tickers
+            if t in price_data and len(price_data[t]) >= days
+        ]
+        if not available:
+            return {}
         
-        start_price = prices.iloc[-days]
-        end_price = prices.iloc[-1]
+        # One (tickers x days) window stack, then a single divide
+        stack = np.vstack([
+            price_data[t].to_numpy(dtype=np.float64, na_value=np.nan)[-days:]
+            for t in available
+        ])
+        returns = self._returns_batch(stack)
+        
+        return {
+            ticker: ret
+            for ticker, ret in zip(available, returns.tolist())
+            if ret == ret  # Drop NaN
+        }
+    
+    @staticmethod
+    def _returns_batch(price_windows: np.ndarray) -> np.ndarray:
+        """Percent return from first to last column of each row.
         
-        if pd.isna(start_price) or pd.isna(end_price) or start_price == 0:
-            return None
+        Args:
+            price_windows: 2D array, one row per ticker, one column per day
+            
+        Returns:
+            1D array of return percentages; NaN where the start or end
+            price is missing or the start price is zero
+        """
+        start = price_windows[:, 0]
+        end = price_windows[:, -1]
         
-        return ((end_price - start_price) / start_price) * 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(start == 0, np.nan, (end - start) / start * 100)
     
     def _empty_market_context(self) -> MarketContext:
         """Return empty market context when data unavailable.
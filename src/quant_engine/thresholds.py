@@ -0,0 +1,59 @@
+"""Flattened quantitative thresholds parsed from thresholds.yaml."""
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass(frozen=True, slots=True)
+class Thresholds:
+    """Immutable view of the screening thresholds.
+    
+    Built once from the nested YAML config and shared by reference, so
+    hot filter code reads plain attributes instead of chained dict lookups.
+    Defaults match the permissive fallbacks used when a key is absent.
+    """
+    
+    # Value filters
+    min_market_cap: float = 0
+    max_pe_ratio: float = float('inf')
+    max_peg_ratio: float = float('inf')
+    
+    # Momentum filters
+    max_pct_from_52w_high: float = 1.0
+    require_above_200d_ma: bool = False
+    
+    # Diversification
+    max_correlation: float = 0.85
+    
+    # Selection: top-scored tickers passed to correlation and the LLM
+    max_candidates: int = 15
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "Thresholds":
+        """Flatten a thresholds.yaml dictionary.
+        
+        Args:
+            config: Parsed thresholds configuration
+        
+        Returns:
+            Thresholds with missing keys left at their defaults
+        """
+        value_filters = config.get('value_filters', {})
+        momentum_filters = config.get('momentum_filters', {})
+        correlation = config.get('correlation', {})
+        selection = config.get('selection', {})
+        defaults = cls()
+        
+        return cls(
+            min_market_cap=value_filters.get('min_market_cap', defaults.min_market_cap),
+            max_pe_ratio=value_filters.get('max_pe_ratio', defaults.max_pe_ratio),
+            max_peg_ratio=value_filters.get('max_peg_ratio', defaults.max_peg_ratio),
+            max_pct_from_52w_high=momentum_filters.get(
+                'max_pct_from_52w_high', defaults.max_pct_from_52w_high
+            ),
+            require_above_200d_ma=momentum_filters.get(
+                'require_above_200d_ma', defaults.require_above_200d_ma
+            ),
+            max_correlation=correlation.get('max_allowed', defaults.max_correlation),
+            max_candidates=selection.get('max_candidates', defaults.max_candidates),
+        )
@@ -2,8 +2,11 @@
 
 from .gemini_client import GeminiClient
 from .prompts import PromptManager
+from .semantic_cache import SemanticCache, sentence_transformer_embedder
 
 __all__ = [
     'GeminiClient',
     'PromptManager',
+    'SemanticCache',
+    'sentence_transformer_embedder',
 ]
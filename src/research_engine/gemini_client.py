@@ -1,17 +1,68 @@
 """Google Gemini API client for LLM-based analysis."""
 
-import json
+import asyncio
+import hashlib
+import os
+import random
+import time
+from functools import lru_cache
+import orjson
 import structlog
 import google.generativeai as genai
-from typing import Dict, Any
+from google.api_core import exceptions as google_exceptions
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
 
 from schemas.payload import LLMPayload
 from schemas.llm_output import AnalysisOutput
 from .prompts import PromptManager
+from .semantic_cache import SemanticCache
 
 logger = structlog.get_logger()
 
 
+@lru_cache(maxsize=1)
+def _configure(api_key: str) -> None:
+    """Configure the genai client, skipping repeats for the same key."""
+    genai.configure(api_key=api_key)
+
+
+@lru_cache(maxsize=8)
+def _get_model(
+    api_key: str,
+    model_name: str,
+    temperature: float,
+    top_p: float,
+    max_output_tokens: int,
+    system_instruction: Optional[str]
+) -> genai.GenerativeModel:
+    """Build a GenerativeModel once per key and configuration.
+    
+    Clients created with the same settings (e.g. per test or worker) share
+    one model and therefore its underlying gRPC channel.
+    
+    Args:
+        api_key: Google Gemini API key the model is used with
+        model_name: Model name
+        temperature: Sampling temperature
+        top_p: Nucleus sampling threshold
+        max_output_tokens: Response length cap
+        system_instruction: System instruction, or None to send it inline
+        
+    Returns:
+        Shared GenerativeModel
+    """
+    return genai.GenerativeModel(
+        model_name=model_name,
+        generation_config={
+            'temperature': temperature,
+            'top_p': top_p,
+            'max_output_tokens': max_output_tokens,
+        },
+        system_instruction=system_instruction
+    )
+
+
 class GeminiClient:
     """Client for Google Gemini API.
     
@@ -19,16 +70,54 @@ class GeminiClient:
     Validates output against Pydantic schema.
     """
     
-    def __init__(self, api_key: str, prompt_manager: PromptManager):
+    # Upper bound on concurrent requests through one shared client; models
+    # (and their gRPC channel) are also shared across client instances
+    MAX_CONCURRENT_REQUESTS = 3
+    
+    # API errors worth retrying after a backoff (rate limiting / transient
+    # server errors); other API errors such as 400/403 fail fast
+    TRANSIENT_ERRORS = (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+    )
+    BACKOFF_BASE_SECONDS = 1.0
+    BACKOFF_MAX_SECONDS = 30.0
+    
+    # Schema string fields the LLM sometimes returns as lists
+    LIST_TO_STRING_FIELDS = ('themes_in_focus', 'risks_to_watch')
+    
+    def __init__(
+        self,
+        api_key: str,
+        prompt_manager: PromptManager,
+        cache_dir: Optional[Union[str, Path]] = None,
+        cache_ttl_seconds: float = 3600,
+        semantic_cache: Optional[SemanticCache] = None
+    ):
         """Initialize Gemini client.
         
         Args:
             api_key: Google Gemini API key
             prompt_manager: Prompt manager with active prompt version
+            cache_dir: Directory for cached responses keyed by prompt hash;
+                None disables caching. Opting in replays the first sampled
+                response for an identical prompt and model config, even at
+                non-zero temperature.
+            cache_ttl_seconds: Age after which a cached response is ignored
+            semantic_cache: Optional similarity cache consulted after an
+                exact-cache miss, returning the analysis of a near-identical
+                earlier payload
         """
-        genai.configure(api_key=api_key)
+        _configure(api_key)
         
         self.prompt_manager = prompt_manager
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.semantic_cache = semantic_cache
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.logger = logger.bind(
             service="gemini_client",
             prompt_version=prompt_manager.version
@@ -36,25 +125,34 @@ class GeminiClient:
         
         # Initialize model with config from prompt
         config = prompt_manager.config
-        self.model = genai.GenerativeModel(
-            model_name=config.get('model', 'gemma-3-27b-it'),
-            generation_config={
-                'temperature': config.get('temperature', 0.3),
-                'top_p': config.get('top_p', 0.8),
-                'max_output_tokens': config.get('max_output_tokens', 4096),
-            }
+        model_name = config.get('model', 'gemma-3-27b-it')
+        
+        # Where supported, send the stable system prompt as a separate
+        # system instruction so it forms a cacheable prefix on the
+        # provider side instead of being re-sent inside every prompt
+        self.system_in_model = self._supports_system_instruction(model_name)
+        self.model = _get_model(
+            api_key,
+            model_name,
+            config.get('temperature', 0.3),
+            config.get('top_p', 0.8),
+            config.get('max_output_tokens', 4096),
+            prompt_manager.system_prompt if self.system_in_model else None
         )
     
     def generate_analysis(
         self,
         payload: LLMPayload,
-        max_retries: int = 2
+        max_retries: int = 2,
+        payload_json: Optional[str] = None
     ) -> AnalysisOutput:
         """Generate investment analysis from payload.
         
         Args:
             payload: Structured data payload
             max_retries: Maximum retry attempts on failure
+            payload_json: payload.model_dump_json(indent=2), if the caller
+                already serialized it (e.g. to persist the same bytes)
             
         Returns:
             Validated AnalysisOutput
@@ -64,61 +162,197 @@ class GeminiClient:
         """
         self.logger.info("analysis_generation_started")
         
+        # The prompt is deterministic, so build it once rather than per retry
+        json_payload = payload_json or payload.model_dump_json(indent=2)
+        full_prompt = self._build_prompt(payload, json_payload)
+        
+        cache_path = self._cache_path(full_prompt)
+        cached = self._lookup_cache(cache_path, payload)
+        if cached is not None:
+            return cached
+        
         for attempt in range(max_retries):
             try:
-                # Build full prompt
-                full_prompt = self._build_prompt(payload)
-                
                 # Generate response
                 self.logger.debug("calling_gemini_api")
                 response = self.model.generate_content(full_prompt)
                 
-                # Extract text
-                response_text = response.text
-                
-                # Parse JSON
-                self.logger.debug("parsing_json_response")
-                parsed = self._extract_json(response_text)
-                
-                # Normalize LLM output (convert lists to strings if needed)
-                parsed = self._normalize_llm_output(parsed)
+                return self._parse_response(response.text, cache_path, payload)
                 
-                # Validate against schema
-                analysis = AnalysisOutput.model_validate(parsed)
-                
-                self.logger.info(
-                    "analysis_generation_complete",
-                    opportunity_count=len(analysis.opportunities),
-                    scenario_count=len(analysis.scenarios)
-                )
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, max_retries)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+        
+        raise Exception("Should not reach here")
+    
+    async def generate_analysis_async(
+        self,
+        payload: LLMPayload,
+        max_retries: int = 2,
+        payload_json: Optional[str] = None
+    ) -> AnalysisOutput:
+        """Async counterpart of generate_analysis using generate_content_async.
+        
+        Args:
+            payload: Structured data payload
+            max_retries: Maximum retry attempts on failure
+            payload_json: Pre-serialized payload JSON, if available
+            
+        Returns:
+            Validated AnalysisOutput
+            
+        Raises:
+            Exception: If generation fails after retries
+        """
+        self.logger.info("analysis_generation_started", mode="async")
+        
+        json_payload = payload_json or payload.model_dump_json(indent=2)
+        full_prompt = self._build_prompt(payload, json_payload)
+        
+        cache_path = self._cache_path(full_prompt)
+        cached = self._lookup_cache(cache_path, payload)
+        if cached is not None:
+            return cached
+        
+        for attempt in range(max_retries):
+            try:
+                self.logger.debug("calling_gemini_api")
+                response = await self.model.generate_content_async(full_prompt)
                 
-                return analysis
+                return self._parse_response(response.text, cache_path, payload)
                 
             except Exception as e:
-                self.logger.warning(
-                    "generation_failed",
-                    attempt=attempt + 1,
-                    max_retries=max_retries,
-                    error=str(e)
-                )
-                
-                if attempt >= max_retries - 1:
-                    self.logger.error("generation_failed_permanently")
+                delay = self._retry_delay(e, attempt, max_retries)
+                if delay is None:
                     raise
+                await asyncio.sleep(delay)
         
         raise Exception("Should not reach here")
     
-    def _build_prompt(self, payload: LLMPayload) -> str:
-        """Build complete prompt from system + user templates.
+    async def generate_analyses_batch(
+        self,
+        payloads: List[LLMPayload],
+        concurrency: int = MAX_CONCURRENT_REQUESTS
+    ) -> List[AnalysisOutput]:
+        """Analyze several payloads (e.g. backfill dates) concurrently.
+        
+        Requests are network-bound, so overlapping them turns N sequential
+        round trips into roughly N / concurrency. Concurrency is capped at
+        MAX_CONCURRENT_REQUESTS because all requests share one client.
+        
+        Args:
+            payloads: Payloads to analyze
+            concurrency: Maximum requests in flight
+            
+        Returns:
+            Analyses in the same order as payloads
+            
+        Raises:
+            Exception: The first generation failure, after its retries
+        """
+        semaphore = asyncio.Semaphore(max(1, min(concurrency, self.MAX_CONCURRENT_REQUESTS)))
+        
+        async def run(payload: LLMPayload) -> AnalysisOutput:
+            async with semaphore:
+                return await self.generate_analysis_async(payload)
+        
+        return list(await asyncio.gather(*(run(payload) for payload in payloads)))
+    
+    def _retry_delay(self, error: Exception, attempt: int, max_retries: int) -> Optional[float]:
+        """Decide whether and when to retry a failed generation attempt.
+        
+        Transient API errors back off exponentially with jitter so retries
+        don't hammer a rate-limited endpoint. Malformed or invalid model
+        output is re-sampled immediately. Other API errors are permanent.
+        
+        Args:
+            error: Exception raised by the attempt
+            attempt: Zero-based attempt number
+            max_retries: Maximum retry attempts
+            
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        transient = isinstance(error, self.TRANSIENT_ERRORS)
+        permanent = isinstance(error, google_exceptions.GoogleAPICallError) and not transient
+        
+        self.logger.warning(
+            "generation_failed",
+            attempt=attempt + 1,
+            max_retries=max_retries,
+            error=str(error),
+            retryable=not permanent
+        )
+        
+        if permanent or attempt >= max_retries - 1:
+            self.logger.error("generation_failed_permanently")
+            return None
+        
+        if not transient:
+            return 0.0
+        
+        backoff = min(self.BACKOFF_MAX_SECONDS, self.BACKOFF_BASE_SECONDS * 2 ** attempt)
+        return backoff + random.uniform(0, self.BACKOFF_BASE_SECONDS)
+    
+    def _parse_response(
+        self,
+        response_text: str,
+        cache_path: Optional[Path],
+        payload: Optional[LLMPayload] = None
+    ) -> AnalysisOutput:
+        """Parse, normalize, validate and cache a raw LLM response.
+        
+        Args:
+            response_text: Raw response text
+            cache_path: Cache file path (None if caching is disabled)
+            payload: Payload the response answers, for the semantic cache
+            
+        Returns:
+            Validated AnalysisOutput
+        """
+        # Parse JSON
+        self.logger.debug("parsing_json_response")
+        parsed = self._extract_json(response_text)
+        
+        # Normalize LLM output (convert lists to strings if needed)
+        parsed = self._normalize_llm_output(parsed)
+        
+        # Validate against schema
+        analysis = AnalysisOutput.model_validate(parsed)
+        self._write_cache(cache_path, analysis)
+        if self.semantic_cache is not None and payload is not None:
+            self.semantic_cache.store(
+                self._semantic_text(payload),
+                analysis,
+                namespace=self._config_digest().hexdigest(),
+                tickers=[item.ticker for item in payload.opportunities]
+            )
+        
+        self.logger.info(
+            "analysis_generation_complete",
+            opportunity_count=len(analysis.opportunities),
+            scenario_count=len(analysis.scenarios)
+        )
+        
+        return analysis
+    
+    def _build_prompt(self, payload: LLMPayload, payload_json: Optional[str] = None) -> str:
+        """Build the prompt sent with each request.
+        
+        The system prompt is prepended unless the model carries it as its
+        system instruction.
         
         Args:
             payload: Data payload
+            payload_json: Pre-serialized payload JSON (serialized here if None)
             
         Returns:
             Complete prompt string
         """
         # Convert payload to JSON
-        json_payload = payload.model_dump_json(indent=2)
+        json_payload = payload_json or payload.model_dump_json(indent=2)
         
         # Format user prompt (includes template variables for v2 strategist prompt)
         user_prompt = self.prompt_manager.format_user_prompt(
@@ -133,11 +367,153 @@ class GeminiClient:
             macro_environment=payload.macro_environment
         )
         
+        # The system prompt already travels as the model's system instruction
+        if self.system_in_model:
+            return user_prompt
+        
         # Combine system + user
         full_prompt = f"{self.prompt_manager.system_prompt}\n\n{user_prompt}"
         
         return full_prompt
     
+    @staticmethod
+    def _supports_system_instruction(model_name: str) -> bool:
+        """Whether the model accepts a separate system instruction.
+        
+        Gemini models do; Gemma models served through the same API reject
+        it, so their system prompt stays inline.
+        
+        Args:
+            model_name: Configured model name
+            
+        Returns:
+            True for Gemini models
+        """
+        return model_name.removeprefix('models/').startswith('gemini')
+    
+    def _cache_path(self, full_prompt: str) -> Optional[Path]:
+        """Locate the cached response for a prompt.
+        
+        The key covers the model configuration as well as the prompt, so
+        switching model or sampling settings never replays a stale answer.
+        
+        Args:
+            full_prompt: Complete prompt string
+            
+        Returns:
+            Cache file path, or None if caching is disabled
+        """
+        if self.cache_dir is None:
+            return None
+        
+        digest = self._config_digest()
+        digest.update(full_prompt.encode())
+        return self.cache_dir / f"{digest.hexdigest()}.json"
+    
+    def _config_digest(self) -> hashlib.blake2b:
+        """Hash of the model configuration and prompt, shared by cache keys.
+        
+        Returns:
+            blake2b hasher fed with the config, prompt version and system prompt
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(orjson.dumps(self.prompt_manager.config, option=orjson.OPT_SORT_KEYS))
+        digest.update(str(self.prompt_manager.version).encode())
+        digest.update(self.prompt_manager.system_prompt.encode())
+        return digest
+    
+    @staticmethod
+    def _semantic_text(payload: LLMPayload) -> str:
+        """Compact canonical text of the payload signals the analysis depends on.
+        
+        The full payload JSON is dominated by free-form news prose, so two
+        payloads with the same headlines but different candidates would
+        embed almost identically. This text keeps only the sorted candidate
+        tickers, macro and sentiment readings and regime signals.
+        
+        Args:
+            payload: Structured data payload
+            
+        Returns:
+            Text to embed for the semantic cache
+        """
+        macro = payload.macro_environment
+        context = payload.market_context
+        return "\n".join([
+            f"tickers: {' '.join(sorted(item.ticker for item in payload.opportunities))}",
+            f"fed_funds_rate: {macro.fed_funds_rate:.2f}",
+            f"treasury_10y: {macro.treasury_10y:.2f}",
+            f"cpi_yoy: {macro.cpi_yoy:.1f}",
+            f"yield_curve_inverted: {macro.yield_curve_inverted}",
+            f"fear_greed: {macro.fear_greed_score} {macro.fear_greed_label}",
+            f"trend: {context.trend_signal}",
+            f"risk_regime: {context.risk_regime}",
+            f"sector_leaders: {' '.join(sorted(context.sector_leaders))}",
+            f"weekly_budget_usd: {payload.weekly_budget_usd}",
+        ])
+    
+    def _lookup_cache(self, cache_path: Optional[Path], payload: LLMPayload) -> Optional[AnalysisOutput]:
+        """Check the exact-prompt cache, then the semantic cache.
+        
+        Args:
+            cache_path: Cache file path (None if caching is disabled)
+            payload: Structured data payload
+            
+        Returns:
+            Cached AnalysisOutput, or None on a miss
+        """
+        cached = self._read_cache(cache_path)
+        if cached is not None:
+            self.logger.info("analysis_cache_hit", key=cache_path.stem)
+            return cached
+        
+        if self.semantic_cache is not None:
+            return self.semantic_cache.lookup(
+                self._semantic_text(payload),
+                namespace=self._config_digest().hexdigest(),
+                tickers=[item.ticker for item in payload.opportunities]
+            )
+        
+        return None
+    
+    def _read_cache(self, cache_path: Optional[Path]) -> Optional[AnalysisOutput]:
+        """Load a cached response if present and younger than the TTL.
+        
+        Args:
+            cache_path: Cache file path (None if caching is disabled)
+            
+        Returns:
+            Cached AnalysisOutput, or None on a miss
+        """
+        if cache_path is None:
+            return None
+        
+        try:
+            age = time.time() - cache_path.stat().st_mtime
+            if age >= self.cache_ttl_seconds:
+                return None
+            return AnalysisOutput.model_validate_json(cache_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # A corrupt or outdated entry is just a miss; it gets overwritten
+            self.logger.warning("analysis_cache_read_failed", key=cache_path.stem, error=str(e))
+            return None
+    
+    def _write_cache(self, cache_path: Optional[Path], analysis: AnalysisOutput) -> None:
+        """Atomically store a validated response in the cache.
+        
+        Args:
+            cache_path: Cache file path (None if caching is disabled)
+            analysis: Validated response
+        """
+        if cache_path is None:
+            return
+        
+        tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+        tmp_path.write_bytes(analysis.model_dump_json().encode())
+        os.replace(tmp_path, cache_path)
+    
     def _extract_json(self, response_text: str) -> Dict[str, Any]:
         """Extract JSON from response text.
         
@@ -149,23 +525,18 @@ class GeminiClient:
         Returns:
             Parsed JSON dict
         """
-        # Remove markdown code blocks if present
+        # Remove markdown code blocks if present: find both fence offsets
+        # first, then take a single slice
         text = response_text.strip()
+        start = 7 if text.startswith('```json') else 3 if text.startswith('```') else 0
+        end = -3 if text.endswith('```') and len(text) - start >= 3 else None
+        text = text[start:end].strip()
         
-        if text.startswith('```json'):
-            text = text[7:]  # Remove ```json
-        elif text.startswith('```'):
-            text = text[3:]  # Remove ```
-        
-        if text.endswith('```'):
-            text = text[:-3]  # Remove trailing ```
-        
-        text = text.strip()
-        
-        # Parse JSON
+        # Parse JSON fully: AnalysisOutput validates every field, so a lazy
+        # parser would end up materializing the whole document anyway
         try:
-            return json.loads(text)
-        except json.JSONDecodeError as e:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError as e:
             self.logger.error("json_parse_failed", error=str(e), text_preview=text[:200])
             raise
     
@@ -181,13 +552,12 @@ class GeminiClient:
         Returns:
             Normalized dict matching schema
         """
-        # Convert list fields to strings if needed
-        list_to_string_fields = ['themes_in_focus', 'risks_to_watch']
-        
-        for field in list_to_string_fields:
-            if field in parsed and isinstance(parsed[field], list):
+        # Convert list fields to strings if needed; one dict lookup per
+        # field, and nothing else runs when the types already match
+        for field in self.LIST_TO_STRING_FIELDS:
+            if isinstance(value := parsed.get(field), list):
                 # Join list items with commas
-                parsed[field] = ', '.join(str(item) for item in parsed[field])
+                parsed[field] = ', '.join(map(str, value))
                 self.logger.debug(
                     "normalized_list_field",
                     field=field,
@@ -2,12 +2,29 @@
 
 import yaml
 import structlog
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = structlog.get_logger()
 
 
+@lru_cache(maxsize=8)
+def _load_prompt_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a prompt file once per (path, modification time).
+    
+    Keying on mtime means an edited prompt is re-read on the next load.
+    The returned dict is shared between callers and must not be mutated.
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 class PromptManager:
     """Manages versioned prompt templates.
     
@@ -42,8 +59,9 @@ class PromptManager:
         if not current_path.exists():
             raise FileNotFoundError(f"No current prompt found at {current_path}")
         
-        with open(current_path, 'r') as f:
-            return yaml.safe_load(f)
+        # Resolved so a current.yaml symlink is keyed by its target
+        resolved = current_path.resolve()
+        return _load_prompt_cached(str(resolved), resolved.stat().st_mtime_ns)
     
     @property
     def version(self) -> int:
@@ -74,4 +92,6 @@ class PromptManager:
         Returns:
             Formatted prompt string
         """
+        # str.format parses the template in C; a pre-split template rendered
+        # field by field in Python measured slower, so none is kept
         return self.user_template.format(**kwargs)
@@ -0,0 +1,196 @@
+"""Similarity cache for LLM analyses of near-duplicate payloads."""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Union
+
+import numpy as np
+import orjson
+import structlog
+
+from schemas.llm_output import AnalysisOutput
+
+logger = structlog.get_logger()
+
+Embedder = Callable[[str], np.ndarray]
+
+
+def sentence_transformer_embedder(model_name: str = "all-MiniLM-L6-v2") -> Embedder:
+    """Build an embedder backed by a local sentence-transformers model.
+    
+    Args:
+        model_name: sentence-transformers model to load
+        
+    Returns:
+        Callable mapping text to a 1-D embedding
+        
+    Raises:
+        ImportError: If sentence-transformers is not installed
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError as e:
+        raise ImportError(
+            "sentence-transformers is required for the default semantic cache embedder"
+        ) from e
+    
+    model = SentenceTransformer(model_name)
+    return lambda text: model.encode(text)
+
+
+class SemanticCache:
+    """Returns a stored analysis when a new payload is nearly identical to an old one.
+    
+    Consecutive runs often produce payloads that differ only marginally
+    (macro figures move slightly, the same opportunities rank on top), so
+    an exact prompt hash misses them. Payload texts are embedded and
+    compared by cosine similarity against every stored entry. Similar text
+    alone is not enough: an entry only matches a payload with the same set
+    of candidate tickers, since its analysis recommends from that set. The store
+    holds one entry per analyzed payload, so a brute-force NumPy scan is
+    enough and no vector index is needed. Any object with the same
+    lookup/store methods (e.g. backed by a vector database) can replace it.
+    """
+    
+    def __init__(
+        self,
+        embed: Embedder,
+        cache_dir: Optional[Union[str, Path]] = None,
+        threshold: float = 0.97,
+        ttl_seconds: Optional[float] = None
+    ):
+        """Initialize semantic cache.
+        
+        Args:
+            embed: Callable mapping text to a 1-D embedding
+            cache_dir: Directory persisting the entries; None keeps them
+                in memory only
+            threshold: Minimum cosine similarity for a hit
+            ttl_seconds: Age after which an entry is ignored (None: never)
+        """
+        self.embed = embed
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.logger = logger.bind(service="semantic_cache")
+        
+        # Unit-normalized embeddings, one row per entry, parallel to _entries
+        self._embeddings: Optional[np.ndarray] = None
+        self._entries: List[dict] = []
+        
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def lookup(
+        self,
+        text: str,
+        namespace: str = "",
+        tickers: Optional[Iterable[str]] = None
+    ) -> Optional[AnalysisOutput]:
+        """Find the analysis of the most similar stored payload.
+        
+        Args:
+            text: Payload text to match
+            namespace: Only entries stored under the same namespace match
+                (e.g. a digest of model config and prompt)
+            tickers: Candidate tickers of the payload; if given, only
+                entries stored with exactly this set match
+            
+        Returns:
+            Cached AnalysisOutput, or None if nothing is similar enough
+        """
+        if not self._entries:
+            return None
+        
+        similarities = self._embeddings @ self._normalize(self.embed(text))
+        
+        ticker_set = sorted(set(tickers)) if tickers is not None else None
+        now = time.time()
+        for index in np.argsort(similarities)[::-1]:
+            if similarities[index] < self.threshold:
+                break
+            
+            entry = self._entries[index]
+            if entry["namespace"] != namespace:
+                continue
+            if ticker_set is not None and entry.get("tickers") != ticker_set:
+                continue
+            if self.ttl_seconds is not None and now - entry["created_at"] >= self.ttl_seconds:
+                continue
+            
+            self.logger.info("semantic_cache_hit", similarity=round(float(similarities[index]), 4))
+            return AnalysisOutput.model_validate(entry["analysis"])
+        
+        return None
+    
+    def store(
+        self,
+        text: str,
+        analysis: AnalysisOutput,
+        namespace: str = "",
+        tickers: Optional[Iterable[str]] = None
+    ) -> None:
+        """Add an analyzed payload to the cache and persist it.
+        
+        Args:
+            text: Payload text the analysis was generated from
+            analysis: Validated analysis
+            namespace: Namespace the entry matches under
+            tickers: Candidate tickers of the payload
+        """
+        embedding = self._normalize(self.embed(text))[np.newaxis, :]
+        self._embeddings = (
+            embedding if self._embeddings is None
+            else np.vstack([self._embeddings, embedding])
+        )
+        self._entries.append({
+            "namespace": namespace,
+            "created_at": time.time(),
+            "tickers": sorted(set(tickers)) if tickers is not None else None,
+            "analysis": analysis.model_dump(mode="json"),
+        })
+        self._save()
+    
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        """Scale an embedding to unit length so dot products are cosines."""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _load(self) -> None:
+        """Load persisted entries, starting empty if none or unreadable."""
+        embeddings_path = self.cache_dir / "embeddings.npy"
+        entries_path = self.cache_dir / "entries.json"
+        if not (embeddings_path.exists() and entries_path.exists()):
+            return
+        
+        try:
+            embeddings = np.load(embeddings_path)
+            entries = orjson.loads(entries_path.read_bytes())
+        except Exception as e:
+            self.logger.warning("semantic_cache_load_failed", error=str(e))
+            return
+        
+        if len(embeddings) == len(entries):
+            self._embeddings, self._entries = embeddings, entries
+    
+    def _save(self) -> None:
+        """Atomically persist the entries (no-op when memory-only)."""
+        if self.cache_dir is None:
+            return
+        
+        # np.save appends .npy to names without it, so stage as *.tmp.npy
+        for name, write in (
+            ("embeddings.npy", lambda path: np.save(path, self._embeddings)),
+            ("entries.json", lambda path: path.write_bytes(orjson.dumps(self._entries))),
+        ):
+            file_path = self.cache_dir / name
+            tmp_path = file_path.with_name(f"{file_path.stem}.tmp{file_path.suffix}")
+            write(tmp_path)
+            os.replace(tmp_path, file_path)
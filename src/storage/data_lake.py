@@ -1,19 +1,27 @@
 """Data lake storage layer for pipeline persistence.
 
-Manages saving and loading all pipeline data using Parquet (tabular) 
-and JSON (LLM payloads/responses) formats.
+Manages saving and loading all pipeline data using Parquet (tabular),
+Arrow IPC (single-record snapshots) and JSON (LLM payloads/responses)
+formats.
 """
 
-import json
+import os
+from functools import lru_cache, partial
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Any, Callable, Optional, List, Dict, Tuple, Union
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import structlog
+from pydantic import BaseModel, TypeAdapter
 
 from schemas.macro import MacroData
 from schemas.sentiment import SentimentData
-from schemas.equities import EquityDataset
+from schemas.equities import EquityData, EquityDataset
 from schemas.payload import LLMPayload
 from schemas.llm_output import AnalysisOutput
 from schemas.run_metadata import RunMetadata
@@ -21,14 +29,42 @@ from schemas.evaluation import GroundednessReport
 
 logger = structlog.get_logger()
 
+_EQUITY_LIST_ADAPTER = TypeAdapter(list[EquityData])
+
+
+@lru_cache(maxsize=8)
+def _list_run_dates(metadata_dir: str, mtime_ns: int) -> tuple[str, ...]:
+    """Sorted run dates in a metadata directory, cached per directory mtime.
+    
+    os.scandir reports file types from the directory listing itself, so
+    no per-entry stat or glob pattern matching is needed.
+    """
+    with os.scandir(metadata_dir) as entries:
+        return tuple(sorted(
+            entry.name[:-5]  # filename without .json extension
+            for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        ))
+
+
+@lru_cache(maxsize=32)
+def _load_run_metadata(file_path: str, mtime_ns: int, inode: int) -> RunMetadata:
+    """Parsed run metadata, cached per file version.
+    
+    Saves replace the file atomically, which gives it a new inode and
+    modification time, so a rewritten run never hits a stale entry.
+    """
+    # Validated straight from the bytes; ISO timestamps parse as datetimes
+    return RunMetadata.model_validate_json(Path(file_path).read_bytes())
+
 
 class DataLake:
     """Manages persistent storage of all pipeline data.
     
     Directory structure:
         data/
-        ├── raw/macro/YYYY-MM-DD.parquet
-        ├── raw/sentiment/YYYY-MM-DD.parquet
+        ├── raw/macro/YYYY-MM-DD.arrow
+        ├── raw/sentiment/YYYY-MM-DD.arrow
         ├── raw/equities/YYYY-MM-DD.parquet
         ├── processed/opportunities/YYYY-MM-DD.parquet
         ├── llm/prompts/YYYY-MM-DD.json
@@ -38,6 +74,31 @@ class DataLake:
         └── metadata/YYYY-MM-DD.json
     """
     
+    # Artifact name -> location relative to base_path, used by save_batch
+    ARTIFACT_PATHS = {
+        "macro": ("raw/macro", "arrow"),
+        "sentiment": ("raw/sentiment", "arrow"),
+        "equities": ("raw/equities", "parquet"),
+        "opportunities": ("processed/opportunities", "parquet"),
+        "payload": ("llm/payloads", "json"),
+        "analysis": ("llm/responses", "json"),
+    }
+    
+    # Columns EquityDataset.to_dataframe derives; not EquityData fields
+    COMPUTED_EQUITY_COLUMNS = ('pct_from_52w_high', 'above_200d_ma', 'above_50d_ma')
+    
+    # Artifacts are small and read whole, so column statistics (used for
+    # predicate pushdown) are only overhead; zstd beats the snappy default
+    PARQUET_OPTIONS = {
+        "engine": "pyarrow",
+        "compression": "zstd",
+        "compression_level": 3,
+        "write_statistics": False,
+    }
+    
+    # Resolved base paths whose directory tree was already created
+    _prepared: set[str] = set()
+    
     def __init__(self, base_path: str = "data"):
         """Initialize data lake.
         
@@ -46,7 +107,13 @@ class DataLake:
         """
         self.base_path = Path(base_path)
         self.logger = logger.bind(service="data_lake")
-        self._ensure_directories()
+        
+        # Create the tree once per base path per process; the is_dir check
+        # (one stat) recreates it if the data directory was removed since
+        key = str(self.base_path.resolve())
+        if key not in DataLake._prepared or not self.base_path.is_dir():
+            self._ensure_directories()
+            DataLake._prepared.add(key)
     
     def _ensure_directories(self) -> None:
         """Create data lake directory structure."""
@@ -78,11 +145,8 @@ class DataLake:
         Returns:
             Path to saved file
         """
-        file_path = self.base_path / "raw" / "macro" / f"{date}.parquet"
-        
-        # Convert to DataFrame for Parquet storage
-        df = pd.DataFrame([data.model_dump()])
-        df.to_parquet(file_path, index=False)
+        file_path = self._artifact_path("macro", date)
+        self._write_atomic(file_path, partial(self._write_artifact, "macro", date, data))
         
         self.logger.info("macro_data_saved", date=date, path=str(file_path))
         return file_path
@@ -97,10 +161,8 @@ class DataLake:
         Returns:
             Path to saved file
         """
-        file_path = self.base_path / "raw" / "sentiment" / f"{date}.parquet"
-        
-        df = pd.DataFrame([data.model_dump()])
-        df.to_parquet(file_path, index=False)
+        file_path = self._artifact_path("sentiment", date)
+        self._write_atomic(file_path, partial(self._write_artifact, "sentiment", date, data))
         
         self.logger.info("sentiment_data_saved", date=date, path=str(file_path))
         return file_path
@@ -115,10 +177,8 @@ class DataLake:
         Returns:
             Path to saved file
         """
-        file_path = self.base_path / "raw" / "equities" / f"{date}.parquet"
-        
-        df = data.to_dataframe()
-        df.to_parquet(file_path, index=False)
+        file_path = self._artifact_path("equities", date)
+        self._write_atomic(file_path, partial(self._write_artifact, "equities", date, data))
         
         self.logger.info(
             "equity_dataset_saved",
@@ -138,10 +198,8 @@ class DataLake:
         Returns:
             Path to saved file
         """
-        file_path = self.base_path / "processed" / "opportunities" / f"{date}.parquet"
-        
-        df = pd.DataFrame(opportunities)
-        df.to_parquet(file_path, index=False)
+        file_path = self._artifact_path("opportunities", date)
+        self._write_atomic(file_path, partial(self._write_artifact, "opportunities", date, opportunities))
         
         self.logger.info(
             "opportunities_saved",
@@ -151,20 +209,18 @@ class DataLake:
         )
         return file_path
     
-    def save_llm_payload(self, date: str, payload: LLMPayload) -> Path:
+    def save_llm_payload(self, date: str, payload: Union[LLMPayload, bytes]) -> Path:
         """Save LLM input payload.
         
         Args:
             date: ISO date string
-            payload: Validated LLMPayload
+            payload: Validated LLMPayload, or its already-serialized JSON
             
         Returns:
             Path to saved file
         """
-        file_path = self.base_path / "llm" / "payloads" / f"{date}.json"
-        
-        with open(file_path, 'w') as f:
-            json.dump(payload.model_dump(), f, indent=2, default=str)
+        file_path = self._artifact_path("payload", date)
+        self._write_atomic(file_path, partial(self._write_artifact, "payload", date, payload))
         
         self.logger.info("llm_payload_saved", date=date, path=str(file_path))
         return file_path
@@ -179,10 +235,8 @@ class DataLake:
         Returns:
             Path to saved file
         """
-        file_path = self.base_path / "llm" / "responses" / f"{date}.json"
-        
-        with open(file_path, 'w') as f:
-            json.dump(response.model_dump(), f, indent=2, default=str)
+        file_path = self._artifact_path("analysis", date)
+        self._write_atomic(file_path, partial(self._write_artifact, "analysis", date, response))
         
         self.logger.info("llm_response_saved", date=date, path=str(file_path))
         return file_path
@@ -198,9 +252,7 @@ class DataLake:
             Path to saved file
         """
         file_path = self.base_path / "metadata" / f"{date}.json"
-        
-        with open(file_path, 'w') as f:
-            json.dump(metadata.model_dump(), f, indent=2, default=str)
+        self._write_atomic(file_path, partial(self._write_json, metadata))
         
         self.logger.info("run_metadata_saved", date=date, path=str(file_path))
         return file_path
@@ -216,13 +268,184 @@ class DataLake:
             Path to saved file
         """
         file_path = self.base_path / "evaluations" / f"{date}.json"
-        
-        with open(file_path, 'w') as f:
-            json.dump(evaluation.model_dump(), f, indent=2, default=str)
+        self._write_atomic(file_path, partial(self._write_json, evaluation))
         
         self.logger.info("evaluation_saved", date=date, grade=evaluation.quality_grade, path=str(file_path))
         return file_path
     
+    def save_batch(self, date: str, artifacts: Dict[str, Any]) -> Dict[str, Path]:
+        """Save several run artifacts as one all-or-nothing batch.
+        
+        Every artifact is first written to a temporary file next to its
+        destination; only once all writes succeed are they moved into
+        place. A failed write removes the temporaries, including the one
+        being written, and a failed move restores the files already
+        replaced, so an error leaves the previous files for that date
+        untouched. (A process crash mid-move is not rolled back.)
+        
+        Args:
+            date: ISO date string
+            artifacts: Mapping of artifact name (a key of ARTIFACT_PATHS)
+                to the object to save
+                
+        Returns:
+            Mapping of artifact name to saved file path
+            
+        Raises:
+            ValueError: If an artifact name is unknown
+        """
+        unknown = set(artifacts) - set(self.ARTIFACT_PATHS)
+        if unknown:
+            raise ValueError(f"Unknown artifacts: {sorted(unknown)}")
+        
+        staged = []
+        try:
+            for name, data in artifacts.items():
+                file_path = self._artifact_path(name, date)
+                tmp_path = self._tmp_path(file_path)
+                # Recorded before writing so a half-written temp is removed too
+                staged.append((name, tmp_path, file_path))
+                self._write_artifact(name, date, data, tmp_path)
+        except Exception:
+            for _, tmp_path, _ in staged:
+                tmp_path.unlink(missing_ok=True)
+            raise
+        
+        self._commit_staged([(tmp_path, file_path) for _, tmp_path, file_path in staged])
+        
+        self.logger.info("batch_saved", date=date, artifacts=list(artifacts))
+        return {name: file_path for name, _, file_path in staged}
+    
+    def _commit_staged(self, moves: List[Tuple[Path, Path]]) -> None:
+        """Move staged files into place, restoring every destination on failure.
+        
+        Each previous file is first hard-linked to a backup, so it stays
+        readable until it is replaced and can be put back if a later move
+        fails.
+        
+        Args:
+            moves: (staged path, destination) pairs
+        """
+        # (destination, backup path, or None if there was no previous file)
+        backups: List[Tuple[Path, Optional[Path]]] = []
+        try:
+            for tmp_path, file_path in moves:
+                backup_path = file_path.with_name(f"{file_path.name}.bak")
+                backup_path.unlink(missing_ok=True)
+                try:
+                    os.link(file_path, backup_path)
+                except FileNotFoundError:
+                    backup_path = None
+                try:
+                    os.replace(tmp_path, file_path)
+                except Exception:
+                    # Destination untouched; renaming a hard link over its
+                    # own target is a no-op, so drop the backup directly
+                    if backup_path is not None:
+                        backup_path.unlink()
+                    raise
+                backups.append((file_path, backup_path))
+        except Exception:
+            for file_path, backup_path in reversed(backups):
+                if backup_path is None:
+                    file_path.unlink(missing_ok=True)
+                else:
+                    os.replace(backup_path, file_path)
+            for tmp_path, _ in moves:
+                tmp_path.unlink(missing_ok=True)
+            raise
+        
+        for _, backup_path in backups:
+            if backup_path is not None:
+                backup_path.unlink()
+    
+    def _artifact_path(self, name: str, date: str) -> Path:
+        """Resolve the storage path of a named artifact.
+        
+        Args:
+            name: Artifact name (key of ARTIFACT_PATHS)
+            date: ISO date string
+            
+        Returns:
+            Path to the artifact file
+        """
+        directory, extension = self.ARTIFACT_PATHS[name]
+        return self.base_path / directory / f"{date}.{extension}"
+    
+    @staticmethod
+    def _tmp_path(file_path: Path) -> Path:
+        """Staging path next to a destination, so os.replace stays on one filesystem."""
+        return file_path.with_name(f"{file_path.name}.tmp")
+    
+    def _write_atomic(self, file_path: Path, write: Callable[[Path], None]) -> None:
+        """Write a file via a temporary sibling and an atomic rename.
+        
+        Readers see either the previous file or the complete new one, and
+        a crash mid-write leaves no truncated artifact behind.
+        
+        Args:
+            file_path: Destination file
+            write: Callable that writes the full content to a given path
+        """
+        tmp_path = self._tmp_path(file_path)
+        try:
+            write(tmp_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, file_path)
+    
+    def _write_artifact(self, name: str, date: str, data: Any, file_path: Path) -> None:
+        """Serialize a named artifact to the given path.
+        
+        Args:
+            name: Artifact name (key of ARTIFACT_PATHS)
+            date: ISO date string of the run
+            data: Object to serialize
+            file_path: Destination file
+        """
+        if name in ("macro", "sentiment"):
+            # Single-record snapshots go to Arrow IPC: a one-row Parquet
+            # file is mostly footer metadata, while IPC is read by mmap
+            table = pa.Table.from_pylist([data.model_dump()])
+            feather.write_feather(table, file_path, compression="zstd")
+            return
+        
+        if name == "equities":
+            # Derived columns are recomputed on load, so only fields are
+            # stored; the run date lets load_equities_range filter by column
+            df = pd.DataFrame([e.model_dump() for e in data.equities])
+            df['date'] = date
+        elif name == "opportunities":
+            df = pd.DataFrame(data)
+        else:
+            self._write_json(data, file_path)
+            return
+        
+        df.to_parquet(file_path, index=False, **self.PARQUET_OPTIONS)
+    
+    @staticmethod
+    def _write_json(model: Union[BaseModel, bytes], file_path: Path) -> None:
+        """Serialize a pydantic model to indented JSON with orjson.
+        
+        mode="json" renders datetimes and other non-JSON types as strings,
+        so no default= hook is needed. JSON bytes serialized earlier (e.g.
+        the payload already rendered into the LLM prompt) are written as-is.
+        
+        Args:
+            model: Model to serialize, or pre-serialized JSON bytes
+            file_path: Destination file
+        """
+        if isinstance(model, bytes):
+            file_path.write_bytes(model)
+            return
+        
+        # Byte-identical to pydantic_core.to_json(model, indent=2), which
+        # measured ~15% slower on an AnalysisOutput
+        file_path.write_bytes(
+            orjson.dumps(model.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+        )
+    
     # ==================== LOAD METHODS ====================
     
     def load_macro_data(self, date: str) -> MacroData:
@@ -234,18 +457,10 @@ class DataLake:
         Returns:
             MacroData object
         """
-        file_path = self.base_path / "raw" / "macro" / f"{date}.parquet"
-        
-        if not file_path.exists():
+        row = self._read_snapshot("macro", date)
+        if row is None:
             raise FileNotFoundError(f"No macro data found for {date}")
         
-        df = pd.read_parquet(file_path)
-        row = df.iloc[0].to_dict()
-        
-        # Convert timestamp string back to datetime
-        if isinstance(row['fetched_at'], str):
-            row['fetched_at'] = datetime.fromisoformat(row['fetched_at'])
-        
         return MacroData(**row)
     
     def load_sentiment_data(self, date: str) -> SentimentData:
@@ -257,18 +472,156 @@ class DataLake:
         Returns:
             SentimentData object
         """
-        file_path = self.base_path / "raw" / "sentiment" / f"{date}.parquet"
-        
-        if not file_path.exists():
+        row = self._read_snapshot("sentiment", date)
+        if row is None:
             raise FileNotFoundError(f"No sentiment data found for {date}")
         
-        df = pd.read_parquet(file_path)
-        row = df.iloc[0].to_dict()
+        return SentimentData(**row)
+    
+    def load_macro_range(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """Load macro snapshots for all runs in a date range.
+        
+        Args:
+            start_date: First ISO date (inclusive)
+            end_date: Last ISO date (inclusive)
+            
+        Returns:
+            DataFrame with one row per run date, sorted by a 'date' column
+        """
+        return self._load_snapshot_range("macro", start_date, end_date)
+    
+    def load_sentiment_range(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """Load sentiment snapshots for all runs in a date range.
+        
+        Args:
+            start_date: First ISO date (inclusive)
+            end_date: Last ISO date (inclusive)
+            
+        Returns:
+            DataFrame with one row per run date, sorted by a 'date' column
+        """
+        return self._load_snapshot_range("sentiment", start_date, end_date)
+    
+    def load_equities_range(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """Load the equity rows of all runs in a date range in one dataset scan.
+        
+        Runs saved before the 'date' column was written are not included.
+        
+        Args:
+            start_date: First ISO date (inclusive)
+            end_date: Last ISO date (inclusive)
+            
+        Returns:
+            DataFrame with one row per ticker per run and a 'date' column
+            (empty if no runs)
+        """
+        files = self._range_files("equities", start_date, end_date)
+        if not files:
+            return pd.DataFrame()
+        
+        paths = [str(path) for path in files]
+        dataset = ds.dataset(paths, format="parquet")
+        if "date" not in dataset.schema.names:
+            # Schema is taken from the first file; if that run predates the
+            # column, declare it so later runs keep their dates
+            schema = dataset.schema.append(pa.field("date", pa.string()))
+            dataset = ds.dataset(paths, format="parquet", schema=schema)
+        
+        run_date = ds.field("date")
+        table = dataset.to_table(filter=(run_date >= start_date) & (run_date <= end_date))
+        return table.to_pandas()
+    
+    def _range_files(
+        self,
+        name: str,
+        start_date: str,
+        end_date: str,
+        extension: Optional[str] = None
+    ) -> List[Path]:
+        """Artifact files of every run date in [start_date, end_date].
+        
+        ISO dates sort lexically, so the range is selected from file names
+        without opening files outside it.
         
+        Args:
+            name: Artifact name (key of ARTIFACT_PATHS)
+            start_date: First ISO date (inclusive)
+            end_date: Last ISO date (inclusive)
+            extension: File extension to match (default: the artifact's)
+            
+        Returns:
+            Matching paths sorted by date
+        """
+        directory, default_extension = self.ARTIFACT_PATHS[name]
+        extension = extension or default_extension
+        return sorted(
+            path for path in (self.base_path / directory).glob(f"*.{extension}")
+            if start_date <= path.stem <= end_date
+        )
+    
+    def _read_snapshot(self, name: str, date: str) -> Optional[Dict[str, Any]]:
+        """Read a single-record snapshot, falling back to the legacy Parquet file.
+        
+        Args:
+            name: Artifact name ("macro" or "sentiment")
+            date: ISO date string
+            
+        Returns:
+            Field dictionary, or None if no snapshot exists for the date
+        """
+        file_path = self._artifact_path(name, date)
+        if file_path.exists():
+            row = feather.read_table(file_path, memory_map=True).to_pylist()[0]
+        else:
+            legacy_path = file_path.with_suffix(".parquet")
+            if not legacy_path.exists():
+                return None
+            row = pd.read_parquet(legacy_path, engine="pyarrow").iloc[0].to_dict()
+        
+        # Convert timestamp string back to datetime
         if isinstance(row['fetched_at'], str):
             row['fetched_at'] = datetime.fromisoformat(row['fetched_at'])
         
-        return SentimentData(**row)
+        return row
+    
+    def _load_snapshot_range(self, name: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Concatenate the snapshots of every run date in [start_date, end_date].
+        
+        Dates saved by older runs as Parquet (and not since as Arrow IPC)
+        are included, as in _read_snapshot.
+        
+        Args:
+            name: Artifact name ("macro" or "sentiment")
+            start_date: First ISO date (inclusive)
+            end_date: Last ISO date (inclusive)
+            
+        Returns:
+            DataFrame with a 'date' column, sorted by date (empty if no runs)
+        """
+        files = self._range_files(name, start_date, end_date)
+        arrow_dates = {path.stem for path in files}
+        files = sorted(
+            files + [
+                path for path in self._range_files(name, start_date, end_date, extension="parquet")
+                if path.stem not in arrow_dates
+            ],
+            key=lambda path: path.stem
+        )
+        if not files:
+            return pd.DataFrame()
+        
+        # Legacy files were written by pandas: drop their pandas metadata and
+        # let their timestamp[ns] columns unify with the Arrow timestamp[us]
+        table = pa.concat_tables(
+            [
+                feather.read_table(path, memory_map=True) if path.suffix == ".arrow"
+                else pq.read_table(path).replace_schema_metadata(None)
+                for path in files
+            ],
+            promote_options="permissive"
+        )
+        table = table.append_column("date", pa.array([path.stem for path in files]))
+        return table.to_pandas()
     
     def load_equity_dataset(self, date: str) -> EquityDataset:
         """Load equity dataset for a specific date.
@@ -284,20 +637,13 @@ class DataLake:
         if not file_path.exists():
             raise FileNotFoundError(f"No equity data found for {date}")
         
-        df = pd.read_parquet(file_path)
+        df = pd.read_parquet(file_path, engine="pyarrow")
         
-        # Reconstruct EquityData objects
-        from schemas.equities import EquityData
-        equities = []
-        
-        for _, row in df.iterrows():
-            equity_dict = row.to_dict()
-            # Remove computed columns
-            equity_dict.pop('pct_from_52w_high', None)
-            equity_dict.pop('above_200d_ma', None)
-            equity_dict.pop('above_50d_ma', None)
-            
-            equities.append(EquityData(**equity_dict))
+        # Reconstruct EquityData objects in one validation call; computed
+        # columns are dropped and missing values (NaN) become None
+        fields = df.drop(columns=[*self.COMPUTED_EQUITY_COLUMNS, 'date'], errors='ignore')
+        records = fields.astype(object).where(fields.notna(), None).to_dict(orient='records')
+        equities = _EQUITY_LIST_ADAPTER.validate_python(records)
         
         # Get fetched_at from first row (all should be same)
         fetched_at = df.iloc[0]['fetched_at'] if 'fetched_at' in df.columns else datetime.now()
@@ -320,10 +666,7 @@ class DataLake:
         if not file_path.exists():
             raise FileNotFoundError(f"No LLM payload found for {date}")
         
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
-        return LLMPayload(**data)
+        return LLMPayload.model_validate_json(file_path.read_bytes())
     
     def load_llm_response(self, date: str) -> AnalysisOutput:
         """Load LLM response for a specific date.
@@ -339,10 +682,7 @@ class DataLake:
         if not file_path.exists():
             raise FileNotFoundError(f"No LLM response found for {date}")
         
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
-        return AnalysisOutput(**data)
+        return AnalysisOutput.model_validate_json(file_path.read_bytes())
     
     def load_run_metadata(self, date: str) -> RunMetadata:
         """Load run metadata for a specific date.
@@ -355,18 +695,14 @@ class DataLake:
         """
         file_path = self.base_path / "metadata" / f"{date}.json"
         
-        if not file_path.exists():
-            raise FileNotFoundError(f"No run metadata found for {date}")
-        
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No run metadata found for {date}") from None
         
-        # Convert timestamp strings back to datetime
-        for key in ['started_at', 'completed_at']:
-            if isinstance(data[key], str):
-                data[key] = datetime.fromisoformat(data[key])
-        
-        return RunMetadata(**data)
+        # Callers get their own copy so mutating it cannot poison the cache
+        metadata = _load_run_metadata(str(file_path), stat.st_mtime_ns, stat.st_ino)
+        return metadata.model_copy(deep=True)
     
     def load_evaluation(self, date: str) -> GroundednessReport:
         """Load evaluation report for a specific date.
@@ -382,14 +718,7 @@ class DataLake:
         if not file_path.exists():
             raise FileNotFoundError(f"No evaluation found for {date}")
         
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
-        # Convert timestamp strings back to datetime
-        if isinstance(data.get('evaluated_at'), str):
-            data['evaluated_at'] = datetime.fromisoformat(data['evaluated_at'])
-        
-        return GroundednessReport(**data)
+        return GroundednessReport.model_validate_json(file_path.read_bytes())
     
     # ==================== UTILITY METHODS ====================
     
@@ -401,15 +730,14 @@ class DataLake:
         """
         metadata_dir = self.base_path / "metadata"
         
-        if not metadata_dir.exists():
+        try:
+            mtime_ns = metadata_dir.stat().st_mtime_ns
+        except FileNotFoundError:
             return []
         
-        dates = [
-            f.stem  # filename without .json extension
-            for f in metadata_dir.glob("*.json")
-        ]
-        
-        return sorted(dates)
+        # Adding or removing a file bumps the directory mtime, so a steady
+        # state costs one stat instead of a directory scan
+        return list(_list_run_dates(str(metadata_dir), mtime_ns))
     
     def get_run_summary(self, date: str) -> Dict:
         """Get a quick summary of a pipeline run.
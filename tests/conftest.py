@@ -1,10 +1,20 @@
 """Pytest configuration and shared fixtures."""
 
+import json
+import os
+import sys
 import pytest
 from pathlib import Path
 
+from src.research_engine import PromptManager
 
-@pytest.fixture
+# Keep tmp_path trees (e.g. DataLake integration tests) in RAM where
+# available; an explicit PYTEST_DEBUG_TEMPROOT or --basetemp still wins
+if sys.platform.startswith("linux") and Path("/dev/shm").is_dir():
+    os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", "/dev/shm")
+
+
+@pytest.fixture(scope="session")
 def fixtures_dir():
     """Return path to fixtures directory."""
     return Path(__file__).parent / "fixtures"
@@ -14,3 +24,36 @@ def fixtures_dir():
 def project_root():
     """Return path to project root."""
     return Path(__file__).parent.parent
+
+
+# API response fixtures are parsed once per session; tests treat them as
+# read-only (they only re-serialize them into mocked responses)
+
+@pytest.fixture(scope="session")
+def gemini_fixture(fixtures_dir):
+    """Load Gemini response fixture."""
+    return json.loads((fixtures_dir / "gemini_response.json").read_bytes())
+
+
+@pytest.fixture(scope="session")
+def gemini_response_text(gemini_fixture):
+    """Gemini response fixture serialized as the model's raw reply text."""
+    return json.dumps(gemini_fixture)
+
+
+@pytest.fixture(scope="session")
+def gemini_response_text_md(gemini_response_text):
+    """Gemini reply wrapped in a markdown JSON code block."""
+    return f"```json\n{gemini_response_text}\n```"
+
+
+@pytest.fixture(scope="session")
+def sentiment_fixture(fixtures_dir):
+    """Load sentiment API response fixture."""
+    return json.loads((fixtures_dir / "fear_greed_response.json").read_bytes())
+
+
+@pytest.fixture(scope="session")
+def prompt_manager():
+    """PromptManager for the repository's active prompt, loaded once."""
+    return PromptManager()
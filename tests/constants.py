@@ -0,0 +1,6 @@
+"""Constants shared by test modules."""
+
+from datetime import datetime
+
+# Fixed timestamp for test data, so every model is built from the same value
+NOW = datetime(2025, 2, 9, 12, 0, 0)
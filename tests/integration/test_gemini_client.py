@@ -1,18 +1,40 @@
 """Integration test for Gemini client."""
 
+import asyncio
 import pytest
-import json
+import numpy as np
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock
 
-from src.research_engine import GeminiClient, PromptManager
+from google.api_core import exceptions as google_exceptions
+
+from src.research_engine import gemini_client
+from src.research_engine import GeminiClient, PromptManager, SemanticCache
 from schemas.payload import LLMPayload, MacroEnvironment, OpportunityItem, MarketNews, MarketContext
 from schemas.llm_output import AnalysisOutput
 
+pytestmark = pytest.mark.integration
+
 
 class TestGeminiClientIntegration:
     """Integration tests for Gemini LLM client."""
     
+    @pytest.fixture(autouse=True)
+    def fresh_models(self):
+        """Drop shared models so each test sees its own patched GenerativeModel."""
+        gemini_client._get_model.cache_clear()
+        gemini_client._configure.cache_clear()
+    
+    @pytest.fixture
+    def mock_model_class(self, mocker):
+        """Patched GenerativeModel class; set return_value to the fake model."""
+        return mocker.patch('src.research_engine.gemini_client.genai.GenerativeModel')
+    
+    @pytest.fixture
+    def mock_sleep(self, mocker):
+        """Patched time.sleep, so retry backoff doesn't wait."""
+        return mocker.patch('src.research_engine.gemini_client.time.sleep')
+    
     @pytest.fixture
     def sample_payload(self):
         """Create sample LLM payload."""
@@ -59,30 +81,22 @@ class TestGeminiClientIntegration:
             themes={"ai_compute": ["GOOG"]}
         )
     
-    @pytest.fixture
-    def gemini_fixture(self, fixtures_dir):
-        """Load Gemini response fixture."""
-        fixture_path = fixtures_dir / "gemini_response.json"
-        with open(fixture_path) as f:
-            return json.load(f)
-    
-    @patch('src.research_engine.gemini_client.genai.GenerativeModel')
     def test_generate_analysis_success(
         self,
         mock_model_class,
         sample_payload,
-        gemini_fixture
+        gemini_response_text,
+        prompt_manager
     ):
         """Test successful analysis generation."""
         # Mock the model
         mock_model = Mock()
         mock_response = Mock()
-        mock_response.text = json.dumps(gemini_fixture)
+        mock_response.text = gemini_response_text
         mock_model.generate_content.return_value = mock_response
         mock_model_class.return_value = mock_model
         
         # Generate analysis
-        prompt_manager = PromptManager()
         client = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
         
         analysis = client.generate_analysis(sample_payload)
@@ -94,24 +108,22 @@ class TestGeminiClientIntegration:
         assert analysis.opportunities[0].conviction_score == 9
         assert len(analysis.scenarios) == 3
     
-    @patch('src.research_engine.gemini_client.genai.GenerativeModel')
     def test_handles_json_in_code_block(
         self,
         mock_model_class,
         sample_payload,
-        gemini_fixture
+        gemini_response_text_md,
+        prompt_manager
     ):
         """Test extraction of JSON from markdown code blocks."""
         # Mock response with markdown wrapping
         mock_model = Mock()
         mock_response = Mock()
-        wrapped_json = f"```json\n{json.dumps(gemini_fixture)}\n```"
-        mock_response.text = wrapped_json
+        mock_response.text = gemini_response_text_md
         mock_model.generate_content.return_value = mock_response
         mock_model_class.return_value = mock_model
         
         # Generate
-        prompt_manager = PromptManager()
         client = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
         
         analysis = client.generate_analysis(sample_payload)
@@ -119,3 +131,285 @@ class TestGeminiClientIntegration:
         # Should still parse successfully
         assert isinstance(analysis, AnalysisOutput)
         assert len(analysis.opportunities) > 0
+    
+    def test_identical_prompt_served_from_cache(
+        self,
+        mock_model_class,
+        sample_payload,
+        gemini_response_text,
+        tmp_path,
+        prompt_manager
+    ):
+        """Test that a repeated prompt is answered from the on-disk cache."""
+        mock_model = Mock()
+        mock_response = Mock()
+        mock_response.text = gemini_response_text
+        mock_model.generate_content.return_value = mock_response
+        mock_model_class.return_value = mock_model
+        
+        first = GeminiClient(api_key="test_key", prompt_manager=prompt_manager, cache_dir=tmp_path)
+        second = GeminiClient(api_key="test_key", prompt_manager=prompt_manager, cache_dir=tmp_path)
+        
+        analysis = first.generate_analysis(sample_payload)
+        cached = second.generate_analysis(sample_payload)
+        
+        assert mock_model.generate_content.call_count == 1
+        assert cached == analysis
+        assert not list(tmp_path.glob("*.tmp"))
+    
+    def test_expired_cache_entry_calls_api(
+        self,
+        mock_model_class,
+        sample_payload,
+        gemini_response_text,
+        tmp_path,
+        prompt_manager
+    ):
+        """Test that entries older than the TTL are ignored."""
+        mock_model = Mock()
+        mock_response = Mock()
+        mock_response.text = gemini_response_text
+        mock_model.generate_content.return_value = mock_response
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(
+            api_key="test_key",
+            prompt_manager=prompt_manager,
+            cache_dir=tmp_path,
+            cache_ttl_seconds=0
+        )
+        
+        client.generate_analysis(sample_payload)
+        client.generate_analysis(sample_payload)
+        
+        assert mock_model.generate_content.call_count == 2
+    
+    def test_near_duplicate_payload_served_from_semantic_cache(
+        self,
+        mock_model_class,
+        sample_payload,
+        gemini_response_text,
+        tmp_path,
+        prompt_manager
+    ):
+        """Test that a marginally changed payload reuses the earlier analysis."""
+        mock_model = Mock()
+        mock_model.generate_content.return_value = Mock(text=gemini_response_text)
+        mock_model_class.return_value = mock_model
+        
+        def embed(text):
+            return np.array([text.count(c) for c in "abcdefghijklmnopqrstuvwxyz0123456789"])
+        
+        client = GeminiClient(
+            api_key="test_key",
+            prompt_manager=prompt_manager,
+            semantic_cache=SemanticCache(embed, cache_dir=tmp_path)
+        )
+        
+        analysis = client.generate_analysis(sample_payload)
+        nearby = sample_payload.model_copy(update={"weekly_budget_usd": sample_payload.weekly_budget_usd + 1})
+        cached = SemanticCache(embed, cache_dir=tmp_path).lookup(
+            client._semantic_text(nearby), namespace=client._config_digest().hexdigest(), tickers=["GOOG"]
+        )
+        
+        assert client.generate_analysis(nearby) == analysis
+        assert mock_model.generate_content.call_count == 1
+        assert cached == analysis  # Persisted across instances
+        assert SemanticCache(embed, cache_dir=tmp_path).lookup("unrelated text") is None
+    
+    def test_semantic_cache_misses_on_different_opportunities(
+        self,
+        mock_model_class,
+        sample_payload,
+        gemini_response_text,
+        prompt_manager
+    ):
+        """Test that shared news does not reuse an analysis of other candidates."""
+        mock_model = Mock()
+        mock_model.generate_content.return_value = Mock(text=gemini_response_text)
+        mock_model_class.return_value = mock_model
+        
+        # Every text embeds identically, so only the ticker check can miss
+        client = GeminiClient(
+            api_key="test_key",
+            prompt_manager=prompt_manager,
+            semantic_cache=SemanticCache(lambda text: np.ones(4))
+        )
+        other = sample_payload.model_copy(update={
+            "opportunities": [
+                sample_payload.opportunities[0].model_copy(update={"ticker": "NVDA"})
+            ]
+        })
+        
+        client.generate_analysis(sample_payload)
+        client.generate_analysis(other)
+        
+        assert other.market_news == sample_payload.market_news
+        assert "NVDA" in client._semantic_text(other)
+        assert mock_model.generate_content.call_count == 2
+    
+    def test_batch_generation_bounded_and_ordered(
+        self,
+        mock_model_class,
+        sample_payload,
+        gemini_response_text,
+        prompt_manager
+    ):
+        """Test that batched payloads run concurrently up to the cap, in order."""
+        in_flight = 0
+        peak = 0
+        
+        async def generate_content_async(prompt):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Mock(text=gemini_response_text)
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(side_effect=generate_content_async)
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
+        payloads = [
+            sample_payload.model_copy(update={"report_date": f"2025-02-{day:02d}"})
+            for day in range(1, 7)
+        ]
+        
+        analyses = asyncio.run(client.generate_analyses_batch(payloads, concurrency=10))
+        
+        assert len(analyses) == len(payloads)
+        assert all(isinstance(analysis, AnalysisOutput) for analysis in analyses)
+        assert mock_model.generate_content_async.await_count == len(payloads)
+        assert 1 < peak <= GeminiClient.MAX_CONCURRENT_REQUESTS
+        assert "2025-02-01" in mock_model.generate_content_async.await_args_list[0].args[0]
+    
+    def test_system_prompt_sent_as_instruction_for_gemini_models(
+        self,
+        mock_model_class,
+        sample_payload,
+        gemini_response_text,
+        tmp_path
+    ):
+        """Test that Gemini models get the system prompt once, as a system instruction."""
+        (tmp_path / "current.yaml").write_text(
+            "version: 9\n"
+            "config:\n"
+            "  model: gemini-2.0-flash\n"
+            "system_prompt: You are a market strategist.\n"
+            "user_prompt_template: \"Data: {json_payload}\"\n"
+        )
+        mock_model = Mock()
+        mock_model.generate_content.return_value = Mock(text=gemini_response_text)
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(api_key="test_key", prompt_manager=PromptManager(str(tmp_path)))
+        client.generate_analysis(sample_payload)
+        
+        assert mock_model_class.call_args.kwargs['system_instruction'] == "You are a market strategist."
+        prompt = mock_model.generate_content.call_args.args[0]
+        assert prompt.startswith("Data: ") and "market strategist" not in prompt
+    
+    def test_system_prompt_inline_for_gemma_models(self, mock_model_class, sample_payload, prompt_manager):
+        """Test that Gemma models, which reject system instructions, keep it inline."""
+        client = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
+        
+        assert mock_model_class.call_args.kwargs['system_instruction'] is None
+        assert client._build_prompt(sample_payload).startswith(prompt_manager.system_prompt)
+    
+    def test_clients_share_configured_model(self, mocker, mock_model_class, prompt_manager):
+        """Test that clients with the same key and config reuse one model."""
+        mock_configure = mocker.patch('src.research_engine.gemini_client.genai.configure')
+        first = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
+        second = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
+        
+        assert second.model is first.model
+        assert mock_model_class.call_count == 1
+        assert mock_configure.call_count == 1
+    
+    def test_list_fields_joined_into_strings(self, mock_model_class, prompt_manager):
+        """Test that list-valued string fields are joined and strings left as-is."""
+        client = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
+        
+        normalized = client._normalize_llm_output({
+            'themes_in_focus': ['AI', 3],
+            'risks_to_watch': 'Rates',
+            'other': ['kept'],
+        })
+        
+        assert normalized == {'themes_in_focus': 'AI, 3', 'risks_to_watch': 'Rates', 'other': ['kept']}
+    
+    @pytest.mark.parametrize("template", [
+        "{body}",
+        "```json\n{body}\n```",
+        "  ```\n{body}\n```\n",
+        "```json\n{body}",
+        "{body}\n```",
+    ])
+    def test_extract_json_fence_variants(self, mock_model_class, template, prompt_manager):
+        """Test that opening and closing fences are stripped independently."""
+        client = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
+        body = '{"note": "inner ``` kept", "n": [1, 2]}'
+        
+        parsed = client._extract_json(template.format(body=body))
+        
+        assert parsed == {"note": "inner ``` kept", "n": [1, 2]}
+    
+    def test_transient_error_retried_with_backoff(
+        self,
+        mock_model_class,
+        mock_sleep,
+        sample_payload,
+        gemini_response_text,
+        prompt_manager
+    ):
+        """Test that rate limiting backs off before retrying."""
+        mock_model = Mock()
+        mock_model.generate_content.side_effect = [
+            google_exceptions.ResourceExhausted("quota"),
+            Mock(text=gemini_response_text),
+        ]
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
+        analysis = client.generate_analysis(sample_payload)
+        
+        assert isinstance(analysis, AnalysisOutput)
+        assert mock_model.generate_content.call_count == 2
+        (delay,), _ = mock_sleep.call_args
+        assert GeminiClient.BACKOFF_BASE_SECONDS <= delay <= 2 * GeminiClient.BACKOFF_BASE_SECONDS
+    
+    def test_backoff_doubles_to_cap_with_bounded_jitter(
+        self, mocker, mock_model_class, mock_sleep, sample_payload, prompt_manager
+    ):
+        """Test that waits double from 1 s, cap at 30 s, and add at most 1 s of jitter."""
+        mock_model = Mock()
+        mock_model.generate_content.side_effect = google_exceptions.ServiceUnavailable("overloaded")
+        mock_model_class.return_value = mock_model
+        # Maximum jitter on every wait
+        uniform = mocker.patch(
+            'src.research_engine.gemini_client.random.uniform', side_effect=lambda low, high: high
+        )
+        
+        client = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
+        with pytest.raises(google_exceptions.ServiceUnavailable):
+            client.generate_analysis(sample_payload, max_retries=8)
+        
+        delays = [args[0] for args, _ in mock_sleep.call_args_list]
+        assert delays == [2.0, 3.0, 5.0, 9.0, 17.0, 31.0, 31.0]  # 1, 2, 4, 8, 16, 30, 30 + 1
+        assert {args for args, _ in uniform.call_args_list} == {(0, GeminiClient.BACKOFF_BASE_SECONDS)}
+    
+    def test_permanent_api_error_fails_fast(self, mock_model_class, mock_sleep, sample_payload, prompt_manager):
+        """Test that non-transient API errors are not retried."""
+        mock_model = Mock()
+        mock_model.generate_content.side_effect = google_exceptions.PermissionDenied("bad key")
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(api_key="test_key", prompt_manager=prompt_manager)
+        
+        with pytest.raises(google_exceptions.PermissionDenied):
+            client.generate_analysis(sample_payload, max_retries=3)
+        
+        assert mock_model.generate_content.call_count == 1
+        mock_sleep.assert_not_called()
@@ -2,29 +2,25 @@
 
 import pytest
 import json
+import requests
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 from src.ingestion.sentiment_client import SentimentClient
 
+pytestmark = pytest.mark.integration
+
 
 class TestSentimentClientIntegration:
     """Integration tests for sentiment scraping."""
     
-    @pytest.fixture
-    def sentiment_fixture(self, fixtures_dir):
-        """Load sentiment API response fixture."""
-        fixture_path = fixtures_dir / "fear_greed_response.json"
-        with open(fixture_path) as f:
-            return json.load(f)
-    
     @patch('src.ingestion.sentiment_client.requests.get')
     def test_fetch_fear_greed_success(self, mock_get, sentiment_fixture):
         """Test successful Fear & Greed fetch."""
         # Mock the API response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = sentiment_fixture
+        mock_response.content = json.dumps(sentiment_fixture).encode()
         mock_get.return_value = mock_response
         
         # Fetch sentiment
@@ -35,7 +31,7 @@ class TestSentimentClientIntegration:
         assert sentiment.score == 42
         assert sentiment.label == "Fear"
         assert sentiment.one_week_ago == 38
-        assert sentiment.is_fearful == True
+        assert sentiment.is_fearful is True
     
     @patch('src.ingestion.sentiment_client.requests.get')
     def test_fetch_handles_network_error(self, mock_get):
@@ -46,3 +42,20 @@ class TestSentimentClientIntegration:
         
         with pytest.raises(Exception):
             client.fetch_fear_greed()
+    
+    @patch('src.ingestion.sentiment_client.time.sleep')
+    @patch('src.ingestion.sentiment_client.requests.get')
+    def test_unrecoverable_http_error_skips_retries(self, mock_get, mock_sleep):
+        """Test that a 401 falls back immediately instead of retrying."""
+        mock_response = Mock()
+        mock_response.status_code = 401
+        mock_get.return_value.raise_for_status.side_effect = requests.HTTPError(
+            response=mock_response
+        )
+        
+        client = SentimentClient()
+        sentiment = client.fetch_fear_greed()
+        
+        assert sentiment.score == 50
+        assert mock_get.call_count == 1
+        mock_sleep.assert_not_called()
@@ -0,0 +1,168 @@
+"""Test correlation analyzer functionality."""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+from src.quant_engine.correlation import CorrelationAnalyzer
+
+
+class TestCorrelationAnalyzer:
+    """Test suite for CorrelationAnalyzer class."""
+    
+    @pytest.fixture
+    def corr_matrix(self):
+        """Sample correlation matrix with one positive and one negative redundant pair."""
+        tickers = ['AAA', 'BBB', 'CCC', 'DDD']
+        return pd.DataFrame(
+            [
+                [1.00, 0.90, 0.10, 0.20],
+                [0.90, 1.00, 0.30, -0.95],
+                [0.10, 0.30, 1.00, 0.40],
+                [0.20, -0.95, 0.40, 1.00],
+            ],
+            index=tickers,
+            columns=tickers
+        )
+    
+    @pytest.fixture
+    def opportunities_df(self):
+        """Sample opportunities sorted by score."""
+        return pd.DataFrame({
+            'ticker': ['BBB', 'AAA', 'DDD', 'CCC'],
+            'opportunity_score': [80.0, 70.0, 60.0, 50.0],
+        })
+    
+    def test_high_correlation_pairs_found(self, corr_matrix):
+        """Pairs above threshold (by absolute value) should be returned once."""
+        analyzer = CorrelationAnalyzer(max_correlation=0.85)
+        pairs = analyzer._find_high_correlation_pairs(corr_matrix)
+        
+        assert pairs == [('AAA', 'BBB', 0.90), ('BBB', 'DDD', -0.95)]
+    
+    def test_threshold_sweep_reuses_upper_triangle(self, corr_matrix):
+        """Changing the threshold should re-mask cached pairs, not rescan the matrix."""
+        analyzer = CorrelationAnalyzer(max_correlation=0.85)
+        analyzer._find_high_correlation_pairs(corr_matrix)
+        
+        with patch('src.quant_engine.correlation.np.triu_indices') as triu:
+            analyzer.max_correlation = 0.35
+            pairs = analyzer._find_high_correlation_pairs(corr_matrix)
+        
+        triu.assert_not_called()
+        assert [(a, b) for a, b, _ in pairs] == [('AAA', 'BBB'), ('BBB', 'DDD'), ('CCC', 'DDD')]
+    
+    def test_enforce_diversification_keeps_higher_score(self, corr_matrix, opportunities_df):
+        """The lower-scored ticker of each correlated pair should be dropped."""
+        analyzer = CorrelationAnalyzer(max_correlation=0.85)
+        diversified = analyzer.enforce_diversification(opportunities_df, corr_matrix)
+        
+        assert diversified['ticker'].tolist() == ['BBB', 'CCC']
+    
+    def test_enforce_diversification_chain_keeps_best_of_each_cluster(self):
+        """A dropped ticker should not knock out tickers it is correlated with."""
+        tickers = ['AAA', 'BBB', 'CCC']
+        corr_matrix = pd.DataFrame(
+            [
+                [1.00, 0.90, 0.10],
+                [0.90, 1.00, 0.90],
+                [0.10, 0.90, 1.00],
+            ],
+            index=tickers,
+            columns=tickers
+        )
+        df = pd.DataFrame({
+            'ticker': ['CCC', 'BBB', 'AAA'],
+            'opportunity_score': [70.0, 60.0, 50.0],
+        })
+        
+        analyzer = CorrelationAnalyzer(max_correlation=0.85)
+        diversified = analyzer.enforce_diversification(df, corr_matrix)
+        
+        assert diversified['ticker'].tolist() == ['CCC', 'AAA']
+    
+    def test_empty_matrix_skips_diversification(self, opportunities_df):
+        """An empty correlation matrix should leave opportunities untouched."""
+        analyzer = CorrelationAnalyzer()
+        diversified = analyzer.enforce_diversification(opportunities_df, pd.DataFrame())
+        
+        assert diversified['ticker'].tolist() == opportunities_df['ticker'].tolist()
+    
+    @patch('src.quant_engine.correlation.yf.download')
+    def test_single_ticker_skips_download(self, mock_download, tmp_path):
+        """Fewer than two tickers should return an empty matrix without fetching."""
+        analyzer = CorrelationAnalyzer(cache_dir=str(tmp_path))
+        
+        corr_matrix = analyzer.calculate_correlation_matrix(['AAA'])
+        
+        assert corr_matrix.empty
+        mock_download.assert_not_called()
+    
+    @patch('src.quant_engine.correlation.yf.download')
+    def test_warm_cache_fetches_only_new_bars(self, mock_download, tmp_path):
+        """Second run should download from the bar before the last cached day, not the full period."""
+        dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=60, name='Date')
+        prices = pd.DataFrame(
+            np.linspace(100, 160, 120).reshape(60, 2) + np.random.default_rng(0).normal(size=(60, 2)),
+            index=dates,
+            columns=['AAA', 'BBB']
+        )
+        mock_download.return_value = pd.concat({'Close': prices}, axis=1)
+        
+        analyzer = CorrelationAnalyzer(cache_dir=str(tmp_path))
+        first = analyzer._fetch_returns(['AAA', 'BBB'], period="1y")
+        
+        mock_download.return_value = pd.concat({'Close': prices.tail(1)}, axis=1)
+        second = analyzer._fetch_returns(['AAA', 'BBB'], period="1y")
+        
+        assert mock_download.call_args.kwargs['start'] == dates[-2].strftime('%Y-%m-%d')
+        assert 'period' not in mock_download.call_args.kwargs
+        pd.testing.assert_frame_equal(first, second, check_freq=False)
+    
+    @patch('src.quant_engine.correlation.yf.download')
+    def test_split_between_runs_refetches_full_history(self, mock_download, tmp_path):
+        """A rewritten adjusted history should be re-downloaded, not mixed with the cache."""
+        dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=60, name='Date')
+        prices = pd.DataFrame(
+            100 * 1.001 ** np.arange(120).reshape(60, 2),
+            index=dates,
+            columns=['AAA', 'BBB']
+        )
+        mock_download.return_value = pd.concat({'Close': prices}, axis=1)
+        
+        analyzer = CorrelationAnalyzer(cache_dir=str(tmp_path))
+        analyzer._fetch_returns(['AAA', 'BBB'], period="1y")
+        
+        # 2-for-1 split in AAA: Yahoo halves its whole adjusted history
+        adjusted = prices.assign(AAA=prices['AAA'] / 2)
+        
+        def download(tickers, **kwargs):
+            if 'start' in kwargs:
+                return pd.concat({'Close': adjusted.loc[kwargs['start']:, tickers]}, axis=1)
+            return pd.concat({'Close': adjusted[tickers]}, axis=1)
+        
+        mock_download.side_effect = download
+        returns = analyzer._fetch_returns(['AAA', 'BBB'], period="1y")
+        
+        assert mock_download.call_args.kwargs['period'] == '1y'
+        assert mock_download.call_args.kwargs['tickers'] == ['AAA']
+        assert np.abs(returns.to_numpy()).max() < 0.01  # No spurious -69% log return
+    
+    def test_returns_are_log_returns_aligned_across_gaps(self, tmp_path):
+        """Returns should be log returns, with gap days dropped for all tickers."""
+        aaa = 100.0 * 1.1 ** np.arange(8)
+        bbb = 50.0 * 1.1 ** np.arange(8)
+        bbb[2] = np.nan
+        close = pd.DataFrame(
+            {'AAA': aaa, 'BBB': bbb},
+            index=pd.date_range('2024-01-01', periods=8, freq='D')
+        )
+        analyzer = CorrelationAnalyzer(cache_dir=str(tmp_path))
+        
+        with patch.object(analyzer, '_fetch_close_prices', return_value=close):
+            returns = analyzer._fetch_returns(['AAA', 'BBB'], '1y')
+        
+        assert list(returns.index) == list(close.index[[1, 4, 5, 6, 7]])
+        np.testing.assert_allclose(returns['AAA'], np.log(1.1))
+        np.testing.assert_allclose(returns['BBB'], np.log(1.1))
@@ -2,10 +2,10 @@
 
 import pytest
 import pandas as pd
-from datetime import datetime
 
 from schemas.equities import EquityData, EquityDataset
 from src.quant_engine.data_validator import DataValidator
+from tests.constants import NOW
 
 
 class TestDataValidator:
@@ -30,7 +30,7 @@ class TestDataValidator:
         
         dataset = EquityDataset(
             equities=[equity],
-            fetched_at=datetime.now()
+            fetched_at=NOW
         )
         
         validator = DataValidator()
@@ -40,6 +40,38 @@ class TestDataValidator:
         assert len(dropped) == 0
         assert validated.equities[0].ticker == "GOOG"
     
+    def test_survivors_are_not_rebuilt(self):
+        """Passing equities should be the original model objects, not copies."""
+        good = EquityData(
+            ticker="GOOG",
+            current_price=100.0,
+            high_52w=120.0,
+            low_52w=80.0,
+            pe_ratio=25.0,
+            forward_pe=22.0,
+            peg_ratio=1.5,
+            market_cap=1500000000000,
+            sector="Technology",
+            ma_50d=95.0,
+            ma_200d=90.0,
+            year_return=15.5
+        )
+        bad = EquityData(
+            ticker="BAD",
+            current_price=10.0,
+            high_52w=120.0,
+            low_52w=80.0,
+            market_cap=1000000000,
+            sector="Technology"
+        )
+        
+        dataset = EquityDataset(equities=[bad, good], fetched_at=NOW)
+        validated, dropped = DataValidator().validate_equity_data(dataset)
+        
+        assert validated.equities[0] is good
+        assert validated.fetched_at == NOW
+        assert len(dropped) == 1
+    
     def test_missing_critical_fields_drops_ticker(self):
         """Equity with too much missing data should be dropped."""
         # Create equity with valid Pydantic fields but missing optional data
@@ -56,7 +88,7 @@ class TestDataValidator:
         
         dataset = EquityDataset(
             equities=[equity],
-            fetched_at=datetime.now()
+            fetched_at=NOW
         )
         
         validator = DataValidator()
@@ -91,7 +123,7 @@ class TestDataValidator:
         
         dataset = EquityDataset(
             equities=[equity],
-            fetched_at=datetime.now()
+            fetched_at=NOW
         )
         
         validator = DataValidator()
@@ -129,7 +161,7 @@ class TestDataValidator:
         
         dataset = EquityDataset(
             equities=[good_equity, bad_equity],
-            fetched_at=datetime.now()
+            fetched_at=NOW
         )
         
         validator = DataValidator()
@@ -139,3 +171,31 @@ class TestDataValidator:
         assert validated.equities[0].ticker == "GOOG"
         assert len(dropped) == 1
         assert "BAD" in dropped[0]
+    
+    def test_drop_reasons_and_columnar_view_of_survivors(self):
+        """Each dropped ticker gets its first failing check; survivors get fresh arrays."""
+        complete = dict(
+            high_52w=120.0, low_52w=80.0, pe_ratio=25.0, forward_pe=22.0, peg_ratio=1.5,
+            ma_50d=95.0, ma_200d=90.0, year_return=15.5, sector="Technology"
+        )
+        dataset = EquityDataset(
+            equities=[
+                EquityData.model_construct(ticker="ZERO", current_price=10.0, market_cap=0, **complete),
+                EquityData(ticker="GOOG", current_price=100.0, market_cap=10**12, **complete),
+                EquityData.model_construct(
+                    ticker="NEGPE", current_price=100.0, market_cap=10**12, **{**complete, 'pe_ratio': -5.0}
+                ),
+                EquityData(
+                    ticker="SPARSE", current_price=100.0, market_cap=10**12,
+                    high_52w=120.0, low_52w=80.0, sector="Energy"
+                ),
+            ],
+            fetched_at=NOW
+        )
+        dataset.to_arrays()  # Warm the cache of the unfiltered dataset
+        
+        validated, dropped = DataValidator().validate_equity_data(dataset)
+        
+        assert [reason.split(":")[0] for reason in dropped] == ["ZERO", "NEGPE", "SPARSE"]
+        assert "critical" in dropped[0] and "Invalid" in dropped[1] and "missing" in dropped[2]
+        assert list(validated.to_arrays()['ticker']) == ["GOOG"]
@@ -1,67 +1,74 @@
 """Test opportunity filter functionality."""
 
 import pytest
+import numpy as np
 import pandas as pd
-from datetime import datetime
 
 from schemas.equities import EquityData, EquityDataset
+from src.quant_engine import filters
 from src.quant_engine.filters import OpportunityFilter
+from src.quant_engine.thresholds import Thresholds
+from tests.constants import NOW
 
 
-class TestOpportunityFilter:
-    """Test suite for OpportunityFilter class."""
-    
-    @pytest.fixture
-    def sample_thresholds(self):
-        """Sample threshold configuration."""
-        return {
-            'value_filters': {
-                'max_pe_ratio': 35,
-                'max_peg_ratio': 2.5,
-                'min_market_cap': 1_000_000_000
-            },
-            'momentum_filters': {
-                'max_pct_from_52w_high': 0.30,
-                'require_above_200d_ma': False
-            }
+# Built once per module: apply_filters never mutates its inputs, so
+# tests share them read-only
+@pytest.fixture(scope="module")
+def sample_thresholds():
+    """Sample threshold configuration."""
+    return {
+        'value_filters': {
+            'max_pe_ratio': 35,
+            'max_peg_ratio': 2.5,
+            'min_market_cap': 1_000_000_000
+        },
+        'momentum_filters': {
+            'max_pct_from_52w_high': 0.30,
+            'require_above_200d_ma': False
         }
+    }
+
+
+@pytest.fixture(scope="module")
+def sample_dataset():
+    """Sample equity dataset for testing (known-valid, so not validated)."""
+    equities = [
+        EquityData.model_construct(
+            ticker="CHEAP",
+            current_price=100.0,
+            high_52w=110.0,
+            low_52w=80.0,
+            pe_ratio=15.0,  # Good value
+            peg_ratio=1.0,
+            market_cap=50_000_000_000,
+            sector="Technology"
+        ),
+        EquityData.model_construct(
+            ticker="EXPENSIVE",
+            current_price=200.0,
+            high_52w=210.0,
+            low_52w=150.0,
+            pe_ratio=50.0,  # Too expensive
+            peg_ratio=3.0,
+            market_cap=100_000_000_000,
+            sector="Technology"
+        ),
+        EquityData.model_construct(
+            ticker="SMALL",
+            current_price=10.0,
+            high_52w=12.0,
+            low_52w=8.0,
+            pe_ratio=20.0,
+            market_cap=500_000_000,  # Too small
+            sector="Technology"
+        )
+    ]
     
-    @pytest.fixture
-    def sample_dataset(self):
-        """Sample equity dataset for testing."""
-        equities = [
-            EquityData(
-                ticker="CHEAP",
-                current_price=100.0,
-                high_52w=110.0,
-                low_52w=80.0,
-                pe_ratio=15.0,  # Good value
-                peg_ratio=1.0,
-                market_cap=50_000_000_000,
-                sector="Technology"
-            ),
-            EquityData(
-                ticker="EXPENSIVE",
-                current_price=200.0,
-                high_52w=210.0,
-                low_52w=150.0,
-                pe_ratio=50.0,  # Too expensive
-                peg_ratio=3.0,
-                market_cap=100_000_000_000,
-                sector="Technology"
-            ),
-            EquityData(
-                ticker="SMALL",
-                current_price=10.0,
-                high_52w=12.0,
-                low_52w=8.0,
-                pe_ratio=20.0,
-                market_cap=500_000_000,  # Too small
-                sector="Technology"
-            )
-        ]
-        
-        return EquityDataset(equities=equities, fetched_at=datetime.now())
+    return EquityDataset(equities=equities, fetched_at=NOW)
+
+
+class TestOpportunityFilter:
+    """Test suite for OpportunityFilter class."""
     
     def test_value_filter_excludes_high_pe(self, sample_thresholds, sample_dataset):
         """Stocks with PE > threshold should fail value filter."""
@@ -87,6 +94,95 @@ class TestOpportunityFilter:
         cheap = df[df['ticker'] == 'CHEAP']
         assert cheap['passes_value_filter'].iloc[0]
     
+    def test_value_filter_missing_ratios_pass(self, sample_thresholds):
+        """Missing PE/PEG ratios should not exclude an otherwise valid stock."""
+        no_ratios = EquityData(
+            ticker="NORATIO",
+            current_price=100.0,
+            high_52w=110.0,
+            low_52w=80.0,
+            market_cap=50_000_000_000,
+            sector="Technology"
+        )
+        dataset = EquityDataset(equities=[no_ratios], fetched_at=NOW)
+        
+        df = OpportunityFilter(sample_thresholds).apply_filters(dataset, fear_greed_score=50)
+        
+        assert df['passes_value_filter'].iloc[0]
+    
+    def test_momentum_filter_requires_200d_ma_when_configured(self, sample_thresholds):
+        """With require_above_200d_ma, stocks below their 200d MA should fail."""
+        below_ma = EquityData(
+            ticker="BELOW",
+            current_price=100.0,
+            high_52w=105.0,
+            low_52w=80.0,
+            market_cap=50_000_000_000,
+            sector="Technology",
+            ma_200d=120.0
+        )
+        dataset = EquityDataset(equities=[below_ma], fetched_at=NOW)
+        
+        lenient = OpportunityFilter(sample_thresholds).apply_filters(dataset, fear_greed_score=50)
+        strict_config = {
+            **sample_thresholds,
+            'momentum_filters': {**sample_thresholds['momentum_filters'], 'require_above_200d_ma': True}
+        }
+        strict = OpportunityFilter(strict_config).apply_filters(dataset, fear_greed_score=50)
+        
+        assert lenient['passes_momentum_filter'].iloc[0]
+        assert not strict['passes_momentum_filter'].iloc[0]
+    
+    def test_string_columns_are_categorical(self, sample_thresholds, sample_dataset):
+        """Ticker and sector should come back as category dtype."""
+        df = OpportunityFilter(sample_thresholds).apply_filters(sample_dataset, fear_greed_score=50)
+        
+        assert isinstance(df['ticker'].dtype, pd.CategoricalDtype)
+        assert isinstance(df['sector'].dtype, pd.CategoricalDtype)
+        assert set(df['ticker']) == {'CHEAP', 'EXPENSIVE', 'SMALL'}
+    
+    @pytest.mark.parametrize("fear_greed_score", [10, 50, 80])
+    def test_numba_kernel_matches_numpy_scores(self, sample_thresholds, sample_dataset, fear_greed_score):
+        """The compiled kernel should score exactly like the NumPy path."""
+        pytest.importorskip("numba")
+        filter_engine = OpportunityFilter(sample_thresholds)
+        expected = filter_engine.apply_filters(sample_dataset, fear_greed_score)
+        
+        filter_engine.NUMBA_MIN_ROWS = 0  # Force the compiled path
+        actual = filter_engine.apply_filters(sample_dataset, fear_greed_score)
+        
+        np.testing.assert_array_equal(actual['opportunity_score'], expected['opportunity_score'])
+    
+    def test_process_pool_matches_serial(self, sample_thresholds, sample_dataset, monkeypatch):
+        """Chunked evaluation in worker processes should match the serial result."""
+        monkeypatch.setattr(filters, '_numba_score_kernel', lambda: None)
+        expected = OpportunityFilter(sample_thresholds, n_workers=1).apply_filters(sample_dataset, 20)
+        
+        parallel = OpportunityFilter(sample_thresholds, n_workers=2)
+        parallel.PARALLEL_MIN_ROWS = 0  # Force the process pool
+        actual = parallel.apply_filters(sample_dataset, 20)
+        
+        pd.testing.assert_frame_equal(actual, expected)
+    
+    def test_result_columns_are_contiguous_and_writable(self, sample_thresholds, sample_dataset):
+        """Each returned column should be a contiguous, writable 1D array."""
+        df = OpportunityFilter(sample_thresholds).apply_filters(sample_dataset, fear_greed_score=50)
+        
+        for block in df._mgr.blocks:
+            if isinstance(block.values, np.ndarray):
+                assert block.values.flags['C_CONTIGUOUS'] and block.values.flags['WRITEABLE']
+        df.loc[df.index[0], 'opportunity_score'] = 0.0  # Must not hit the read-only cache
+        assert sample_dataset.to_arrays()['current_price'].flags['WRITEABLE'] is False
+    
+    def test_top_k_matches_head_of_full_sort(self, sample_thresholds, sample_dataset):
+        """A top-k selection should equal the head of the full sorted result."""
+        filter_engine = OpportunityFilter(sample_thresholds)
+        full = filter_engine.apply_filters(sample_dataset, fear_greed_score=50)
+        top = filter_engine.apply_filters(sample_dataset, fear_greed_score=50, top_k=2)
+        
+        assert top['ticker'].tolist() == full['ticker'].head(2).tolist()
+        assert top['opportunity_score'].tolist() == full['opportunity_score'].head(2).tolist()
+    
     def test_opportunity_score_calculated(self, sample_thresholds, sample_dataset):
         """All stocks should get an opportunity score 0-100."""
         filter_engine = OpportunityFilter(sample_thresholds)
@@ -118,7 +214,7 @@ class TestOpportunityFilter:
             sector="Technology"
         )
         
-        dataset = EquityDataset(equities=[beaten_down], fetched_at=datetime.now())
+        dataset = EquityDataset(equities=[beaten_down], fetched_at=NOW)
         filter_engine = OpportunityFilter(sample_thresholds)
         
         # Score with neutral sentiment
@@ -131,3 +227,12 @@ class TestOpportunityFilter:
         
         # Fear should boost the score
         assert score_fear > score_neutral
+    
+    def test_thresholds_flattened_from_config(self, sample_thresholds):
+        """Nested config should flatten once, with defaults for absent keys."""
+        thresholds = Thresholds.from_config(sample_thresholds)
+        
+        assert thresholds.max_pe_ratio == 35
+        assert thresholds.max_pct_from_52w_high == 0.30
+        assert thresholds.max_correlation == 0.85  # No correlation section
+        assert OpportunityFilter(sample_thresholds).thresholds == thresholds
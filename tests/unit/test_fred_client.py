@@ -0,0 +1,76 @@
+"""Test FRED client retry classification."""
+
+import itertools
+import pytest
+import pandas as pd
+from urllib.error import HTTPError
+
+from src.ingestion.fred_client import FREDClient
+
+
+def fred_error(code, message):
+    """Error as fredapi raises it: ValueError(<FRED message>) chained to the HTTPError."""
+    try:
+        raise HTTPError("https://api.stlouisfed.org/fred/series/observations", code, message, None, None)
+    except HTTPError:
+        try:
+            raise ValueError(message)
+        except ValueError as e:
+            return e
+
+
+class TestFREDClient:
+    """Test suite for FREDClient retry handling."""
+    
+    @pytest.fixture
+    def client(self):
+        """Client with a dummy API key (no request is made on construction)."""
+        return FREDClient(api_key="0" * 32)
+    
+    @pytest.fixture
+    def mock_sleep(self, mocker):
+        """Skip retry backoff."""
+        return mocker.patch("src.ingestion.fred_client.time.sleep")
+    
+    @pytest.mark.parametrize("error, recoverable", [
+        (fred_error(429, "Too Many Requests.  Exceeded Rate Limit"), True),
+        (fred_error(503, "Service Unavailable"), True),
+        (fred_error(400, "Bad Request.  The value for variable api_key is not registered."), False),
+        (fred_error(400, "Bad Request.  The series does not exist."), False),
+        # Status lost (e.g. the error body was not parsed): classified by message
+        (ValueError("Internal Server Error"), True),
+        (ValueError("Bad Request.  Variable api_key is not a 32 character string."), False),
+        (ConnectionError("reset"), True),
+    ])
+    def test_error_classification(self, client, error, recoverable):
+        """Transient FRED errors should be retried and request errors fail fast."""
+        assert client._is_recoverable(error, attempt=1) is recoverable
+    
+    def test_transient_error_is_retried(self, client, mocker, mock_sleep):
+        """A 503 on the first attempt should be retried and then succeed."""
+        calls = itertools.count()
+        
+        def get_series(series_id, **kwargs):
+            if next(calls) == 0:
+                raise fred_error(503, "Service Unavailable")
+            return pd.Series([4.0])
+        
+        get_series_mock = mocker.patch.object(client.client, "get_series", side_effect=get_series)
+        
+        data = client.fetch_macro_data()
+        
+        assert data.fed_funds_rate == 4.0
+        mock_sleep.assert_called_once_with(1)
+        assert get_series_mock.call_count > len(FREDClient.SERIES_IDS) + 1
+    
+    def test_invalid_api_key_fails_fast(self, client, mocker, mock_sleep):
+        """An invalid API key should raise without any retry."""
+        mocker.patch.object(
+            client.client, "get_series",
+            side_effect=fred_error(400, "Bad Request.  The value for variable api_key is not registered.")
+        )
+        
+        with pytest.raises(ValueError, match="api_key"):
+            client.fetch_macro_data()
+        
+        mock_sleep.assert_not_called()
@@ -0,0 +1,167 @@
+"""Test payload builder functionality."""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+from schemas.macro import MacroData
+from schemas.sentiment import SentimentData
+from src.quant_engine import payload_builder
+from src.quant_engine.payload_builder import PayloadBuilder
+from tests.constants import NOW
+
+
+class TestPayloadBuilder:
+    """Test suite for PayloadBuilder class."""
+    
+    @pytest.fixture
+    def config_dir(self, tmp_path):
+        """Config directory with a themed watchlist."""
+        (tmp_path / "watchlist.yaml").write_text(
+            "themes:\n"
+            "  ai_compute: [nvda, AMD]\n"
+            "  quality_compounders: [MSFT, NVDA]\n"
+        )
+        (tmp_path / "thresholds.yaml").write_text("{}\n")
+        return tmp_path
+    
+    @pytest.fixture
+    def filtered_df(self):
+        """Filtered opportunities, one with missing valuation ratios."""
+        return pd.DataFrame({
+            'ticker': ['NVDA', 'XOM'],
+            'sector': ['Technology', 'Energy'],
+            'current_price': [123.456, 101.0],
+            'pe_ratio': [35.27, None],
+            'peg_ratio': [1.234, None],
+            'pct_from_52w_high': [-0.12345, -0.2],
+            'above_200d_ma': [True, False],
+            'opportunity_score': [81.25, 60.0],
+        })
+    
+    def test_config_parsed_once_per_process(self, config_dir):
+        """A second builder on the same config should reuse the parsed YAML."""
+        with patch.object(payload_builder.yaml, 'load', wraps=payload_builder.yaml.load) as load:
+            first = PayloadBuilder(config_dir=str(config_dir))
+            second = PayloadBuilder(config_dir=str(config_dir))
+        
+        assert load.call_count == 2  # watchlist.yaml + thresholds.yaml
+        assert second.watchlist_config is first.watchlist_config
+    
+    def test_ticker_theme_lookup(self, config_dir):
+        """Tickers should map to their theme case-insensitively, first theme winning."""
+        builder = PayloadBuilder(config_dir=str(config_dir))
+        
+        assert builder._get_ticker_theme('NVDA') == 'ai_compute'
+        assert builder._get_ticker_theme('amd') == 'ai_compute'
+        assert builder._get_ticker_theme('msft') == 'quality_compounders'
+        assert builder._get_ticker_theme('XOM') == 'other'
+    
+    def test_build_payload_opportunities(self, config_dir, filtered_df):
+        """Opportunities should be rounded, keep order, and map NaN ratios to None."""
+        builder = PayloadBuilder(config_dir=str(config_dir))
+        macro = MacroData(
+            fed_funds_rate=4.33,
+            treasury_10y=4.49,
+            treasury_2y=4.82,
+            cpi_yoy=2.9,
+            unemployment=4.1,
+            yield_curve_spread=-0.33,
+            fetched_at=NOW
+        )
+        sentiment = SentimentData(
+            score=42,
+            label="Fear",
+            previous_close=45,
+            one_week_ago=38,
+            one_month_ago=52,
+            one_year_ago=65,
+            fetched_at=NOW
+        )
+        
+        payload = builder.build_payload(macro, filtered_df, sentiment)
+        
+        nvda, xom = payload.opportunities
+        assert (nvda.ticker, nvda.theme) == ('NVDA', 'ai_compute')
+        assert nvda.current_price == 123.46
+        assert nvda.pe_ratio == 35.3
+        assert nvda.peg_ratio == 1.23
+        assert nvda.pct_from_52w_high == -0.123
+        assert nvda.above_200d_ma is True
+        assert xom.pe_ratio is None and xom.peg_ratio is None
+        assert payload.themes == {'ai_compute': ['NVDA'], 'other': ['XOM']}
+        assert type(nvda.current_price) is float and type(nvda.above_200d_ma) is bool
+    
+    @pytest.mark.parametrize("last_price, expected", [
+        (110.0, 'Bullish'),
+        (90.0, 'Bearish'),
+        (100.0, 'Neutral'),
+    ])
+    def test_trend_signal_against_200d_ma(self, config_dir, last_price, expected):
+        """Trend should compare the last price with the trailing 200-day mean."""
+        builder = PayloadBuilder(config_dir=str(config_dir))
+        prices = pd.Series([50.0] * 100 + [100.0] * 199 + [last_price])
+        
+        assert builder._calculate_trend_signal(prices) == expected
+    
+    def test_trend_signal_neutral_on_gap_in_window(self, config_dir):
+        """A missing close inside the 200-day window should give Neutral."""
+        builder = PayloadBuilder(config_dir=str(config_dir))
+        prices = pd.Series([100.0] * 250 + [120.0])
+        prices.iloc[-10] = np.nan
+        
+        assert builder._calculate_trend_signal(prices) == 'Neutral'
+    
+    def test_sector_leaders_ranked_and_gaps_skipped(self, config_dir):
+        """Sector returns should be ranked descending; short or NaN histories skipped."""
+        builder = PayloadBuilder(config_dir=str(config_dir))
+        flat = [100.0] * 40
+        price_data = {
+            'XLK': pd.Series(flat[:-1] + [110.0]),
+            'XLE': pd.Series(flat[:-1] + [95.0]),
+            'XLF': pd.Series([100.0] * 10),  # Too short
+            'XLV': pd.Series([np.nan] * 40),  # No prices
+            'QQQ': pd.Series(flat[:-1] + [110.0]),
+            'XLU': pd.Series(flat[:-1] + [101.0]),
+        }
+        
+        leaders = builder._calculate_sector_leaders(price_data)
+        
+        assert list(leaders) == ['XLK', 'XLU', 'XLE']
+        assert leaders == {'XLK': 10.0, 'XLU': 1.0, 'XLE': -5.0}
+        assert builder._calculate_risk_regime(price_data) == 'Risk-On'
+    
+    def test_returns_batch_first_to_last_column(self):
+        """Each row's return should run first to last column, NaN on bad starts."""
+        windows = np.array([
+            [100.0, 50.0, 110.0],
+            [0.0, 1.0, 2.0],
+            [np.nan, 1.0, 2.0],
+            [100.0, 1.0, np.nan],
+        ])
+        
+        returns = PayloadBuilder._returns_batch(windows)
+        
+        assert returns[0] == pytest.approx(10.0)
+        assert np.isnan(returns[1:]).all()
+    
+    @pytest.mark.parametrize("score, expected", [
+        (0, "Extreme fear in markets"),
+        (24, "Extreme fear in markets"),
+        (25, "Fearful sentiment"),
+        (50, "Neutral sentiment"),
+        (55, "Greedy sentiment"),
+        (75, "Extreme greed in markets"),
+    ])
+    def test_sentiment_context_buckets(self, config_dir, score, expected):
+        """Scores should map to bucket narratives, with fallbacks when unconfigured."""
+        builder = PayloadBuilder(config_dir=str(config_dir))
+        
+        assert builder._get_sentiment_context(score) == expected
+    
+    def test_sentiment_context_uses_configured_narrative(self):
+        """Configured narratives from thresholds.yaml should take precedence."""
+        builder = PayloadBuilder(config_dir="config")
+        
+        assert builder._get_sentiment_context(10).startswith("Markets are fearful")
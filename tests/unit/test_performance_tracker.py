@@ -0,0 +1,32 @@
+"""Test performance tracker functionality."""
+
+from types import SimpleNamespace
+
+import orjson
+
+from src.evaluation.performance_tracker import PerformanceTracker
+from src.storage.data_lake import DataLake
+
+
+class TestPerformanceTracker:
+    """Test suite for PerformanceTracker class."""
+    
+    def test_recorded_recommendations_round_trip(self, tmp_path):
+        """Recorded recommendations should be plain JSON that loads back as records."""
+        tracker = PerformanceTracker(DataLake(str(tmp_path)))
+        opportunity = SimpleNamespace(
+            ticker="NVDA",
+            conviction_score=82,
+            ticker_data={"current_price": 123.45},
+            bull_case="AI demand",
+            bear_case="Valuation"
+        )
+        
+        tracker.record_recommendations("2025-02-09", [opportunity])
+        
+        file_path = tracker.recommendations_dir / "2025-02-09.json"
+        (raw,) = orjson.loads(file_path.read_bytes())
+        (record,) = tracker._read_records(file_path)
+        
+        assert raw["current_price"] == 123.45 and raw["return_1w"] is None
+        assert (record.ticker, record.conviction_score) == ("NVDA", 82)
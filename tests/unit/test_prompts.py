@@ -0,0 +1,46 @@
+"""Test prompt manager functionality."""
+
+import os
+import pytest
+from unittest.mock import patch
+
+from src.research_engine import prompts
+from src.research_engine.prompts import PromptManager
+
+
+class TestPromptManager:
+    """Test suite for PromptManager class."""
+    
+    @pytest.fixture
+    def prompts_dir(self, tmp_path):
+        """Prompt directory with a minimal current.yaml."""
+        (tmp_path / "current.yaml").write_text(
+            "version: 1\n"
+            "config:\n"
+            "  model: gemma-3-27b-it\n"
+            "system_prompt: Be concise.\n"
+            "user_prompt_template: \"Budget: ${weekly_budget}\"\n"
+        )
+        return tmp_path
+    
+    def test_prompt_parsed_once_per_process(self, prompts_dir):
+        """A second manager on an unchanged prompt should reuse the parsed YAML."""
+        with patch.object(prompts.yaml, 'load', wraps=prompts.yaml.load) as load:
+            first = PromptManager(str(prompts_dir))
+            second = PromptManager(str(prompts_dir))
+        
+        assert load.call_count == 1
+        assert second.current is first.current
+        assert second.format_user_prompt(weekly_budget=50) == "Budget: $50"
+    
+    def test_edited_prompt_is_reloaded(self, prompts_dir):
+        """Changing the file's modification time should invalidate the cache."""
+        first = PromptManager(str(prompts_dir))
+        
+        current = prompts_dir / "current.yaml"
+        current.write_text(current.read_text().replace("version: 1", "version: 2"))
+        stat = current.stat()
+        os.utime(current, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        assert first.version == 1
+        assert PromptManager(str(prompts_dir)).version == 2
@@ -1,13 +1,83 @@
 """Test schema validation."""
 
 import pytest
-from datetime import datetime
+import numpy as np
 from pydantic import ValidationError
 
 from schemas.macro import MacroData
 from schemas.sentiment import SentimentData
-from schemas.equities import EquityData
+from schemas.equities import EquityData, EquityDataset
 from schemas.llm_output import AnalysisOutput, Opportunity, Scenario
+from tests.constants import NOW
+
+
+# Valid field sets; tests override only the fields they exercise
+MACRO_FIELDS = {
+    "fed_funds_rate": 4.5,
+    "treasury_10y": 4.2,
+    "treasury_2y": 4.8,
+    "cpi_yoy": 3.0,
+    "unemployment": 4.0,
+    "yield_curve_spread": -0.6,
+    "fetched_at": NOW,
+}
+
+SENTIMENT_FIELDS = {
+    "score": 42,
+    "label": "Fear",
+    "previous_close": 45,
+    "one_week_ago": 38,
+    "one_month_ago": 52,
+    "one_year_ago": 65,
+    "fetched_at": NOW,
+}
+
+
+# Valid models built once per module; tests only read them. Models used
+# only for their properties skip validation; tests of validation itself
+# (acceptance, sorting, rejection) go through validation.
+@pytest.fixture(scope="module")
+def inverted_macro():
+    """Macro data with a negative 10Y-2Y spread (known-valid, so not validated)."""
+    return MacroData.model_construct(
+        **{**MACRO_FIELDS, "treasury_10y": 4.0, "treasury_2y": 4.5, "yield_curve_spread": -0.5}
+    )
+
+
+@pytest.fixture(scope="module")
+def normal_macro():
+    """Macro data with a positive 10Y-2Y spread (known-valid, so not validated)."""
+    return MacroData.model_construct(
+        **{**MACRO_FIELDS, "treasury_10y": 4.5, "treasury_2y": 4.0, "yield_curve_spread": 0.5}
+    )
+
+
+@pytest.fixture(scope="module")
+def improving_sentiment():
+    """Sentiment well above its level a week ago (known-valid, so not validated)."""
+    return SentimentData.model_construct(
+        **{**SENTIMENT_FIELDS, "score": 55, "label": "Neutral", "one_week_ago": 45}
+    )
+
+
+@pytest.fixture(scope="module")
+def deteriorating_sentiment():
+    """Sentiment well below its level a week ago (known-valid, so not validated)."""
+    return SentimentData.model_construct(
+        **{**SENTIMENT_FIELDS, "score": 40, "label": "Fear", "one_week_ago": 50}
+    )
+
+
+@pytest.fixture(scope="module")
+def valid_analysis(fixtures_dir):
+    """Analysis with one opportunity and two scenarios."""
+    return AnalysisOutput.model_validate_json((fixtures_dir / "analysis_valid.json").read_bytes())
+
+
+@pytest.fixture(scope="module")
+def unsorted_analysis(fixtures_dir):
+    """Analysis whose opportunities are given low conviction first."""
+    return AnalysisOutput.model_validate_json((fixtures_dir / "analysis_unsorted.json").read_bytes())
 
 
 class TestMacroSchema:
@@ -15,57 +85,26 @@ class TestMacroSchema:
     
     def test_valid_macro_data(self):
         """Valid macro data should pass validation."""
-        data = MacroData(
-            fed_funds_rate=4.5,
-            treasury_10y=4.2,
-            treasury_2y=4.8,
-            cpi_yoy=3.0,
-            unemployment=4.0,
-            yield_curve_spread=-0.6,
-            fetched_at=datetime.now()
-        )
+        data = MacroData.model_validate(MACRO_FIELDS)
         
-        assert data.fed_funds_rate == 4.5
-        assert data.yield_curve_inverted == True  # Spread is negative
+        # Spread is negative
+        assert (data.fed_funds_rate, data.yield_curve_inverted) == (4.5, True)
     
     def test_negative_rate_fails(self):
         """Negative rates should fail validation."""
         with pytest.raises(ValidationError):
-            MacroData(
-                fed_funds_rate=-1.0,  # Invalid
-                treasury_10y=4.2,
-                treasury_2y=4.8,
-                cpi_yoy=3.0,
-                unemployment=4.0,
-                yield_curve_spread=-0.6,
-                fetched_at=datetime.now()
-            )
+            MacroData.model_validate({**MACRO_FIELDS, "fed_funds_rate": -1.0})
     
-    def test_yield_curve_properties(self):
+    @pytest.mark.parametrize("fixture, inverted", [
+        ("inverted_macro", True),
+        ("normal_macro", False),
+    ])
+    def test_yield_curve_properties(self, fixture, inverted, request):
         """Test yield curve computed properties."""
-        inverted = MacroData(
-            fed_funds_rate=4.5,
-            treasury_10y=4.0,
-            treasury_2y=4.5,
-            cpi_yoy=3.0,
-            unemployment=4.0,
-            yield_curve_spread=-0.5,
-            fetched_at=datetime.now()
-        )
-        
-        normal = MacroData(
-            fed_funds_rate=4.5,
-            treasury_10y=4.5,
-            treasury_2y=4.0,
-            cpi_yoy=3.0,
-            unemployment=4.0,
-            yield_curve_spread=0.5,
-            fetched_at=datetime.now()
-        )
+        macro = request.getfixturevalue(fixture)
         
-        assert inverted.yield_curve_inverted == True
-        assert inverted.recession_signal == True
-        assert normal.yield_curve_inverted == False
+        # One comparison so a failure diff shows both properties
+        assert (macro.yield_curve_inverted, macro.recession_signal) == (inverted, inverted)
 
 
 class TestSentimentSchema:
@@ -73,135 +112,37 @@ class TestSentimentSchema:
     
     def test_valid_sentiment_data(self):
         """Valid sentiment data should pass."""
-        data = SentimentData(
-            score=42,
-            label="Fear",
-            previous_close=45,
-            one_week_ago=38,
-            one_month_ago=52,
-            one_year_ago=65,
-            fetched_at=datetime.now()
-        )
+        data = SentimentData.model_validate(SENTIMENT_FIELDS)
         
-        assert data.score == 42
-        assert data.is_fearful == True
-        assert data.is_greedy == False
+        assert (data.score, data.is_fearful, data.is_greedy) == (42, True, False)
     
     def test_score_out_of_range_fails(self):
         """Score outside 0-100 should fail."""
         with pytest.raises(ValidationError):
-            SentimentData(
-                score=150,  # Invalid
-                label="Fear",
-                previous_close=45,
-                one_week_ago=38,
-                one_month_ago=52,
-                one_year_ago=65,
-                fetched_at=datetime.now()
-            )
+            SentimentData.model_validate({**SENTIMENT_FIELDS, "score": 150})
     
-    def test_trend_detection(self):
+    @pytest.mark.parametrize("fixture, direction", [
+        ("improving_sentiment", "improving"),
+        ("deteriorating_sentiment", "deteriorating"),
+    ])
+    def test_trend_detection(self, fixture, direction, request):
         """Test sentiment trend calculation."""
-        improving = SentimentData(
-            score=55,
-            label="Neutral",
-            previous_close=50,
-            one_week_ago=45,  # Was lower
-            one_month_ago=40,
-            one_year_ago=50,
-            fetched_at=datetime.now()
-        )
-        
-        deteriorating = SentimentData(
-            score=40,
-            label="Fear",
-            previous_close=42,
-            one_week_ago=50,  # Was higher
-            one_month_ago=55,
-            one_year_ago=60,
-            fetched_at=datetime.now()
-        )
-        
-        assert improving.trend_direction == "improving"
-        assert deteriorating.trend_direction == "deteriorating"
+        assert request.getfixturevalue(fixture).trend_direction == direction
 
 
 class TestLLMOutputSchema:
     """Test AnalysisOutput schema validation."""
     
-    def test_valid_analysis_output(self):
+    def test_valid_analysis_output(self, valid_analysis):
         """Valid LLM output should pass validation."""
-        analysis = AnalysisOutput(
-            executive_summary="Markets show cautious sentiment with opportunities in quality tech names.",
-            macro_interpretation="Elevated rates suggest economic headwinds, but corporate earnings remain strong.",
-            opportunities=[
-                Opportunity(
-                    ticker="GOOG",
-                    conviction_score=8,
-                    bull_case="Strong AI positioning with reasonable valuation",
-                    bear_case="Regulatory headwinds in advertising business",
-                    key_metrics="PE: 22, PEG: 1.2"
-                )
-            ],
-            scenarios=[
-                Scenario(
-                    name="Growth-focused",
-                    description="For long-term investors comfortable with volatility",
-                    suggested_tickers=["GOOG", "NVDA"]
-                ),
-                Scenario(
-                    name="Defensive",
-                    description="For conservative investors seeking stability",
-                    suggested_tickers=["UNH", "COST"]
-                )
-            ],
-            themes_in_focus="AI compute and quality compounders stand out",
-            risks_to_watch="Yield curve inversion and potential recession signals"
-        )
-        
-        assert len(analysis.opportunities) == 1
-        assert len(analysis.scenarios) == 2
+        assert len(valid_analysis.opportunities) == 1
+        assert len(valid_analysis.scenarios) == 2
     
-    def test_opportunities_sorted_by_conviction(self):
+    def test_opportunities_sorted_by_conviction(self, unsorted_analysis):
         """Opportunities should auto-sort by conviction."""
-        analysis = AnalysisOutput(
-            executive_summary="Test summary with enough words to pass validation checks",
-            macro_interpretation="Test macro interpretation with enough detail to satisfy validation",
-            opportunities=[
-                Opportunity(
-                    ticker="LOW",
-                    conviction_score=3,
-                    bull_case="This stock has some potential upside",
-                    bear_case="However there are significant risks",
-                    key_metrics="PE: 30, PEG: 2.0"
-                ),
-                Opportunity(
-                    ticker="HIGH",
-                    conviction_score=9,
-                    bull_case="This is an excellent opportunity with strong fundamentals",
-                    bear_case="Minor concerns only about valuation",
-                    key_metrics="PE: 20, PEG: 1.5"
-                )
-            ],
-            scenarios=[
-                Scenario(
-                    name="Growth Strategy",
-                    description="This scenario focuses on growth with higher risk tolerance",
-                    suggested_tickers=["TEST"]
-                ),
-                Scenario(
-                    name="Value Strategy",
-                    description="This scenario emphasizes value and dividend income potential",
-                    suggested_tickers=["TEST2"]
-                )
-            ],
-            themes_in_focus="AI and technology themes are currently in focus",
-            risks_to_watch="Interest rate volatility and recession risks"
-        )
-        
         # Should be sorted high to low
-        assert analysis.opportunities[0].ticker == "HIGH"
-        assert analysis.opportunities[1].ticker == "LOW"
+        assert unsorted_analysis.opportunities[0].ticker == "HIGH"
+        assert unsorted_analysis.opportunities[1].ticker == "LOW"
     
     def test_min_scenarios_required(self):
         """At least 2 scenarios required."""
@@ -228,3 +169,74 @@ class TestLLMOutputSchema:
                 themes_in_focus="Test",
                 risks_to_watch="Test"
             )
+
+
+class TestEquitySchema:
+    """Test EquityData schema validation."""
+    
+    @pytest.mark.parametrize("ticker, valid", [
+        ("goog", True),
+        ("", False),
+        ("abcdefghijk", False),
+    ])
+    def test_ticker_uppercased_and_length_checked(self, ticker, valid):
+        """Tickers should be uppercased and must be 1-10 characters."""
+        fields = dict(
+            current_price=185.43, high_52w=211.60, low_52w=123.45,
+            market_cap=2_300_000_000_000, sector="Technology"
+        )
+        
+        if valid:
+            assert EquityData(ticker=ticker, **fields).ticker == ticker.upper()
+        else:
+            with pytest.raises(ValidationError):
+                EquityData(ticker=ticker, **fields)
+
+
+class TestEquityDatasetSchema:
+    """Test EquityDataset columnar conversions."""
+    
+    def test_arrays_match_dataframe(self):
+        """to_arrays() should carry the same values as to_dataframe()."""
+        dataset = EquityDataset(
+            equities=[
+                EquityData(
+                    ticker="AAA", current_price=90.0, high_52w=100.0, low_52w=50.0,
+                    pe_ratio=15.0, market_cap=10_000_000_000, sector="Energy",
+                    ma_50d=95.0, ma_200d=80.0
+                ),
+                EquityData(
+                    ticker="BBB", current_price=100.0, high_52w=100.0, low_52w=50.0,
+                    market_cap=20_000_000_000, sector="Utilities"
+                ),
+            ],
+            fetched_at=NOW
+        )
+        
+        arrays = dataset.to_arrays()
+        df = dataset.to_dataframe()
+        
+        assert list(arrays) == list(df.columns)
+        for column in df.columns:
+            np.testing.assert_array_equal(
+                arrays[column], df[column].to_numpy(dtype=arrays[column].dtype)
+            )
+        assert arrays['above_50d_ma'].tolist() == [False, True]  # Missing MA counts as above
+    
+    def test_arrays_are_memoized_and_read_only(self):
+        """Repeated calls should reuse one read-only columnar view."""
+        dataset = EquityDataset(
+            equities=[
+                EquityData(
+                    ticker="AAA", current_price=90.0, high_52w=100.0, low_52w=50.0,
+                    market_cap=10_000_000_000, sector="Energy"
+                )
+            ],
+            fetched_at=NOW
+        )
+        
+        arrays = dataset.to_arrays()
+        
+        assert dataset.to_arrays() is arrays
+        with pytest.raises(ValueError):
+            arrays['current_price'][0] = 1.0
@@ -0,0 +1,45 @@
+"""Test in-flight request coalescing."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.ingestion.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight class."""
+    
+    def test_concurrent_calls_share_future(self):
+        """Identical in-flight requests should run the call only once."""
+        release = threading.Event()
+        calls = []
+        
+        def fetch(key):
+            calls.append(key)
+            release.wait(timeout=5)
+            return f"data-{key}"
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            single_flight = SingleFlight(pool)
+            
+            first = single_flight.submit("DFF", fetch, "DFF")
+            second = single_flight.submit("DFF", fetch, "DFF")
+            release.set()
+            
+            assert first is second
+            assert first.result() == "data-DFF"
+            assert calls == ["DFF"]
+    
+    def test_completed_call_is_not_reused(self):
+        """Requests after completion should trigger a fresh call."""
+        calls = []
+        
+        def fetch(key):
+            calls.append(key)
+            return len(calls)
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            single_flight = SingleFlight(pool)
+            
+            assert single_flight.submit("GOOG", fetch, "GOOG").result() == 1
+            assert single_flight.submit("GOOG", fetch, "GOOG").result() == 2
@@ -0,0 +1,71 @@
+"""Test Yahoo Finance client slow-field caching."""
+
+import json
+import pytest
+import pandas as pd
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from src.ingestion.yfinance_client import YFinanceClient
+
+SLOW_FIELDS = {
+    'sector': 'Technology',
+    'trailingPE': 22.5,
+    'forwardPE': 20.1,
+    'pegRatio': 1.2,
+    'twoHundredDayAverage': 165.89,
+}
+
+
+class TestYFinanceClient:
+    """Test suite for YFinanceClient slow-field cache."""
+    
+    @pytest.fixture
+    def client(self, tmp_path):
+        """Client with its own cache directory and no rate-limit delay."""
+        return YFinanceClient(rate_limit_delay=0, cache_dir=str(tmp_path))
+    
+    @pytest.fixture
+    def stock(self, mocker):
+        """Patched yf.Ticker returning one fake stock."""
+        stock = Mock()
+        stock.history.return_value = pd.DataFrame({'Close': [100.0, 110.0]})
+        mocker.patch('src.ingestion.yfinance_client.yf.Ticker', return_value=stock)
+        mocker.patch('src.ingestion.yfinance_client.time.sleep')
+        return stock
+    
+    def test_cache_hit_rounds_fractional_market_cap(self, client, stock, tmp_path):
+        """A warm cache should combine slow fields with fast_info, rounding market cap."""
+        (tmp_path / "GOOG.json").write_text(json.dumps(SLOW_FIELDS))
+        stock.fast_info = SimpleNamespace(
+            last_price=185.43,
+            year_high=211.60,
+            year_low=123.45,
+            market_cap=2300000000000.37,  # shares * last_price
+            fifty_day_average=175.23,
+        )
+        
+        (equity,) = client.fetch_equity_data(['GOOG']).equities
+        
+        assert equity.market_cap == 2300000000000
+        assert (equity.sector, equity.pe_ratio, equity.ma_50d) == ('Technology', 22.5, 175.23)
+        assert equity.year_return == pytest.approx(10.0)
+    
+    def test_slow_fields_cached_only_after_checks_pass(self, client, stock, tmp_path):
+        """An empty `.info` should not be cached; a valid one should, atomically."""
+        stock.info = {}
+        with pytest.raises(ValueError):
+            client.fetch_equity_data(['GOOG'], max_retries=1)
+        assert not list(tmp_path.iterdir())
+        
+        stock.info = {
+            **SLOW_FIELDS,
+            'currentPrice': 185.43,
+            'fiftyTwoWeekHigh': 211.60,
+            'fiftyTwoWeekLow': 123.45,
+            'marketCap': 2300000000000,
+        }
+        client.fetch_equity_data(['GOOG'], max_retries=1)
+        
+        assert json.loads((tmp_path / "GOOG.json").read_text()) == SLOW_FIELDS
+        assert [path.name for path in tmp_path.iterdir()] == ["GOOG.json"]